@@ -0,0 +1,50 @@
+"""add budget periods
+
+Revision ID: 3f1a9c2d7b64
+Revises: e6fbd43c7d42
+Create Date: 2026-10-18 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1a9c2d7b64'
+down_revision: Union[str, None] = 'e6fbd43c7d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Recurrence of a budget; NULL keeps the existing one-off behaviour
+    op.add_column(
+        'budgets',
+        sa.Column('period', sa.Enum('WEEKLY', 'MONTHLY', name='budget_period_type'), nullable=True)
+    )
+
+    # Precomputed spend per budget period
+    op.create_table(
+        'budget_periods',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('budget_id', sa.Integer(), nullable=False),
+        sa.Column('period_start', sa.DateTime(), nullable=False),
+        sa.Column('period_end', sa.DateTime(), nullable=False),
+        sa.Column('spent_amount', sa.BigInteger(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['budget_id'], ['budgets.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('budget_id', 'period_start', name='uq_budget_periods_budget_start')
+    )
+    op.create_index(op.f('ix_budget_periods_id'), 'budget_periods', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_budget_periods_id'), table_name='budget_periods')
+    op.drop_table('budget_periods')
+    op.drop_column('budgets', 'period')
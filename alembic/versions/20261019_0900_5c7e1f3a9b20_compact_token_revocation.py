@@ -0,0 +1,143 @@
+"""compact token revocation
+
+Revision ID: 5c7e1f3a9b20
+Revises: 8d2e4b7a1c09
+Create Date: 2026-10-19 09:00:00.000000+00:00
+
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c7e1f3a9b20'
+down_revision: Union[str, None] = '8d2e4b7a1c09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+user_auth = sa.table(
+    'user_auth',
+    sa.column('id', sa.Integer),
+    sa.column('user_id', sa.Integer),
+    sa.column('is_active', sa.Boolean),
+    sa.column('is_expired', sa.Boolean),
+    sa.column('token_family', sa.String),
+    sa.column('refresh_jti', sa.String),
+    sa.column('expires_at', sa.DateTime),
+    sa.column('created_at', sa.DateTime),
+)
+
+# Lifetime of the refresh tokens issued before this revision
+REFRESH_TOKEN_EXPIRE_DAYS = 7
+
+
+def _compact_user_auth() -> None:
+    """Keep each user's latest active login and turn it into their session row"""
+    bind = op.get_bind()
+    sessions = {}
+    stale_ids = []
+    for row in bind.execute(sa.select(user_auth).order_by(user_auth.c.id)):
+        if row.user_id is None or not row.is_active or row.is_expired:
+            stale_ids.append(row.id)
+            continue
+        if row.user_id in sessions:
+            stale_ids.append(sessions[row.user_id].id)
+        sessions[row.user_id] = row
+    if stale_ids:
+        bind.execute(user_auth.delete().where(user_auth.c.id.in_(stale_ids)))
+
+    op.add_column('user_auth', sa.Column('token_family', sa.String(length=32), nullable=True))
+    op.add_column('user_auth', sa.Column('refresh_jti', sa.String(length=32), nullable=True))
+    op.add_column('user_auth', sa.Column('expires_at', sa.DateTime(), nullable=True))
+    # Their refresh token predates jti claims; it stays in refresh_token and is
+    # accepted once, when it is exchanged for tokens of this session's family
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    for row in sessions.values():
+        bind.execute(
+            user_auth.update().where(user_auth.c.id == row.id).values(
+                token_family=uuid.uuid4().hex,
+                refresh_jti='',
+                expires_at=(row.created_at or now) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+            )
+        )
+
+    indexes = {index['name'] for index in sa.inspect(bind).get_indexes('user_auth')}
+    with op.batch_alter_table('user_auth') as batch_op:
+        if 'ix_user_auth_access_token' in indexes:
+            batch_op.drop_index('ix_user_auth_access_token')
+        if 'ix_user_auth_refresh_token' in indexes:
+            batch_op.drop_index('ix_user_auth_refresh_token')
+        batch_op.drop_column('access_token')
+        batch_op.drop_column('is_expired')
+        batch_op.alter_column('user_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('token_family', existing_type=sa.String(length=32), nullable=False)
+        batch_op.alter_column('refresh_jti', existing_type=sa.String(length=32), nullable=False)
+        batch_op.alter_column('expires_at', existing_type=sa.DateTime(), nullable=False)
+        batch_op.create_unique_constraint('uq_user_auth_user_id', ['user_id'])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # user_auth held a row per login with full token strings. It becomes one
+    # session row per user. The old table was created outside of migrations, so
+    # it may not exist; when it does it is altered in place so users stay logged in.
+    if not sa.inspect(op.get_bind()).has_table('user_auth'):
+        op.create_table(
+            'user_auth',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.Column('token_family', sa.String(length=32), nullable=False),
+            sa.Column('refresh_jti', sa.String(length=32), nullable=False),
+            sa.Column('refresh_token', sa.String(length=255), nullable=True),
+            sa.Column('expires_at', sa.DateTime(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('user_id', name='uq_user_auth_user_id')
+        )
+        op.create_index(op.f('ix_user_auth_id'), 'user_auth', ['id'], unique=False)
+    else:
+        _compact_user_auth()
+    op.create_index(op.f('ix_user_auth_expires_at'), 'user_auth', ['expires_at'], unique=False)
+
+    # Revoked jti and token family ids, kept until the tokens would have expired
+    op.create_table(
+        'revoked_tokens',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('token_id', sa.String(length=32), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('token_id')
+    )
+    op.create_index(op.f('ix_revoked_tokens_id'), 'revoked_tokens', ['id'], unique=False)
+    op.create_index(op.f('ix_revoked_tokens_expires_at'), 'revoked_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_revoked_tokens_expires_at'), table_name='revoked_tokens')
+    op.drop_index(op.f('ix_revoked_tokens_id'), table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
+
+    # Back to a row per login; the session row stays as the latest login
+    op.drop_index(op.f('ix_user_auth_expires_at'), table_name='user_auth')
+    with op.batch_alter_table('user_auth') as batch_op:
+        batch_op.drop_constraint('uq_user_auth_user_id', type_='unique')
+        batch_op.alter_column('user_id', existing_type=sa.Integer(), nullable=True)
+        batch_op.drop_column('expires_at')
+        batch_op.drop_column('refresh_jti')
+        batch_op.drop_column('token_family')
+        batch_op.add_column(sa.Column('is_expired', sa.Boolean(), server_default=sa.false(), nullable=True))
+        batch_op.add_column(sa.Column('access_token', sa.String(length=255), nullable=True))
+        batch_op.create_index(op.f('ix_user_auth_access_token'), ['access_token'], unique=False)
+        batch_op.create_index(op.f('ix_user_auth_refresh_token'), ['refresh_token'], unique=False)
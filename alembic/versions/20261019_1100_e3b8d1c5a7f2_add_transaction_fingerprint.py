@@ -0,0 +1,91 @@
+"""add transaction fingerprint
+
+Revision ID: e3b8d1c5a7f2
+Revises: 9a4b6e2f8c31
+Create Date: 2026-10-19 11:00:00.000000+00:00
+
+"""
+import hashlib
+from datetime import datetime, timezone
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b8d1c5a7f2'
+down_revision: Union[str, None] = '9a4b6e2f8c31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+transactions = sa.table(
+    'transactions',
+    sa.column('id', sa.Integer),
+    sa.column('account_id', sa.Integer),
+    sa.column('description', sa.String),
+    sa.column('recipient', sa.String),
+    sa.column('amount', sa.BigInteger),
+    sa.column('transaction_date', sa.DateTime),
+    sa.column('fingerprint', sa.String),
+)
+
+
+def _fingerprint(
+    description: Optional[str],
+    recipient: Optional[str],
+    amount: Optional[int],
+    transaction_date: Optional[datetime]
+) -> str:
+    """Transaction.compute_fingerprint as of this revision, so later model changes do not alter the backfill"""
+    if transaction_date is not None and transaction_date.tzinfo is not None:
+        transaction_date = transaction_date.astimezone(timezone.utc).replace(tzinfo=None)
+    parts = [
+        (description or "").strip().casefold(),
+        (recipient or "").strip().casefold(),
+        str(amount or 0),
+        transaction_date.isoformat() if transaction_date else ""
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('transactions', sa.Column('fingerprint', sa.String(length=64), nullable=True))
+
+    # Backfill existing rows. Duplicates already in a ledger keep a NULL
+    # fingerprint so the unique index can be created; only the first copy is tagged.
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(
+            transactions.c.id,
+            transactions.c.account_id,
+            transactions.c.description,
+            transactions.c.recipient,
+            transactions.c.amount,
+            transactions.c.transaction_date,
+        ).order_by(transactions.c.id)
+    )
+    seen = set()
+    updates = []
+    for row in rows:
+        fingerprint = _fingerprint(row.description, row.recipient, row.amount, row.transaction_date)
+        if (row.account_id, fingerprint) in seen:
+            continue
+        seen.add((row.account_id, fingerprint))
+        updates.append({'row_id': row.id, 'fingerprint': fingerprint})
+    if updates:
+        bind.execute(
+            transactions.update()
+            .where(transactions.c.id == sa.bindparam('row_id'))
+            .values(fingerprint=sa.bindparam('fingerprint')),
+            updates
+        )
+
+    op.create_unique_constraint('uq_transactions_account_id_fingerprint', 'transactions', ['account_id', 'fingerprint'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_transactions_account_id_fingerprint', 'transactions', type_='unique')
+    op.drop_column('transactions', 'fingerprint')
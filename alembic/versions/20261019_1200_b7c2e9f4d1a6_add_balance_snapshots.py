@@ -0,0 +1,84 @@
+"""add balance snapshots
+
+Revision ID: b7c2e9f4d1a6
+Revises: e3b8d1c5a7f2
+Create Date: 2026-10-19 12:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c2e9f4d1a6'
+down_revision: Union[str, None] = 'e3b8d1c5a7f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Start of the day or month containing transaction_date, per dialect. SQLite
+# stores DateTime as text, so its period start is written in the same format.
+PERIOD_START_SQL = {
+    'mysql': {
+        'DAY': "CAST(DATE(transaction_date) AS DATETIME)",
+        'MONTH': "CAST(DATE_FORMAT(transaction_date, '%Y-%m-01') AS DATETIME)",
+    },
+    'postgresql': {
+        'DAY': "date_trunc('day', transaction_date)",
+        'MONTH': "date_trunc('month', transaction_date)",
+    },
+    'sqlite': {
+        'DAY': "strftime('%Y-%m-%d 00:00:00.000000', transaction_date)",
+        'MONTH': "strftime('%Y-%m-01 00:00:00.000000', transaction_date)",
+    },
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('accounts', sa.Column('opening_balance', sa.BigInteger(), server_default='0', nullable=False))
+    # Whatever the ledger does not explain becomes the opening balance, so
+    # existing accounts start out reconciled
+    op.execute(
+        "UPDATE accounts SET opening_balance = COALESCE(balance, 0) - COALESCE(("
+        "SELECT SUM(CASE WHEN transactions.type = 'CREDIT' THEN transactions.amount ELSE -transactions.amount END) "
+        "FROM transactions WHERE transactions.account_id = accounts.id), 0)"
+    )
+
+    op.create_table(
+        'balance_snapshots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        sa.Column('granularity', sa.Enum('DAY', 'MONTH', name='balance_snapshot_granularity'), nullable=False),
+        sa.Column('period_start', sa.DateTime(), nullable=False),
+        sa.Column('closing_balance', sa.BigInteger(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('account_id', 'granularity', 'period_start', name='uq_balance_snapshots_account_granularity_start')
+    )
+    op.create_index(op.f('ix_balance_snapshots_id'), 'balance_snapshots', ['id'], unique=False)
+
+    # Build snapshots for existing ledgers: each period's closing balance is the
+    # running total of the per-period sums. Both granularities are filled so
+    # whichever BALANCE_SNAPSHOT_GRANULARITY is configured finds its snapshots.
+    for granularity, period_start in PERIOD_START_SQL[op.get_bind().dialect.name].items():
+        op.execute(
+            "INSERT INTO balance_snapshots (account_id, granularity, period_start, closing_balance, created_at, updated_at) "
+            f"SELECT account_id, '{granularity}', period_start, "
+            "SUM(SUM(amount_change)) OVER (PARTITION BY account_id ORDER BY period_start), "
+            "CURRENT_TIMESTAMP, CURRENT_TIMESTAMP "
+            f"FROM (SELECT account_id, {period_start} AS period_start, "
+            "CASE WHEN type = 'CREDIT' THEN COALESCE(amount, 0) ELSE -COALESCE(amount, 0) END AS amount_change "
+            "FROM transactions WHERE account_id IS NOT NULL AND transaction_date IS NOT NULL) AS ledger "
+            "GROUP BY account_id, period_start"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_balance_snapshots_id'), table_name='balance_snapshots')
+    op.drop_table('balance_snapshots')
+    op.drop_column('accounts', 'opening_balance')
@@ -0,0 +1,131 @@
+"""partition transactions
+
+Revision ID: c4d8a2f6e913
+Revises: b7c2e9f4d1a6
+Create Date: 2026-10-19 13:00:00.000000+00:00
+
+Optional: only applied on MySQL when asked for with
+`alembic -x transactions_partitioning=range|hash upgrade head`, or the
+TRANSACTIONS_PARTITIONING environment variable. -x transactions_hash_partitions
+and -x transactions_partition_months_ahead (or the environment variables of the
+same names in upper case) tune the layout. MySQL requires every unique key of a partitioned table to contain the
+partitioning column, and partitioned InnoDB tables cannot have foreign keys,
+so the primary key is widened and the foreign keys of transactions are dropped.
+The application keeps the references consistent itself.
+
+"""
+import os
+from datetime import datetime, timezone
+from typing import List, Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8a2f6e913'
+down_revision: Union[str, None] = 'b7c2e9f4d1a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FOREIGN_KEYS = [
+    ('account_id', 'accounts'),
+    ('category_id', 'categories'),
+    ('budget_id', 'budgets'),
+    ('user_id', 'users'),
+    ('pot_id', 'pots'),
+]
+
+PARTITIONING_SCHEMES = ('none', 'range', 'hash')
+
+
+def _option(name: str, default: str) -> str:
+    """An -x argument of the alembic command, else its environment variable"""
+    return context.get_x_argument(as_dictionary=True).get(name) or os.environ.get(name.upper(), default)
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    month_index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=month_index // 12, month=month_index % 12 + 1)
+
+
+def _monthly_partitions(first_month: datetime, last_month: datetime) -> List[str]:
+    """One partition per month of transaction_date, then a catch-all"""
+    definitions = []
+    month = first_month.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    while month <= last_month:
+        upper = _add_months(month, 1)
+        definitions.append(f"PARTITION p{month:%Y%m} VALUES LESS THAN ('{upper:%Y-%m-%d}')")
+        month = upper
+    definitions.append("PARTITION pmax VALUES LESS THAN (MAXVALUE)")
+    return definitions
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    scheme = _option('transactions_partitioning', 'none').lower()
+    if scheme not in PARTITIONING_SCHEMES:
+        raise ValueError(f"transactions_partitioning must be one of {', '.join(PARTITIONING_SCHEMES)}")
+    bind = op.get_bind()
+    if scheme == 'none' or bind.dialect.name != 'mysql':
+        return
+
+    foreign_keys = bind.execute(sa.text(
+        "SELECT CONSTRAINT_NAME FROM information_schema.REFERENTIAL_CONSTRAINTS "
+        "WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = 'transactions'"
+    )).scalars().all()
+    for name in foreign_keys:
+        op.drop_constraint(name, 'transactions', type_='foreignkey')
+
+    if scheme == 'hash':
+        if bind.execute(sa.text("SELECT COUNT(*) FROM transactions WHERE account_id IS NULL")).scalar():
+            raise RuntimeError("Transactions without an account cannot be HASH partitioned on account_id")
+        op.alter_column('transactions', 'account_id', existing_type=sa.Integer(), nullable=False)
+        op.execute("ALTER TABLE transactions DROP PRIMARY KEY, ADD PRIMARY KEY (id, account_id)")
+        hash_partitions = int(_option('transactions_hash_partitions', '16'))
+        op.execute(f"ALTER TABLE transactions PARTITION BY HASH (account_id) PARTITIONS {hash_partitions}")
+        return
+
+    # RANGE: the date becomes part of the primary key and of the duplicate check.
+    # The fingerprint already includes the date, so the check is unchanged.
+    op.execute("UPDATE transactions SET transaction_date = COALESCE(created_at, NOW()) WHERE transaction_date IS NULL")
+    op.alter_column('transactions', 'transaction_date', existing_type=sa.DateTime(), nullable=False)
+    op.execute("ALTER TABLE transactions DROP PRIMARY KEY, ADD PRIMARY KEY (id, transaction_date)")
+    op.drop_constraint('uq_transactions_account_id_fingerprint', 'transactions', type_='unique')
+    op.create_unique_constraint(
+        'uq_transactions_account_id_fingerprint', 'transactions', ['account_id', 'fingerprint', 'transaction_date']
+    )
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    first_month = bind.execute(sa.text("SELECT MIN(transaction_date) FROM transactions")).scalar() or now
+    last_month = _add_months(now, int(_option('transactions_partition_months_ahead', '3')))
+    op.execute(
+        "ALTER TABLE transactions PARTITION BY RANGE COLUMNS (transaction_date) ("
+        + ", ".join(_monthly_partitions(first_month, last_month)) + ")"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'mysql':
+        return
+    method = bind.execute(sa.text(
+        "SELECT PARTITION_METHOD FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'transactions' AND PARTITION_NAME IS NOT NULL "
+        "LIMIT 1"
+    )).scalar()
+    if method is None:
+        return
+
+    op.execute("ALTER TABLE transactions REMOVE PARTITIONING")
+    op.execute("ALTER TABLE transactions DROP PRIMARY KEY, ADD PRIMARY KEY (id)")
+    if method.startswith('RANGE'):
+        op.drop_constraint('uq_transactions_account_id_fingerprint', 'transactions', type_='unique')
+        op.create_unique_constraint(
+            'uq_transactions_account_id_fingerprint', 'transactions', ['account_id', 'fingerprint']
+        )
+        op.alter_column('transactions', 'transaction_date', existing_type=sa.DateTime(), nullable=True)
+    else:
+        op.alter_column('transactions', 'account_id', existing_type=sa.Integer(), nullable=True)
+    for column, referent in FOREIGN_KEYS:
+        op.create_foreign_key(f'fk_transactions_{column}', 'transactions', referent, [column], ['id'])
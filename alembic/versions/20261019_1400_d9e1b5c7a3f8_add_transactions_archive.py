@@ -0,0 +1,60 @@
+"""add transactions archive
+
+Revision ID: d9e1b5c7a3f8
+Revises: c4d8a2f6e913
+Create Date: 2026-10-19 14:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9e1b5c7a3f8'
+down_revision: Union[str, None] = 'c4d8a2f6e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'transactions_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=True),
+        sa.Column('category_id', sa.Integer(), nullable=True),
+        sa.Column('budget_id', sa.Integer(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('pot_id', sa.Integer(), nullable=True),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('recipient', sa.String(length=255), nullable=True),
+        sa.Column('sender', sa.String(length=255), nullable=True),
+        sa.Column('amount', sa.BigInteger(), nullable=True),
+        sa.Column('type', sa.Enum('DEBIT', 'CREDIT', name='transaction_type'), nullable=True),
+        sa.Column('transaction_date', sa.DateTime(), nullable=True),
+        sa.Column('meta_data', sa.JSON(), nullable=True),
+        sa.Column('fingerprint', sa.String(length=64), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_transactions_archive_account_date', 'transactions_archive', ['account_id', 'transaction_date'], unique=False)
+    op.create_index(op.f('ix_transactions_archive_budget_id'), 'transactions_archive', ['budget_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Put archived transactions back before dropping the archive
+    op.execute(
+        "INSERT INTO transactions (id, account_id, category_id, budget_id, user_id, pot_id, description, "
+        "recipient, sender, amount, type, transaction_date, meta_data, fingerprint, created_at, updated_at) "
+        "SELECT id, account_id, category_id, budget_id, user_id, pot_id, description, "
+        "recipient, sender, amount, type, transaction_date, meta_data, fingerprint, created_at, updated_at "
+        "FROM transactions_archive"
+    )
+    op.drop_index(op.f('ix_transactions_archive_budget_id'), table_name='transactions_archive')
+    op.drop_index('ix_transactions_archive_account_date', table_name='transactions_archive')
+    op.drop_table('transactions_archive')
@@ -0,0 +1,29 @@
+"""add transactions account date index
+
+Revision ID: e2a7c9d4b6f1
+Revises: d9e1b5c7a3f8
+Create Date: 2026-10-19 15:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7c9d4b6f1'
+down_revision: Union[str, None] = 'd9e1b5c7a3f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_transactions_account_id_transaction_date', 'transactions', ['account_id', 'transaction_date'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactions_account_id_transaction_date', table_name='transactions')
@@ -0,0 +1,28 @@
+"""add accounts transactions version
+
+Revision ID: f3b8d1e5c7a2
+Revises: e2a7c9d4b6f1
+Create Date: 2026-10-19 16:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d1e5c7a2'
+down_revision: Union[str, None] = 'e2a7c9d4b6f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('accounts', sa.Column('transactions_version', sa.BigInteger(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('accounts', 'transactions_version')
@@ -0,0 +1,65 @@
+"""add recurring transactions
+
+Revision ID: a6c2e8f4b1d3
+Revises: f3b8d1e5c7a2
+Create Date: 2026-10-19 17:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c2e8f4b1d3'
+down_revision: Union[str, None] = 'f3b8d1e5c7a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'recurring_transactions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=True),
+        sa.Column('budget_id', sa.Integer(), nullable=True),
+        sa.Column('pot_id', sa.Integer(), nullable=True),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('recipient', sa.String(length=255), nullable=True),
+        sa.Column('sender', sa.String(length=255), nullable=True),
+        sa.Column('amount', sa.BigInteger(), nullable=False),
+        sa.Column('type', sa.Enum('DEBIT', 'CREDIT', name='transaction_type'), nullable=False),
+        sa.Column('meta_data', sa.JSON(), nullable=True),
+        sa.Column('interval', sa.Enum('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY', name='recurrence_interval'), nullable=False),
+        sa.Column('interval_count', sa.Integer(), nullable=False),
+        sa.Column('start_date', sa.DateTime(), nullable=False),
+        sa.Column('end_date', sa.DateTime(), nullable=True),
+        sa.Column('next_run', sa.DateTime(), nullable=True),
+        sa.Column('occurrences', sa.Integer(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['account_id'], ['accounts.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id']),
+        sa.ForeignKeyConstraint(['budget_id'], ['budgets.id']),
+        sa.ForeignKeyConstraint(['pot_id'], ['pots.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_recurring_transactions_id'), 'recurring_transactions', ['id'], unique=False)
+    op.create_index(op.f('ix_recurring_transactions_account_id'), 'recurring_transactions', ['account_id'], unique=False)
+    op.create_index(
+        'ix_recurring_transactions_is_active_next_run', 'recurring_transactions', ['is_active', 'next_run'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_recurring_transactions_is_active_next_run', table_name='recurring_transactions')
+    op.drop_index(op.f('ix_recurring_transactions_account_id'), table_name='recurring_transactions')
+    op.drop_index(op.f('ix_recurring_transactions_id'), table_name='recurring_transactions')
+    op.drop_table('recurring_transactions')
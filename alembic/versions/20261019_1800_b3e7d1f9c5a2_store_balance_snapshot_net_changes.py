@@ -0,0 +1,70 @@
+"""store balance snapshot net changes
+
+Revision ID: b3e7d1f9c5a2
+Revises: a6c2e8f4b1d3
+Create Date: 2026-10-19 18:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e7d1f9c5a2'
+down_revision: Union[str, None] = 'a6c2e8f4b1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Start of the day or month containing transaction_date, per dialect. SQLite
+# stores DateTime as text, so its period start is written in the same format.
+PERIOD_START_SQL = {
+    'mysql': {
+        'DAY': "CAST(DATE(transaction_date) AS DATETIME)",
+        'MONTH': "CAST(DATE_FORMAT(transaction_date, '%Y-%m-01') AS DATETIME)",
+    },
+    'postgresql': {
+        'DAY': "date_trunc('day', transaction_date)",
+        'MONTH': "date_trunc('month', transaction_date)",
+    },
+    'sqlite': {
+        'DAY': "strftime('%Y-%m-%d 00:00:00.000000', transaction_date)",
+        'MONTH': "strftime('%Y-%m-01 00:00:00.000000', transaction_date)",
+    },
+}
+
+
+def _rebuild_snapshots(column: str, cumulative: bool) -> None:
+    """Refill balance_snapshots from the live and archived transactions"""
+    total = "SUM(SUM(amount_change)) OVER (PARTITION BY account_id ORDER BY period_start)" if cumulative else "SUM(amount_change)"
+    op.execute("DELETE FROM balance_snapshots")
+    for granularity, period_start in PERIOD_START_SQL[op.get_bind().dialect.name].items():
+        op.execute(
+            f"INSERT INTO balance_snapshots (account_id, granularity, period_start, {column}, created_at, updated_at) "
+            f"SELECT account_id, '{granularity}', period_start, {total}, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP "
+            f"FROM (SELECT account_id, {period_start} AS period_start, "
+            "CASE WHEN type = 'CREDIT' THEN COALESCE(amount, 0) ELSE -COALESCE(amount, 0) END AS amount_change "
+            "FROM (SELECT account_id, transaction_date, type, amount FROM transactions "
+            "UNION ALL SELECT account_id, transaction_date, type, amount FROM transactions_archive) AS history "
+            "WHERE account_id IS NOT NULL AND transaction_date IS NOT NULL) AS ledger "
+            "GROUP BY account_id, period_start"
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Snapshots hold each period's net change instead of the running total, so
+    # a backdated transaction updates one row instead of every later one
+    with op.batch_alter_table('balance_snapshots') as batch_op:
+        batch_op.add_column(sa.Column('net_change', sa.BigInteger(), server_default='0', nullable=False))
+        batch_op.drop_column('closing_balance')
+    _rebuild_snapshots('net_change', cumulative=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('balance_snapshots') as batch_op:
+        batch_op.add_column(sa.Column('closing_balance', sa.BigInteger(), server_default='0', nullable=False))
+        batch_op.drop_column('net_change')
+    _rebuild_snapshots('closing_balance', cumulative=True)
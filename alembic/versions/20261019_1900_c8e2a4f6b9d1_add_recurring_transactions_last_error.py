@@ -0,0 +1,28 @@
+"""add recurring transactions last error
+
+Revision ID: c8e2a4f6b9d1
+Revises: b3e7d1f9c5a2
+Create Date: 2026-10-19 19:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e2a4f6b9d1'
+down_revision: Union[str, None] = 'b3e7d1f9c5a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('recurring_transactions', sa.Column('last_error', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('recurring_transactions', 'last_error')
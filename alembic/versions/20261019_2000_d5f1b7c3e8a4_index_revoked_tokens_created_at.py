@@ -0,0 +1,27 @@
+"""index revoked tokens created at
+
+Revision ID: d5f1b7c3e8a4
+Revises: c8e2a4f6b9d1
+Create Date: 2026-10-19 20:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f1b7c3e8a4'
+down_revision: Union[str, None] = 'c8e2a4f6b9d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_revoked_tokens_created_at'), 'revoked_tokens', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_revoked_tokens_created_at'), table_name='revoked_tokens')
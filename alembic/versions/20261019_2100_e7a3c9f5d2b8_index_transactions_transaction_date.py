@@ -0,0 +1,27 @@
+"""index transactions transaction date
+
+Revision ID: e7a3c9f5d2b8
+Revises: d5f1b7c3e8a4
+Create Date: 2026-10-19 21:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3c9f5d2b8'
+down_revision: Union[str, None] = 'd5f1b7c3e8a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_transactions_transaction_date'), 'transactions', ['transaction_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_transactions_transaction_date'), table_name='transactions')
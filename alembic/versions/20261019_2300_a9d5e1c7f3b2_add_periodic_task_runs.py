@@ -0,0 +1,36 @@
+"""add periodic task runs table
+
+Revision ID: a9d5e1c7f3b2
+Revises: f4b8d2a6c1e9
+Create Date: 2026-10-19 23:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d5e1c7f3b2'
+down_revision: Union[str, None] = 'f4b8d2a6c1e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Leases and last run times of the background periodic tasks
+    op.create_table(
+        'periodic_task_runs',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('last_run_at', sa.DateTime(), nullable=True),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('locked_by', sa.String(length=64), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('periodic_task_runs')
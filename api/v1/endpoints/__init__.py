@@ -5,7 +5,9 @@ from .categories import router as categories_router
 from .budgets import router as budgets_router
 from .pots import router as pots_router
 from .transactions import router as transactions_router
+from .recurring_transactions import router as recurring_transactions_router
 from .accounts import router as accounts_router
+from .health import router as health_router
 
 __all__ = [
     "auth_router",
@@ -15,5 +17,7 @@ __all__ = [
     "budgets_router",
     "pots_router",
     "transactions_router",
-    "accounts_router"
+    "recurring_transactions_router",
+    "accounts_router",
+    "health_router"
 ]
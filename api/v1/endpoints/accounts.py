@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
+from datetime import datetime, timezone
 from core.deps import get_current_user, get_api_key_user
 from db.models.user import User
 from db.session import get_db
 from sqlalchemy.orm import Session
 from services.account_service import AccountService
-from schemas.account import Account, AccountCreate, AccountUpdate
+from services.ledger_service import LedgerService
+from schemas.account import Account, AccountBalance, AccountCreate, AccountUpdate
 from schemas.common import ResponseModel, ListResponseModel
 
 router = APIRouter()
@@ -37,6 +39,25 @@ async def get_my_account(
         message="Account fetched successfully"
     )
 
+@router.get("/me/balance", response_model=ResponseModel[AccountBalance])
+async def get_my_balance(
+    at: Optional[datetime] = Query(None, description="Point in time to get the balance at, defaults to now"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the user's account balance as of a date, from the ledger"""
+    if not current_user.account:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Account not found"
+        )
+    at = at or datetime.now(timezone.utc)
+    balance = LedgerService(db).get_balance_at(current_user.account, at)
+    return ResponseModel[AccountBalance](
+        data=AccountBalance(account_id=current_user.account.id, balance=balance, at=at),
+        message="Account balance fetched successfully"
+    )
+
 @router.get("/{account_id}", response_model=ResponseModel[Account])
 async def get_account(
     account_id: int,
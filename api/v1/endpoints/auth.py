@@ -1,11 +1,10 @@
 # Authentication endpoints
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
+from core.client_identity import client_address
 from db.session import get_db
 from schemas.user import UserCreate, UserLogin
-from services.email_service import EmailService
 from services.auth_service import AuthService
-from core.deps import get_email_core
 from schemas.auth import RefreshTokenRequest, LogoutRequest
 
 router = APIRouter()
@@ -13,22 +12,23 @@ router = APIRouter()
 @router.post("/register", response_model=dict)
 async def register(
     user: UserCreate,
-    db: Session = Depends(get_db),
-    email_service: EmailService = Depends(lambda: EmailService(get_email_core()))
+    db: Session = Depends(get_db)
 ) -> dict:
     """
-    Register a new user and send activation email.
+    Register a new user and queue their activation email.
     """
     auth_service = AuthService(db)
-    return await auth_service.register_user(user, email_service)
+    return await auth_service.register_user(user)
 
 @router.post("/login", response_model=dict)
-async def login(user: UserLogin, db: Session = Depends(get_db)) -> dict:
+async def login(user: UserLogin, request: Request, db: Session = Depends(get_db)) -> dict:
     """
     Login a user.
     """
     auth_service = AuthService(db)
-    return await auth_service.login_user(user)
+    # Behind a trusted proxy this is the client's own address, not the proxy's
+    client_ip = client_address(request.scope)
+    return await auth_service.login_user(user, client_ip=client_ip)
 
 @router.get("/activate/{token}", response_model=dict)
 async def activate_account(token: str, db: Session = Depends(get_db)) -> dict:
@@ -1,11 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
 from core.deps import get_current_user
 from db.models.user import User
 from db.session import get_db
 from sqlalchemy.orm import Session
-from services.budget_service import BudgetService
-from schemas.budget import Budget, BudgetCreate, BudgetUpdate, BudgetSummary, BudgetSummaryChart
+from services.budget_service import BudgetService, budget_projection
+from schemas.budget import Budget, BudgetCreate, BudgetUpdate, BudgetSummary, BudgetSummaryChart, BudgetPeriod
 from schemas.common import ResponseModel, ListResponseModel
 
 router = APIRouter()
@@ -41,16 +41,19 @@ async def get_budget_summary(
 async def get_budgets(
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = Query(None, description="Comma separated fields to return; all fields if omitted"),
+    expand: Optional[str] = Query(None, description="Nested objects to include (category)"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all budgets for the current user"""
+    """
+    Get all budgets for the current user.
+    Only the selected columns are read; transactions are never loaded.
+    """
+    selection = budget_projection.parse(fields, expand)
     budget_service = BudgetService(db)
-    budgets = budget_service.get_budgets(current_user.id, skip=skip, limit=limit)
-    return ListResponseModel[Budget](
-        data=budgets,
-        message="Budgets fetched successfully"
-    )
+    budgets = budget_service.get_budget_rows(current_user.id, skip=skip, limit=limit, selection=selection)
+    return budget_projection.render(budgets, "Budgets fetched successfully", selection)
 
 @router.get("/{budget_id}", response_model=ResponseModel[Budget])
 async def get_budget(
@@ -71,6 +74,36 @@ async def get_budget(
         message="Budget fetched successfully"
     )
 
+@router.get("/{budget_id}/periods/current", response_model=ResponseModel[Optional[BudgetPeriod]])
+async def get_current_budget_period(
+    budget_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the current period of a budget with its spend"""
+    budget_service = BudgetService(db)
+    period = budget_service.get_current_budget_period(budget_id, current_user.id)
+    return ResponseModel[Optional[BudgetPeriod]](
+        data=period,
+        message="Budget period fetched successfully"
+    )
+
+@router.get("/{budget_id}/periods", response_model=ListResponseModel[BudgetPeriod])
+async def get_budget_periods(
+    budget_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the recorded periods of a budget, most recent first"""
+    budget_service = BudgetService(db)
+    periods = budget_service.get_budget_periods(budget_id, current_user.id, skip=skip, limit=limit)
+    return ListResponseModel[BudgetPeriod](
+        data=periods,
+        message="Budget periods fetched successfully"
+    )
+
 @router.put("/{budget_id}", response_model=ResponseModel[Budget])
 async def update_budget(
     budget_id: int,
@@ -1,25 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from core.deps import get_current_user
 from db.models.user import User
 from db.session import get_db
 from sqlalchemy.orm import Session
-from services.category_service import CategoryService
-from schemas.category import Category, CategoryCreate, CategoryUpdate
-from typing import List
+from services.category_service import CategoryService, category_projection
+from schemas.category import Category, CategoryCreate, CategoryUpdate, CategoryStats
+from schemas.common import ListResponseModel
+from datetime import datetime
+from typing import List, Optional
 
 router = APIRouter()
 
 @router.get("/", response_model=dict[str, object])
 async def get_categories(
+    fields: Optional[str] = Query(None, description="Comma separated fields to return; all fields if omitted"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    selection = category_projection.parse(fields)
     category_service = CategoryService(db)
-    categories = category_service.get_categories(current_user.id)
-    return {
-        "data": [Category.model_validate(cat) for cat in categories],
-        "message": "Categories fetched successfully"
-    }
+    categories = category_service.get_category_rows(current_user.id, selection)
+    return category_projection.render(categories, "Categories fetched successfully", selection)
+
+@router.get("/stats", response_model=ListResponseModel[CategoryStats])
+async def get_category_stats(
+    start_date: Optional[datetime] = Query(None, description="Only count transactions on or after this date"),
+    end_date: Optional[datetime] = Query(None, description="Only count transactions on or before this date"),
+    include_archived: bool = Query(False, description="Include archived transactions whatever the date range"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Transaction count, debit and credit totals, average amount and last activity per category"""
+    category_service = CategoryService(db)
+    stats = category_service.get_category_stats(
+        current_user.id, current_user.account.id, start_date, end_date, include_archived
+    )
+    return ListResponseModel[CategoryStats](
+        data=stats,
+        message="Category stats fetched successfully"
+    )
 
 @router.get("/{category_id}", response_model=dict[str, object])
 async def get_category(
@@ -0,0 +1,44 @@
+import asyncio
+import logging
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from typing import Callable
+from sqlalchemy.orm import Session
+from db.session import get_session_factory
+from core.config import settings
+from core.health import check_database, readiness
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/healthz")
+async def liveness():
+    """Liveness probe: the process is up and serving requests"""
+    return {"status": "ok"}
+
+@router.get("/readyz")
+async def readiness_probe(session_factory: Callable[[], Session] = Depends(get_session_factory)):
+    """
+    Readiness probe: startup warm-up has finished and the primary database
+    answers within READINESS_DB_TIMEOUT seconds
+    """
+    if not readiness.is_ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Warming up"
+        )
+    try:
+        await asyncio.wait_for(run_in_threadpool(check_database, session_factory), timeout=settings.READINESS_DB_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.error("Readiness check timed out waiting for the database")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database check timed out"
+        )
+    except Exception as e:
+        logger.error(f"Readiness check failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database unavailable"
+        )
+    return {"status": "ready"}
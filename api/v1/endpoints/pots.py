@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
-from core.deps import get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
+from core.deps import get_current_user, get_idempotent_request
+from core.idempotency import IdempotentRequest
 from db.models.user import User
 from db.session import get_db
 from sqlalchemy.orm import Session
-from services.pot_service import PotService
+from services.pot_service import PotService, pot_projection
 from schemas.pot import Pot, PotCreate, PotUpdate, UpdateSavedAmount, PotSummary
 from schemas.common import ResponseModel, ListResponseModel
 
@@ -28,16 +29,15 @@ async def create_pot(
 async def get_pots(
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = Query(None, description="Comma separated fields to return; all fields if omitted"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get all pots for the current user"""
+    selection = pot_projection.parse(fields)
     pot_service = PotService(db)
-    pots = pot_service.get_pots(current_user.id, skip=skip, limit=limit)
-    return ListResponseModel[Pot](
-        data=pots,
-        message="Pots fetched successfully"
-    )
+    pots = pot_service.get_pot_rows(current_user.id, skip=skip, limit=limit, selection=selection)
+    return pot_projection.render(pots, "Pots fetched successfully", selection)
 
 @router.get("/summary", response_model=ResponseModel[PotSummary])
 async def get_pot_summary(
@@ -102,7 +102,8 @@ async def update_saved_amount(
     pot_id: int,
     request: UpdateSavedAmount,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency: IdempotentRequest = Depends(get_idempotent_request)
 ):
     """
     Update the saved amount of a pot
@@ -116,16 +117,24 @@ async def update_saved_amount(
     - The pot's saved amount
     - The account's balance
     - The transaction history
+
+    Retries sent with the same Idempotency-Key header return the original
+    response without changing the pot again.
     """
+    replayed = idempotency.replay(request.model_dump(mode="json"))
+    if replayed:
+        return replayed
+
     pot_service = PotService(db)
     pot = pot_service.update_saved_amount(
         pot_id=pot_id,
         user_id=current_user.id,
         user=current_user,
         amount=request.amount,
-        reason=request.reason
+        reason=request.reason,
+        commit=False
     )
-    return ResponseModel[Pot](
+    return idempotency.complete(status.HTTP_200_OK, ResponseModel[Pot](
         data=pot,
         message="Pot saved amount updated successfully"
-    ) 
\ No newline at end of file
+    )) 
\ No newline at end of file
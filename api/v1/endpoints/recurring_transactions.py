@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+from core.deps import get_current_user
+from db.models.user import User
+from db.session import get_db
+from services.recurring_transaction_service import RecurringTransactionService
+from schemas.recurring_transaction import RecurringTransaction, RecurringTransactionCreate
+from schemas.common import ResponseModel, ListResponseModel
+
+router = APIRouter()
+
+@router.post("/", response_model=ResponseModel[RecurringTransaction], status_code=status.HTTP_201_CREATED)
+async def create_recurring_transaction(
+    rule_data: RecurringTransactionCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create a recurring transaction. Its occurrences, including any already due,
+    are created by the scheduler within a few minutes.
+    """
+    rule = RecurringTransactionService(db).create_rule(rule_data, current_user)
+    return ResponseModel[RecurringTransaction](
+        data=rule,
+        message="Recurring transaction created successfully"
+    )
+
+@router.get("/", response_model=ListResponseModel[RecurringTransaction])
+async def get_recurring_transactions(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the recurring transactions of the current user's account"""
+    rules = RecurringTransactionService(db).get_rules(current_user.account.id)
+    return ListResponseModel[RecurringTransaction](
+        data=rules,
+        message="Recurring transactions fetched successfully"
+    )
+
+@router.delete("/{rule_id}", response_model=ResponseModel[RecurringTransaction])
+async def stop_recurring_transaction(
+    rule_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Stop a recurring transaction; transactions it already created are kept"""
+    rule = RecurringTransactionService(db).deactivate_rule(rule_id, current_user.account.id)
+    return ResponseModel[RecurringTransaction](
+        data=rule,
+        message="Recurring transaction stopped successfully"
+    )
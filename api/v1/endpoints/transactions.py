@@ -1,41 +1,65 @@
+import asyncio
 from fastapi import APIRouter, Depends, Query, status, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Optional
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 
-from core.deps import get_current_user
+from core.deps import get_current_user, get_idempotent_request
+from core.idempotency import IdempotentRequest
 from db.models.user import User
-from db.session import get_db
-from services.transaction_service import TransactionService
+from db.session import get_db, sibling_session
+from services.transaction_service import TransactionService, running_balance_projection, transaction_projection
 from schemas.transaction import (
     Transaction,
     TransactionCreate,
     TransactionUpdate,
     TransactionFilter
 )
-from schemas.common import ResponseModel, ListResponseModel
+from schemas.common import ResponseModel, CountedListResponseModel, CursorPageResponseModel
 
 router = APIRouter()
 
+# Extras GET / returns alongside a page with ?include=
+INCLUDE_OPTIONS = {"count", "facets"}
+
+def _parse_include(include: Optional[str]) -> set:
+    names = {name.strip() for name in (include or "").split(",") if name.strip()}
+    unknown = names - INCLUDE_OPTIONS
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot include {', '.join(sorted(unknown))}; expected count or facets"
+        )
+    return names
+
 @router.post("/", response_model=ResponseModel[Transaction], status_code=status.HTTP_201_CREATED)
 async def create_transaction(
     transaction_data: TransactionCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency: IdempotentRequest = Depends(get_idempotent_request)
 ):
-    """Create a new transaction"""
+    """
+    Create a new transaction.
+    Retries sent with the same Idempotency-Key header return the original response.
+    """
+    replayed = idempotency.replay(transaction_data.model_dump(mode="json"))
+    if replayed:
+        return replayed
+
     transaction_service = TransactionService(db)
-    transaction = transaction_service.create_transaction(transaction_data, current_user)
-    return ResponseModel[Transaction](
+    transaction = transaction_service.create_transaction(transaction_data, current_user, commit=False)
+    return idempotency.complete(status.HTTP_201_CREATED, ResponseModel[Transaction](
         data=transaction,
         message="Transaction created successfully"
-    )
+    ))
 
-@router.get("/", response_model=ListResponseModel[Transaction])
+@router.get("/", response_model=CountedListResponseModel[Transaction])
 async def get_transactions(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    sort_by: str = Query("transaction_date", description="Field to sort by"),
+    sort_by: str = Query("transaction_date", description="transaction_date, amount, created_at or id"),
     sort_order: str = Query("desc", description="Sort order (asc or desc)"),
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
@@ -46,11 +70,27 @@ async def get_transactions(
     max_amount: Optional[int] = None,
     recipient: Optional[str] = None,
     sender: Optional[str] = None,
+    include_archived: bool = Query(False, description="Include archived transactions whatever the date range"),
+    running_balance: bool = Query(False, description="Include the account balance after each transaction"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return; all fields if omitted"),
+    expand: Optional[str] = Query("budget,pot", description="Nested objects to include (budget, pot); pass an empty value for none"),
+    include: Optional[str] = Query(None, description="count for the total matching the filters, facets for counts by type, category and budget"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all transactions with filtering and sorting"""
+    """
+    Get all transactions with filtering and sorting.
+    Rows are selected as columns and serialized without building models per item.
+    With ?include= the counts are worked out for the same filters, on another
+    connection alongside the page query where the session allows it.
+    """
     transaction_service = TransactionService(db)
+    # running_balance is only part of the items when it is asked for
+    projection = running_balance_projection if running_balance else transaction_projection
+    selection = projection.parse(fields, expand)
+    include_names = _parse_include(include)
+    if running_balance:
+        selection = projection.include(selection, "running_balance")
     
     filters = TransactionFilter(
         start_date=start_date,
@@ -61,27 +101,55 @@ async def get_transactions(
         min_amount=min_amount,
         max_amount=max_amount,
         recipient=recipient,
-        sender=sender
+        sender=sender,
+        include_archived=include_archived
     )
     
-    transactions = transaction_service.get_transactions(
-        account_id=current_user.account.id,
-        skip=skip,
-        limit=limit,
-        sort_by=sort_by,
-        sort_order=sort_order,
-        filters=filters
-    )
-    
-    return ListResponseModel[Transaction](
-        data=transactions,
-        message="Transactions fetched successfully"
+    def get_rows():
+        return transaction_service.get_transaction_rows(
+            account_id=current_user.account.id,
+            skip=skip,
+            limit=limit,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            filters=filters,
+            selection=selection,
+            with_running_balance=running_balance
+        )
+
+    if not include_names:
+        return projection.render(get_rows(), "Transactions fetched successfully", selection)
+
+    account = current_user.account
+    data_version = account.transactions_version
+
+    def get_counts(counts_db: Optional[Session]):
+        return transaction_service.get_transaction_counts(
+            account.id, data_version, filters, facets="facets" in include_names, db=counts_db
+        )
+
+    with sibling_session(db) as counts_db:
+        if counts_db is None:
+            transactions, counts = get_rows(), get_counts(None)
+        else:
+            transactions, counts = await asyncio.gather(
+                run_in_threadpool(get_rows),
+                run_in_threadpool(get_counts, counts_db)
+            )
+
+    return projection.render(
+        transactions,
+        "Transactions fetched successfully",
+        selection,
+        count=counts["count"] if "count" in include_names else None,
+        facets=counts.get("facets")
     )
 
 @router.get("/summary", response_model=ResponseModel[dict])
 async def get_transaction_summary(
     start_date: Optional[str] = Query(None, description="Start date in format YYYY-MM-DDThh:mm:ssZ"),
     end_date: Optional[str] = Query(None, description="End date in format YYYY-MM-DDThh:mm:ssZ"),
+    include_archived: bool = Query(False, description="Include archived transactions whatever the date range"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -101,7 +169,8 @@ async def get_transaction_summary(
     summary = transaction_service.get_transaction_summary(
         account_id=current_user.account.id,
         start_date=start_datetime,
-        end_date=end_datetime
+        end_date=end_datetime,
+        include_archived=include_archived
     )
     return ResponseModel[dict](
         data=summary,
@@ -122,55 +191,95 @@ async def get_transaction(
         message="Transaction fetched successfully"
     )
 
-@router.get("/budgets/{budget_id}", response_model=ListResponseModel[Transaction])
+def _page_response(
+    transaction_service: TransactionService,
+    db: Session,
+    account_id: int,
+    filters: TransactionFilter,
+    limit: int,
+    cursor: Optional[str],
+    sort_by: str,
+    sort_order: str,
+    fields: Optional[str],
+    expand: Optional[str],
+    stream: bool
+):
+    """A page of a transaction list, or with stream the whole list as NDJSON"""
+    selection = transaction_projection.parse(fields, expand)
+    if not stream:
+        page = transaction_service.get_transaction_page(
+            account_id, limit, sort_by, sort_order, filters, cursor, selection
+        )
+        return transaction_projection.render_page(
+            page.items, page.next_cursor, "Transactions fetched successfully", selection
+        )
+
+    def rows():
+        # The request's session is closed once the endpoint returns, before the
+        # body is streamed; it opens a new connection here and is closed again after
+        try:
+            yield from transaction_service.iter_transaction_rows(
+                account_id, sort_by, sort_order, filters, selection
+            )
+        finally:
+            db.close()
+    return transaction_projection.stream(rows(), selection)
+
+@router.get("/budgets/{budget_id}", response_model=CursorPageResponseModel[Transaction])
 async def get_transactions_by_budget(
     budget_id: int,
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    sort_by: str = Query("transaction_date", description="transaction_date, amount, created_at or id"),
+    sort_order: str = Query("desc", description="Sort order (asc or desc)"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return; all fields if omitted"),
+    expand: Optional[str] = Query("budget,pot", description="Nested objects to include (budget, pot); pass an empty value for none"),
+    stream: bool = Query(False, description="Stream every transaction as newline delimited JSON instead of a page"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all transactions by budget"""
-    transaction_service = TransactionService(db)
-    transactions = transaction_service.get_transactions_by_budget(
-        budget_id=budget_id,
-        account_id=current_user.account.id
-    )
-    return ListResponseModel[Transaction](
-        data=transactions,
-        message="Transactions fetched successfully"
+    """Get transactions by budget, a page at a time"""
+    return _page_response(
+        TransactionService(db), db, current_user.account.id, TransactionFilter(budget_id=budget_id),
+        limit, cursor, sort_by, sort_order, fields, expand, stream
     )
 
-@router.get("/pots/{pot_id}", response_model=ListResponseModel[Transaction])
+@router.get("/pots/{pot_id}", response_model=CursorPageResponseModel[Transaction])
 async def get_transactions_by_pot(
     pot_id: int,
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    sort_by: str = Query("transaction_date", description="transaction_date, amount, created_at or id"),
+    sort_order: str = Query("desc", description="Sort order (asc or desc)"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return; all fields if omitted"),
+    expand: Optional[str] = Query("budget,pot", description="Nested objects to include (budget, pot); pass an empty value for none"),
+    stream: bool = Query(False, description="Stream every transaction as newline delimited JSON instead of a page"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all transactions by pot"""
-    transaction_service = TransactionService(db)
-    transactions = transaction_service.get_transactions_by_pot(
-        pot_id=pot_id,
-        account_id=current_user.account.id
-    )
-    return ListResponseModel[Transaction](
-        data=transactions,
-        message="Transactions fetched successfully"
+    """Get transactions by pot, a page at a time"""
+    return _page_response(
+        TransactionService(db), db, current_user.account.id, TransactionFilter(pot_id=pot_id),
+        limit, cursor, sort_by, sort_order, fields, expand, stream
     )
 
-@router.get("/categories/{category_id}", response_model=ListResponseModel[Transaction])
+@router.get("/categories/{category_id}", response_model=CursorPageResponseModel[Transaction])
 async def get_transactions_by_category(
     category_id: int,
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    sort_by: str = Query("transaction_date", description="transaction_date, amount, created_at or id"),
+    sort_order: str = Query("desc", description="Sort order (asc or desc)"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return; all fields if omitted"),
+    expand: Optional[str] = Query("budget,pot", description="Nested objects to include (budget, pot); pass an empty value for none"),
+    stream: bool = Query(False, description="Stream every transaction as newline delimited JSON instead of a page"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all transactions by category"""
-    transaction_service = TransactionService(db)
-    transactions = transaction_service.get_transactions_by_category(
-        category_id=category_id,
-        account_id=current_user.account.id
-    )
-    return ListResponseModel[Transaction](
-        data=transactions,
-        message="Transactions fetched successfully"
+    """Get transactions by category, a page at a time"""
+    return _page_response(
+        TransactionService(db), db, current_user.account.id, TransactionFilter(category_id=category_id),
+        limit, cursor, sort_by, sort_order, fields, expand, stream
     )
 
 @router.put("/{transaction_id}", response_model=ResponseModel[Transaction])
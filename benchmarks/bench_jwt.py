@@ -0,0 +1,46 @@
+"""
+Compare bearer token verification through python-jose with the cached path.
+
+Run from the project root:
+    python -m benchmarks.bench_jwt
+"""
+import timeit
+from datetime import timedelta
+from jose import jwt
+from core.jwt import ALGORITHM, ClaimsCache, create_access_token, verify_token, claims_cache
+
+SECRET = "benchmark-secret"
+ITERATIONS = 20000
+
+def main() -> None:
+    token = create_access_token({"sub": "bench@example.com", "fam": "f" * 32}, timedelta(minutes=60), SECRET)
+
+    jose_time = timeit.timeit(lambda: jwt.decode(token, SECRET, algorithms=[ALGORITHM]), number=ITERATIONS)
+
+    claims_cache.clear()
+    verify_token(token, SECRET)
+    cached_time = timeit.timeit(lambda: verify_token(token, SECRET), number=ITERATIONS)
+
+    # Worst case: every token is new, so each call pays for a miss and an insert
+    tokens = [
+        create_access_token({"sub": f"user{i}@example.com"}, timedelta(minutes=60), SECRET)
+        for i in range(2000)
+    ]
+    cold_cache = ClaimsCache()
+    def verify_cold() -> None:
+        for t in tokens:
+            if cold_cache.get(t, SECRET) is None:
+                cold_cache.put(t, SECRET, jwt.decode(t, SECRET, algorithms=[ALGORITHM]))
+    cold_time = timeit.timeit(verify_cold, number=1)
+    cold_jose_time = timeit.timeit(
+        lambda: [jwt.decode(t, SECRET, algorithms=[ALGORITHM]) for t in tokens], number=1
+    )
+
+    print(f"python-jose decode:     {jose_time / ITERATIONS * 1e6:8.2f} us/token")
+    print(f"cached verify (hit):    {cached_time / ITERATIONS * 1e6:8.2f} us/token "
+          f"({jose_time / cached_time:.0f}x faster)")
+    print(f"cached verify (miss):   {cold_time / len(tokens) * 1e6:8.2f} us/token "
+          f"(jose alone {cold_jose_time / len(tokens) * 1e6:.2f} us/token)")
+
+if __name__ == "__main__":
+    main()
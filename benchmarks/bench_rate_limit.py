@@ -0,0 +1,59 @@
+"""
+Measure the per request overhead of RateLimitMiddleware with the in-memory
+backend: a bare token bucket take, and a full ASGI request through a trivial
+app with and without the middleware.
+
+Run from the project root:
+    python -m benchmarks.bench_rate_limit
+"""
+import asyncio
+import time
+import timeit
+from core.rate_limit import InMemoryRateLimitBackend, RateLimit, RateLimitMiddleware
+
+ITERATIONS = 50000
+# Plenty of tokens so every request takes the allowed path
+LIMIT = RateLimit(ITERATIONS * 10)
+
+async def _app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+async def _receive():
+    return {"type": "http.request", "body": b""}
+
+async def _send(message):
+    pass
+
+def _scope(api_key: bytes) -> dict:
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/transactions/",
+        "headers": [(b"x-api-key", api_key)],
+        "client": ("127.0.0.1", 5000),
+    }
+
+async def _time_requests(app, keys: int) -> float:
+    scopes = [_scope(f"key-{i}".encode()) for i in range(keys)]
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        await app(dict(scopes[i % keys]), _receive, _send)
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+def main() -> None:
+    backend = InMemoryRateLimitBackend()
+    take_time = timeit.timeit(lambda: backend.take("read:key", LIMIT), number=ITERATIONS) / ITERATIONS * 1e6
+    print(f"{'bucket take:':<40}{take_time:6.2f} us")
+
+    limits = {name: LIMIT for name in ("read", "write", "export", "auth")}
+    bare = asyncio.run(_time_requests(_app, 1))
+    print(f"{'request without middleware:':<40}{bare:6.2f} us")
+    for keys in (1, 1000):
+        middleware = RateLimitMiddleware(_app, limits=limits, backend=InMemoryRateLimitBackend())
+        limited = asyncio.run(_time_requests(middleware, keys))
+        label = f"request with middleware, {keys} keys:"
+        print(f"{label:<40}{limited:6.2f} us ({limited - bare:+.2f} us)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Measure serialization time and payload size of a 100 row
+ListResponseModel[Transaction] page with the standard library JSON response,
+the orjson default response class and the column projection path, and how much
+gzip and Brotli shrink it.
+
+Run from the project root:
+    python -m benchmarks.bench_response_encoding
+"""
+import gzip
+import timeit
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from schemas.common import ListResponseModel
+from schemas.transaction import Transaction as TransactionSchema
+from core.projection import Selection
+from services.transaction_service import transaction_projection
+from benchmarks.bench_transaction_list import ITERATIONS, _page
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+def _time(func) -> float:
+    """Milliseconds per call"""
+    return timeit.timeit(func, number=ITERATIONS) / ITERATIONS * 1e3
+
+def main() -> None:
+    transactions, _, _ = _page()
+    response = ListResponseModel[TransactionSchema](data=transactions, message="ok")
+    # What FastAPI hands the response class after validating against response_model
+    content = jsonable_encoder(response)
+
+    column_names = transaction_projection.column_names
+    rows = [dict(zip(column_names, (getattr(t, name) for name in column_names))) for t in transactions]
+    for row, item in zip(rows, response.model_dump()["data"]):
+        row.update(budget=item["budget"], pot=item["pot"])
+    selection = Selection(tuple(transaction_projection.field_names), ("budget", "pot"))
+
+    print("serialization")
+    print(f"  JSONResponse:         {_time(lambda: JSONResponse(content).body):6.3f} ms/page")
+    print(f"  ORJSONResponse:       {_time(lambda: ORJSONResponse(content).body):6.3f} ms/page")
+    print(f"  projection render:    {_time(lambda: transaction_projection.render(rows, 'ok', selection).body):6.3f} ms/page")
+
+    body = ORJSONResponse(content).body
+    print(f"payload size: {len(body)} bytes")
+    for level in (1, 6, 9):
+        compressed = gzip.compress(body, compresslevel=level)
+        elapsed = _time(lambda: gzip.compress(body, compresslevel=level))
+        print(f"  gzip level {level}:         {len(compressed):6d} bytes ({len(compressed) / len(body):5.1%}), {elapsed:6.3f} ms")
+    if brotli is None:
+        print("  brotli is not installed, skipping Brotli")
+        return
+    for quality in (1, 4, 11):
+        compressed = brotli.compress(body, quality=quality)
+        elapsed = _time(lambda: brotli.compress(body, quality=quality))
+        print(f"  brotli quality {quality:2d}:    {len(compressed):6d} bytes ({len(compressed) / len(body):5.1%}), {elapsed:6.3f} ms")
+
+if __name__ == "__main__":
+    main()
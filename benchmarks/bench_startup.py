@@ -0,0 +1,47 @@
+"""
+Profile how long importing the app takes, using `python -X importtime`.
+Each run is a fresh interpreter, as for a newly started worker. Prints the
+median total and the slowest modules of the median run, and checks that the
+modules deferred until first use (email, password hashing) are not imported.
+
+Run from the project root:
+    python -m benchmarks.bench_startup
+"""
+import statistics
+import subprocess
+import sys
+
+RUNS = 5
+TOP = 15
+DEFERRED_MODULES = ("fastapi_mail", "jinja2", "passlib")
+
+def _import_app() -> list[tuple[int, int, str]]:
+    """Import main in a new interpreter and return (self_us, cumulative_us, module) per import"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        capture_output=True, text=True, check=True
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        imports.append((int(self_us), int(cumulative_us), module.strip()))
+    return imports
+
+def main() -> None:
+    runs = sorted((_import_app() for _ in range(RUNS)), key=lambda imports: sum(i[0] for i in imports))
+    totals = [sum(i[0] for i in imports) / 1e3 for imports in runs]
+    median_run = runs[len(runs) // 2]
+
+    print(f"import main: median {statistics.median(totals):.0f} ms, min {min(totals):.0f} ms over {RUNS} runs")
+    print("slowest modules by cumulative time (median run):")
+    for self_us, cumulative_us, module in sorted(median_run, key=lambda i: i[1], reverse=True)[:TOP]:
+        print(f"  {cumulative_us / 1e3:8.1f} ms  {module}")
+
+    imported = {module for _, _, module in median_run}
+    for module in DEFERRED_MODULES:
+        print(f"{module}: {'imported at startup' if module in imported else 'deferred'}")
+
+if __name__ == "__main__":
+    main()
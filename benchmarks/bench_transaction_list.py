@@ -0,0 +1,83 @@
+"""
+Compare serializing a 100 row transaction page through ListResponseModel and
+FastAPI's response_model validation with the column projection path.
+
+Run from the project root:
+    python -m benchmarks.bench_transaction_list
+"""
+import json
+import timeit
+from datetime import datetime, timedelta
+from pydantic import TypeAdapter
+import db.models  # noqa: F401 - registers the models before any mapper is configured
+import db.models.api_key  # noqa: F401
+from db.models.budget import Budget
+from db.models.pots import Pot
+from db.models.transaction import Transaction
+from schemas.common import ListResponseModel
+from schemas.transaction import Transaction as TransactionSchema, TransactionType
+from core.projection import Selection
+from services.transaction_service import transaction_projection
+
+PAGE_SIZE = 100
+ITERATIONS = 200
+
+def _page():
+    now = datetime(2026, 1, 1)
+    budget = Budget(
+        id=1, user_id=1, category_id=1, name="Groceries", description="Food", total_amount=50000,
+        spent_amount=1200, remaining_amount=48800, start_date=now, end_date=now + timedelta(days=30),
+        period=None, is_active=True, is_deleted=False, color="#00ff00", created_at=now, updated_at=now
+    )
+    pot = Pot(id=1, name="Holiday", description="Trip", target_amount=100000, saved_amount=2500, color="#0000ff")
+    transactions = [
+        Transaction(
+            id=i, account_id=1, category_id=1, budget_id=1, pot_id=1, user_id=1,
+            description=f"Transaction {i}", recipient="Store", sender="me", amount=100 + i,
+            type=TransactionType.DEBIT, transaction_date=now + timedelta(hours=i),
+            meta_data={"note": "benchmark"}, created_at=now, updated_at=now, budget=budget, pot=pot
+        )
+        for i in range(PAGE_SIZE)
+    ]
+    return transactions, budget, pot
+
+def main() -> None:
+    transactions, budget, pot = _page()
+    response_adapter = TypeAdapter(ListResponseModel[TransactionSchema])
+
+    def model_path() -> bytes:
+        # What the endpoint did before: build the models, then FastAPI re-validates
+        # the dumped content against response_model and encodes it
+        response = ListResponseModel[TransactionSchema](data=transactions, message="ok")
+        value = response_adapter.validate_python(response.model_dump())
+        return json.dumps(response_adapter.dump_python(value, mode="json")).encode()
+
+    column_names = transaction_projection.column_names
+    rows = [tuple(getattr(t, name) for name in column_names) for t in transactions]
+    budget_dict = {name: getattr(budget, name) for name in TransactionSchema.model_fields["budget"].annotation.__args__[0].model_fields}
+    pot_dict = {name: getattr(pot, name) for name in ("name", "description", "target_amount", "color", "id", "saved_amount")}
+
+    fields = tuple(transaction_projection.field_names)
+
+    def projection_path(expand) -> bytes:
+        items = [dict(zip(column_names, row)) for row in rows]
+        for item in items:
+            if expand:
+                item["budget"] = budget_dict
+                item["pot"] = pot_dict
+        return transaction_projection.render(items, "ok", Selection(fields, expand)).body
+
+    assert json.loads(model_path()) == json.loads(projection_path(("budget", "pot")))
+
+    model_time = timeit.timeit(model_path, number=ITERATIONS)
+    expanded_time = timeit.timeit(lambda: projection_path(("budget", "pot")), number=ITERATIONS)
+    flat_time = timeit.timeit(lambda: projection_path(()), number=ITERATIONS)
+
+    print(f"response_model path:          {model_time / ITERATIONS * 1e3:7.2f} ms/page")
+    print(f"projection, expand=budget,pot: {expanded_time / ITERATIONS * 1e3:7.2f} ms/page "
+          f"({model_time / expanded_time:.1f}x faster)")
+    print(f"projection, no expand:        {flat_time / ITERATIONS * 1e3:7.2f} ms/page "
+          f"({model_time / flat_time:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
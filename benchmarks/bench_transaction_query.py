@@ -0,0 +1,81 @@
+"""
+Compare the CPU time of running a filtered, sorted transaction list query per
+request: building a select() with conditional filters, as get_transactions
+used to, against TransactionQuery's cached statements, where a request only
+supplies parameters. Runs against an in-memory SQLite database with a small
+table so statement preparation, not the database, dominates.
+
+Run from the project root:
+    python -m benchmarks.bench_transaction_query
+"""
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, desc, select
+from sqlalchemy.orm import Session
+import db.models  # noqa: F401 - registers the models before any mapper is configured
+import db.models.api_key  # noqa: F401
+from db.base import Base
+from db.models.transaction import Transaction
+from schemas.transaction import TransactionFilter, TransactionType
+from services.transaction_query import TransactionQuery
+
+ITERATIONS = 3000
+COLUMNS = ["id", "description", "amount", "type", "transaction_date"]
+
+def _cpu_time(func, number: int) -> float:
+    """CPU microseconds per call"""
+    start = time.process_time()
+    for _ in range(number):
+        func()
+    return (time.process_time() - start) / number * 1e6
+
+def _filters(i: int) -> TransactionFilter:
+    return TransactionFilter(
+        start_date=datetime(2026, 1, 1),
+        type=TransactionType.DEBIT,
+        min_amount=i % 100 + 1,
+        recipient="cafe"
+    )
+
+def main() -> None:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Transaction.__table__])
+    session = Session(engine)
+    now = datetime(2026, 1, 1)
+    session.execute(Transaction.__table__.insert(), [
+        dict(
+            account_id=1, category_id=1, description=f"Transaction {i}", recipient="Cafe",
+            amount=100 + i, type=TransactionType.DEBIT, transaction_date=now + timedelta(days=i)
+        )
+        for i in range(50)
+    ])
+    counter = iter(range(10 ** 9))
+
+    def conditional_filters():
+        filters = _filters(next(counter))
+        stmt = select(*(getattr(Transaction, name) for name in COLUMNS)).where(Transaction.account_id == 1)
+        if filters.start_date:
+            stmt = stmt.where(Transaction.transaction_date >= filters.start_date)
+        if filters.type:
+            stmt = stmt.where(Transaction.type == filters.type)
+        if filters.min_amount:
+            stmt = stmt.where(Transaction.amount >= filters.min_amount)
+        if filters.recipient:
+            stmt = stmt.where(Transaction.recipient.ilike(f"%{filters.recipient}%"))
+        stmt = stmt.order_by(desc(Transaction.transaction_date), desc(Transaction.id)).limit(20)
+        session.execute(stmt).all()
+
+    def cached_statement():
+        session.execute(*TransactionQuery(1, _filters(next(counter))).rows(COLUMNS, limit=20)).all()
+
+    # Warm both paths once
+    conditional_filters()
+    cached_statement()
+    conditional_time = _cpu_time(conditional_filters, ITERATIONS)
+    cached_time = _cpu_time(cached_statement, ITERATIONS)
+
+    print(f"select() with conditional filters: {conditional_time:8.1f} us CPU")
+    print(f"TransactionQuery cached statement: {cached_time:8.1f} us CPU ({conditional_time / cached_time:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
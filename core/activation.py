@@ -11,8 +11,8 @@ class ActivationService:
         return secrets.token_urlsafe(32)
     
     @staticmethod
-    def create_activation_token(db: Session, user: User) -> ActivationToken:
-        """Create a new activation token for a user"""
+    def create_activation_token(db: Session, user: User, commit: bool = True) -> ActivationToken:
+        """Create a new activation token for a user. With commit=False the caller commits it."""
         # Delete any existing unused tokens
         db.query(ActivationToken).filter(
             ActivationToken.user_id == user.id,
@@ -27,6 +27,9 @@ class ActivationService:
             expires_at=current_time + timedelta(hours=24)  # Token expires in 24 hours
         )
         db.add(token)
+        if not commit:
+            db.flush()
+            return token
         db.commit()
         db.refresh(token)
         return token
@@ -0,0 +1,108 @@
+import hashlib
+import ipaddress
+import threading
+from collections import OrderedDict
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.types import Scope
+from core.config import settings
+from core.jwt import verify_token
+
+VERIFIED_API_KEYS_CACHE_SIZE = 100000
+
+def _api_key_digest(api_key: str) -> str:
+    # Never keep raw keys in memory or in a shared backend
+    return hashlib.sha256(api_key.encode()).hexdigest()[:32]
+
+class VerifiedAPIKeys:
+    """
+    Digests of the API keys this process has seen pass validation.
+
+    Requests are only bucketed by their API key once it is known to be valid;
+    until then they count against their client address. Otherwise a client
+    sending a new random key with every request would get a fresh bucket each
+    time and push real clients' buckets out of the rate limiter.
+    """
+
+    def __init__(self, max_size: int = VERIFIED_API_KEYS_CACHE_SIZE):
+        self.max_size = max_size
+        self._digests: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, api_key: str) -> None:
+        digest = _api_key_digest(api_key)
+        with self._lock:
+            self._digests[digest] = None
+            self._digests.move_to_end(digest)
+            while len(self._digests) > self.max_size:
+                self._digests.popitem(last=False)
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._digests
+
+    def clear(self) -> None:
+        with self._lock:
+            self._digests.clear()
+
+verified_api_keys = VerifiedAPIKeys()
+
+def _trusted_proxies() -> list:
+    return [
+        ipaddress.ip_network(proxy.strip(), strict=False)
+        for proxy in (settings.TRUSTED_PROXIES or "").split(",")
+        if proxy.strip()
+    ]
+
+TRUSTED_PROXIES = _trusted_proxies()
+
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in TRUSTED_PROXIES)
+
+def client_address(scope: Scope) -> str:
+    """
+    The address a request comes from. When it arrives through a proxy listed
+    in TRUSTED_PROXIES, the nearest X-Forwarded-For entry not added by a
+    trusted proxy is used instead, so clients behind the proxy are told apart.
+    """
+    client = scope.get("client")
+    address = client[0] if client else "unknown"
+    if not TRUSTED_PROXIES or not _is_trusted_proxy(address):
+        return address
+    forwarded = Headers(scope=scope).get("x-forwarded-for", "")
+    # Entries are appended by each hop, so the client's own one is the first
+    # from the right that no trusted proxy added
+    for hop in reversed([hop.strip() for hop in forwarded.split(",") if hop.strip()]):
+        address = hop
+        if not _is_trusted_proxy(hop):
+            break
+    return address
+
+def identify_client(scope: Scope) -> str:
+    """
+    Identify who a request comes from without touching the database: its
+    X-API-Key once validated, else the user of its bearer token, else its
+    client address.
+    """
+    headers = Headers(scope=scope)
+    api_key = headers.get("x-api-key")
+    if api_key:
+        digest = _api_key_digest(api_key)
+        if digest in verified_api_keys:
+            return "key:" + digest
+
+    authorization = headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            # Verified claims are cached, so this is usually a dict lookup
+            payload = verify_token(token)
+        except HTTPException:
+            payload = None
+        if payload and payload.get("sub"):
+            return "user:" + payload["sub"]
+
+    return "ip:" + client_address(scope)
@@ -2,6 +2,7 @@
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 from pathlib import Path
+from typing import Optional
 import os
 from dotenv import load_dotenv
 
@@ -15,6 +16,11 @@ load_dotenv(ENV_FILE, override=True)
 class Settings(BaseSettings):
     # Database settings
     DB_URL: str
+    # Optional read replica; read-only requests are served from it
+    DB_REPLICA_URL: Optional[str] = None
+    DB_REPLICA_POOL_SIZE: int = 5
+    # Seconds a client's reads stay on the primary after it writes
+    READ_YOUR_WRITES_SECONDS: float = 5.0
 
     # Email settings
     MAIL_USERNAME: str
@@ -26,6 +32,77 @@ class Settings(BaseSettings):
 
     JWT_SECRET_KEY: str
 
+    # Allowed CORS origin of the web frontend
+    FRONTEND_URL: Optional[str] = None
+
+    # Background job settings
+    BACKGROUND_JOBS_ENABLED: bool = True
+    BACKGROUND_JOBS_CONCURRENCY: int = 4
+    BACKGROUND_JOBS_POLL_INTERVAL: float = 5.0
+    # Succeeded and failed outbox jobs are deleted once they are this old
+    BACKGROUND_JOBS_RETENTION_DAYS: int = 7
+
+    # Whether each worker syncs revoked tokens in a background task rather than
+    # on the request that finds its denylist out of date
+    TOKEN_REVOCATION_BACKGROUND_SYNC: bool = True
+
+    # Account balance snapshots are kept per DAY or per MONTH
+    BALANCE_SNAPSHOT_GRANULARITY: str = "DAY"
+
+    # How long responses to requests sent with an Idempotency-Key are kept
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+
+    # Pooled connections opened at startup before the worker reports ready; 0 skips the warm-up
+    DB_POOL_WARM_CONNECTIONS: int = 2
+    # Seconds /readyz waits for the database
+    READINESS_DB_TIMEOUT: float = 2.0
+
+    # MySQL partitioning of the transactions table: "none", "range" (monthly on
+    # transaction_date) or "hash" (on account_id). Must match what its migration
+    # was run with (-x transactions_partitioning or the same environment variable)
+    TRANSACTIONS_PARTITIONING: str = "none"
+    TRANSACTIONS_HASH_PARTITIONS: int = 16
+    # Monthly RANGE partitions kept ahead of the current month
+    TRANSACTIONS_PARTITION_MONTHS_AHEAD: int = 3
+    # Comma separated database URLs of transaction shards, account n going to
+    # shard n % len(shards). Nothing reads or writes through them yet
+    TRANSACTION_SHARD_URLS: Optional[str] = None
+
+    # Transactions older than this many months are moved to transactions_archive
+    # by a daily job; 0 keeps everything in transactions
+    TRANSACTION_ARCHIVE_AFTER_MONTHS: int = 0
+    TRANSACTION_ARCHIVE_BATCH_SIZE: int = 1000
+    # Transaction list counts and facets cached per process, per account data version
+    TRANSACTION_COUNT_CACHE_SIZE: int = 10000
+    # Occurrences of recurring transactions created per batch by the scheduler
+    RECURRING_TRANSACTIONS_BATCH_SIZE: int = 500
+
+    # Token bucket rate limits per API key or user, per route class
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_READ_PER_MINUTE: int = 300
+    RATE_LIMIT_WRITE_PER_MINUTE: int = 60
+    RATE_LIMIT_EXPORT_PER_MINUTE: int = 10
+    RATE_LIMIT_AUTH_PER_MINUTE: int = 10
+    # Share buckets between workers through Redis (requires the redis package)
+    RATE_LIMIT_REDIS_URL: Optional[str] = None
+    # Comma separated addresses or networks of reverse proxies whose
+    # X-Forwarded-For header is trusted to carry the client address
+    TRUSTED_PROXIES: Optional[str] = None
+
+    # Failed logins allowed per email and per client address before lockouts start.
+    # Each further failure doubles the lockout; failures decay with the half-life.
+    LOGIN_MAX_FAILURES_PER_EMAIL: int = 5
+    LOGIN_MAX_FAILURES_PER_IP: int = 20
+    LOGIN_LOCKOUT_BASE_SECONDS: float = 30.0
+    LOGIN_LOCKOUT_MAX_SECONDS: float = 900.0
+    LOGIN_FAILURE_HALF_LIFE_SECONDS: float = 900.0
+
+    # Responses smaller than this many bytes are not compressed
+    COMPRESSION_MINIMUM_SIZE: int = 1000
+    GZIP_COMPRESSION_LEVEL: int = 6
+    # Only used when the optional brotli package is installed
+    BROTLI_QUALITY: int = 4
+
     # Test database settings
     TEST_DB_URL: str
 
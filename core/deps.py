@@ -2,20 +2,24 @@ from fastapi import Depends, HTTPException, status, Request, Header
 from fastapi.security import OAuth2PasswordBearer, HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
-from typing import Generator, Optional
-import os
+from typing import Generator, Optional, TYPE_CHECKING
+from functools import lru_cache
 import logging
 
 from db.session import get_db
-from db.models.user_auth import UserAuth
 from db.models.user import User
 from db.models.api_key import APIKey
 from services.api_key_service import APIKeyService
 from core.config import settings
 from core.jwt import verify_token
-from core.email import EmailCore
+from core.revocation import revocation_store
+from core.client_identity import verified_api_keys
+from core.idempotency import IdempotentRequest
 from crud.user import UserCRUD
 
+if TYPE_CHECKING:
+    from core.email import EmailCore
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 security = HTTPBearer()
 
@@ -29,13 +33,9 @@ async def get_current_user(
         token = credentials.credentials
         logger.info("Received token from credentials")
         
-        # Use test secret key if in test environment
-        secret_key = os.getenv("JWT_SECRET_KEY")
-        logger.info(f"Using JWT secret key: {'[MASKED]' if secret_key else 'None'}")
-        
         try:
-            payload = verify_token(token, secret_key=secret_key)
-            logger.info(f"Token verification successful. Payload: {payload}")
+            # Verified with the key loaded from settings at startup
+            payload = verify_token(token)
         except Exception as e:
             logger.error(f"Token verification failed: {str(e)}")
             raise HTTPException(
@@ -45,11 +45,19 @@ async def get_current_user(
             )
 
         if not payload or "sub" not in payload:
-            logger.error(f"Invalid payload structure: {payload}")
+            logger.error("Token payload has no subject")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid authentication credentials - missing subject"
             )
+
+        if revocation_store.is_revoked(db, payload.get("jti"), payload.get("fam")):
+            logger.error("Token has been revoked")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
             
         logger.info(f"Looking up user with email: {payload['sub']}")
         
@@ -110,6 +118,8 @@ async def get_api_key_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired API key"
         )
+    # From now on the rate limiter gives this key its own bucket
+    verified_api_keys.add(api_key)
     
     user = db.query(User).filter(User.id == api_key_obj.user_id).first()
     if not user:
@@ -122,8 +132,21 @@ async def get_api_key_user(
     db.refresh(user)
     return user
 
-def get_email_core() -> EmailCore:
+@lru_cache(maxsize=None)
+def get_email_core() -> "EmailCore":
     """
-    Get email core instance.
+    Get the process-wide email core instance.
+    Building it parses the mail config and compiles every template, so it is done
+    once, from the app lifespan; fastapi_mail and jinja2 are only imported then.
     """
-    return EmailCore() 
\ No newline at end of file
+    from core.email import EmailCore
+    return EmailCore()
+
+async def get_idempotent_request(
+    request: Request,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", min_length=1, max_length=255),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> IdempotentRequest:
+    """Wrap a write request so retries sent with the same Idempotency-Key replay the first response"""
+    return IdempotentRequest(db, current_user.id, idempotency_key, request.method, request.url.path)
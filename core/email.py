@@ -1,9 +1,9 @@
 from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
 from pydantic import EmailStr
-from typing import List, Optional
+from typing import Dict, Optional
 import os
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, Template
 from core.config import settings
 import ssl
 from fastapi import HTTPException
@@ -26,11 +26,45 @@ class EmailCore:
             TIMEOUT=60
         )
         
+        # Templates are compiled once at startup; auto_reload is off so
+        # rendering never stats the template files again
         self.template_env = Environment(
-            loader=FileSystemLoader(self.configuration.TEMPLATE_FOLDER)
+            loader=FileSystemLoader(self.configuration.TEMPLATE_FOLDER),
+            auto_reload=False
         )
+        self.templates: Dict[str, Template] = {
+            name: self.template_env.get_template(name)
+            for name in self.template_env.list_templates(extensions=["html"])
+        }
         self.fastmail = FastMail(self.configuration)
 
+    def get_template(self, template_name: str) -> Template:
+        """Get a compiled template, compiling and caching it on first use"""
+        template = self.templates.get(template_name)
+        if template is None:
+            template = self.template_env.get_template(template_name)
+            self.templates[template_name] = template
+        return template
+
+    def build_message(
+        self,
+        to: EmailStr,
+        subject: str,
+        html_content: str,
+        template_name: Optional[str] = None,
+        template_data: Optional[dict] = None
+    ) -> MessageSchema:
+        """Build an HTML message, rendering the template if one is given"""
+        if template_name and template_data:
+            html_content = self.render_template(template_name, **template_data)
+
+        return MessageSchema(
+            subject=subject,
+            recipients=[to],
+            body=html_content,
+            subtype="html"
+        )
+
     async def send_email(
         self,
         to: EmailStr,
@@ -50,16 +84,7 @@ class EmailCore:
             template_data: Optional data for template rendering
         """
         try:
-            if template_name and template_data:
-                html_content = self.render_template(template_name, **template_data)
-
-            message = MessageSchema(
-                subject=subject,
-                recipients=[to],
-                body=html_content,
-                subtype="html"
-            )
-            
+            message = self.build_message(to, subject, html_content, template_name, template_data)
             await self.fastmail.send_message(message)
         except Exception as e:
             raise HTTPException(
@@ -79,8 +104,7 @@ class EmailCore:
             Rendered template as string
         """
         try:
-            template = self.template_env.get_template(template_name)
-            return template.render(**kwargs)
+            return self.get_template(template_name).render(**kwargs)
         except Exception as e:
             raise HTTPException(
                 status_code=500,
@@ -0,0 +1,107 @@
+import logging
+import threading
+from typing import Callable, List
+from sqlalchemy import text
+from sqlalchemy.engine import Engine, Row
+from sqlalchemy.orm import Session
+from crud.user import UserCRUD
+from core.revocation import revocation_store
+from db.models.account import Account
+from db.models.user import User
+from services.budget_service import BudgetService
+from services.category_service import CategoryService
+from services.pot_service import PotService
+from services.transaction_service import TransactionService
+
+logger = logging.getLogger(__name__)
+
+# Queries run by most requests, executed once at startup so their SQL is compiled
+# and cached by the engine before traffic arrives. They run for an existing
+# account, so the statements and plans are the ones real requests use.
+HOT_QUERIES: List[Callable[[Session, Row], object]] = [
+    lambda db, sample: UserCRUD(db).get_by_email(sample.email),
+    lambda db, sample: revocation_store.is_revoked(db),
+    lambda db, sample: TransactionService(db).get_transaction_rows(account_id=sample.account_id),
+    lambda db, sample: BudgetService(db).get_budget_rows(user_id=sample.user_id),
+    lambda db, sample: PotService(db).get_pot_rows(user_id=sample.user_id),
+    lambda db, sample: CategoryService(db).get_category_rows(user_id=sample.user_id),
+]
+
+class Readiness:
+    """Whether this worker has finished its startup warm-up and may receive traffic"""
+
+    def __init__(self):
+        self._ready = threading.Event()
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def mark_ready(self) -> None:
+        self._ready.set()
+
+    def mark_not_ready(self) -> None:
+        self._ready.clear()
+
+readiness = Readiness()
+
+def check_database(session_factory: Callable[[], Session]) -> None:
+    """
+    Run a trivial query on a session of its own, raising if the database cannot
+    be reached. The session is closed here, so a caller that stops waiting does
+    not leave it in use.
+    """
+    db = session_factory()
+    try:
+        db.execute(text("SELECT 1"))
+    finally:
+        db.close()
+
+def warm_pool(engine: Engine, connections: int) -> None:
+    """
+    Open `connections` pooled connections at once and return them to the pool,
+    so the first requests do not pay for connecting and the handshake.
+    """
+    pool_size = getattr(engine.pool, "size", None)
+    if callable(pool_size):
+        connections = min(connections, pool_size())
+    held = []
+    try:
+        for _ in range(connections):
+            connection = engine.connect()
+            held.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in held:
+            connection.close()
+
+def precompile_queries(session_factory: Callable[[], Session]) -> None:
+    """Run the hot queries once so the engine's compiled statement cache is populated"""
+    db = session_factory()
+    try:
+        sample = (
+            db.query(Account.id.label("account_id"), Account.user_id, User.email)
+            .join(User, User.id == Account.user_id)
+            .order_by(Account.id)
+            .first()
+        )
+        if sample is None:
+            logger.info("No accounts yet, skipping hot query precompilation")
+            return
+        for query in HOT_QUERIES:
+            query(db, sample)
+    finally:
+        db.rollback()
+        db.close()
+
+def warm_up(engine: Engine, session_factory: Callable[[], Session], connections: int) -> None:
+    """Warm the connection pool and the compiled query cache; failures only cost speed"""
+    if connections <= 0:
+        return
+    try:
+        warm_pool(engine, connections)
+        precompile_queries(session_factory)
+    except Exception as e:
+        logger.error(f"Startup warm-up failed: {e}")
+    else:
+        logger.info(f"Warmed {connections} pooled connections and {len(HOT_QUERIES)} hot queries")
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+from fastapi import HTTPException, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from db.models.idempotency_key import IdempotencyKey
+from core.config import settings
+
+IDEMPOTENCY_CACHE_SIZE = 10000
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+class IdempotencyStore:
+    """
+    Stored responses of write requests made with an Idempotency-Key header.
+
+    The idempotency_keys table is the source of truth and its unique
+    (user_id, key) index makes a retry a single indexed lookup. Completed
+    responses are also kept in a per-process LRU so most retries, which arrive
+    shortly after the original request, never reach the database.
+    """
+
+    def __init__(self, ttl: timedelta = timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS), max_size: int = IDEMPOTENCY_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[tuple[int, str], tuple[str, int, Any, datetime]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def hash_request(method: str, path: str, payload: Any) -> str:
+        """Fingerprint a request so a key reused with a different request can be rejected"""
+        body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(f"{method} {path}\n{body}".encode()).hexdigest()
+
+    def get(self, db: Session, user_id: int, key: str) -> Optional[tuple[str, int, Any]]:
+        """Return the (request_hash, status_code, body) stored for a key, if it has not expired"""
+        now = _utcnow()
+        with self._lock:
+            entry = self._entries.get((user_id, key))
+            if entry and entry[3] > now:
+                self._entries.move_to_end((user_id, key))
+                return entry[:3]
+
+        record = db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.expires_at > now
+        ).first()
+        if not record:
+            return None
+        self._remember(user_id, key, record.request_hash, record.status_code, record.response_body, record.expires_at)
+        return record.request_hash, record.status_code, record.response_body
+
+    def save(self, db: Session, user_id: int, key: str, request_hash: str, status_code: int, body: Any) -> None:
+        """
+        Store the response for a key. The caller is responsible for committing,
+        so the response is only kept if the write it describes is committed.
+        """
+        now = _utcnow()
+        # An expired record for the same key would block the unique index
+        db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.expires_at <= now
+        ).delete(synchronize_session=False)
+        db.add(IdempotencyKey(
+            user_id=user_id,
+            key=key,
+            request_hash=request_hash,
+            status_code=status_code,
+            response_body=body,
+            expires_at=now + self.ttl
+        ))
+
+    def remember(self, user_id: int, key: str, request_hash: str, status_code: int, body: Any) -> None:
+        """Cache a response once the transaction that saved it has committed"""
+        self._remember(user_id, key, request_hash, status_code, body, _utcnow() + self.ttl)
+
+    def _remember(self, user_id: int, key: str, request_hash: str, status_code: int, body: Any, expires_at: datetime) -> None:
+        with self._lock:
+            self._entries[(user_id, key)] = (request_hash, status_code, body, expires_at)
+            self._entries.move_to_end((user_id, key))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def purge_expired(self, db: Session) -> int:
+        """Delete stored responses whose keys have expired"""
+        deleted = db.query(IdempotencyKey).filter(
+            IdempotencyKey.expires_at <= _utcnow()
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+idempotency_store = IdempotencyStore()
+
+class IdempotentRequest:
+    """
+    A write request that may carry an Idempotency-Key header.
+
+    Endpoints call replay() before doing any work and complete() instead of
+    committing. Without a key both simply fall through to a plain commit.
+    """
+
+    def __init__(self, db: Session, user_id: int, key: Optional[str], method: str, path: str, store: IdempotencyStore = idempotency_store):
+        self.db = db
+        self.user_id = user_id
+        self.key = key
+        self.method = method
+        self.path = path
+        self.store = store
+        self.request_hash: Optional[str] = None
+
+    def replay(self, payload: Any) -> Optional[ORJSONResponse]:
+        """Return the stored response if this key was already used for the same request"""
+        if not self.key:
+            return None
+        self.request_hash = self.store.hash_request(self.method, self.path, payload)
+        stored = self.store.get(self.db, self.user_id, self.key)
+        if stored is None:
+            return None
+        return self._replayed(*stored)
+
+    def complete(self, status_code: int, response: BaseModel) -> Any:
+        """Commit the write, storing its response first if the request has a key"""
+        if not self.key:
+            self.db.commit()
+            return response
+
+        body = response.model_dump(mode="json")
+        self.store.save(self.db, self.user_id, self.key, self.request_hash, status_code, body)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # A concurrent request with the same key committed first; its write stands
+            self.db.rollback()
+            stored = self.store.get(self.db, self.user_id, self.key)
+            if stored is None:
+                raise
+            return self._replayed(*stored)
+        self.store.remember(self.user_id, self.key, self.request_hash, status_code, body)
+        return response
+
+    def _replayed(self, request_hash: str, status_code: int, body: Any) -> ORJSONResponse:
+        if request_hash != self.request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key has already been used for a different request"
+            )
+        return ORJSONResponse(status_code=status_code, content=body, headers={REPLAYED_HEADER: "true"})
@@ -2,18 +2,71 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import JWTError, jwt
 from fastapi import HTTPException, status
-from pathlib import Path
-import os
-from dotenv import load_dotenv
+from collections import OrderedDict
+import hashlib
+import threading
+import time
+import uuid
+from core.config import settings
 
-BASE_DIR = Path(__file__).resolve().parent.parent
-ENV_FILE = os.path.join(BASE_DIR, ".env")
-load_dotenv(ENV_FILE, override=True)
-
-SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+SECRET_KEY = settings.JWT_SECRET_KEY
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 REFRESH_TOKEN_EXPIRE_DAYS = 7
+CLAIMS_CACHE_SIZE = 10000
+
+class ClaimsCache:
+    """
+    LRU cache of verified token claims, keyed by a SHA-256 digest of the token.
+
+    A bearer token is presented on every request for its whole lifetime, so the
+    signature check and claim parsing only need to happen the first time it is
+    seen. Entries are only served until the token's exp and only for the key they
+    were verified with. Revocation is checked by callers on every request, so a
+    cached entry never outlives a logout.
+    """
+
+    def __init__(self, max_size: int = CLAIMS_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, tuple[str, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str, key: str) -> Optional[dict]:
+        digest = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            cached_key, claims = entry
+            if cached_key != key or claims.get("exp", 0) <= time.time():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            return dict(claims)
+
+    def put(self, token: str, key: str, claims: dict) -> None:
+        # Tokens without an expiry would otherwise be trusted forever
+        if "exp" not in claims:
+            return
+        digest = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            self._entries[digest] = (key, dict(claims))
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+claims_cache = ClaimsCache()
+
+def new_token_id() -> str:
+    """Generate an id for the jti and token family claims"""
+    return uuid.uuid4().hex
 
 def create_access_token(
     data: dict, 
@@ -21,6 +74,7 @@ def create_access_token(
     secret_key: Optional[str] = None
 ) -> str:
     to_encode = data.copy()
+    to_encode.setdefault("jti", new_token_id())
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
     else:
@@ -36,6 +90,7 @@ def create_refresh_token(
     secret_key: Optional[str] = None
 ) -> str:
     to_encode = data.copy()
+    to_encode.setdefault("jti", new_token_id())
     expire = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode.update({"exp": expire})
     key_to_use = secret_key or SECRET_KEY
@@ -46,9 +101,13 @@ def verify_token(
     token: str,
     secret_key: Optional[str] = None
 ) -> dict:
+    key_to_use = secret_key or SECRET_KEY
+    payload = claims_cache.get(token, key_to_use)
+    if payload is not None:
+        return payload
     try:
-        key_to_use = secret_key or SECRET_KEY
         payload = jwt.decode(token, key_to_use, algorithms=[ALGORITHM])
+        claims_cache.put(token, key_to_use, payload)
         return payload
     except JWTError:
         raise HTTPException(
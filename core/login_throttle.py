@@ -0,0 +1,99 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from fastapi import HTTPException, status
+from core.config import settings
+
+LOGIN_THROTTLE_CACHE_SIZE = 100000
+
+class LoginThrottle:
+    """
+    Failed login counters per email and per client address, with exponential lockout.
+
+    Once an email or address reaches its failure threshold, every further
+    failure doubles its lockout, up to max_lockout. Failure counts decay
+    exponentially with a half-life of decay_half_life seconds. Users who stop
+    trying are let back in gradually, without a reset job.
+
+    Everything is checked in memory before the user lookup and the bcrypt verify.
+    A locked-out attempt therefore costs a dict lookup rather than a hash. The
+    per address threshold is higher because many users can share one address.
+    """
+
+    def __init__(
+        self,
+        max_failures_per_email: int = settings.LOGIN_MAX_FAILURES_PER_EMAIL,
+        max_failures_per_ip: int = settings.LOGIN_MAX_FAILURES_PER_IP,
+        base_lockout: float = settings.LOGIN_LOCKOUT_BASE_SECONDS,
+        max_lockout: float = settings.LOGIN_LOCKOUT_MAX_SECONDS,
+        decay_half_life: float = settings.LOGIN_FAILURE_HALF_LIFE_SECONDS,
+        max_size: int = LOGIN_THROTTLE_CACHE_SIZE
+    ):
+        self.thresholds = {"email": max_failures_per_email, "ip": max_failures_per_ip}
+        self.base_lockout = base_lockout
+        self.max_lockout = max_lockout
+        self.decay_half_life = decay_half_life
+        self.max_size = max_size
+        # (kind, value) -> (failures, updated_at, locked_until)
+        self._entries: "OrderedDict[tuple[str, str], tuple[float, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _keys(email: str, client_ip: Optional[str]) -> list[tuple[str, str]]:
+        keys = [("email", email.strip().casefold())]
+        if client_ip:
+            keys.append(("ip", client_ip))
+        return keys
+
+    def _decayed(self, failures: float, updated_at: float, now: float) -> float:
+        return failures * 0.5 ** ((now - updated_at) / self.decay_half_life)
+
+    def check(self, email: str, client_ip: Optional[str] = None) -> None:
+        """Raise 429 with Retry-After if the email or the client address is locked out"""
+        now = time.monotonic()
+        retry_after = 0.0
+        with self._lock:
+            for key in self._keys(email, client_ip):
+                entry = self._entries.get(key)
+                if entry and entry[2] > now:
+                    retry_after = max(retry_after, entry[2] - now)
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many failed login attempts, try again later",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+    def record_failure(self, email: str, client_ip: Optional[str] = None) -> None:
+        """Count a failed login, locking out the email or address once it is over its threshold"""
+        now = time.monotonic()
+        with self._lock:
+            for key in self._keys(email, client_ip):
+                failures, updated_at, locked_until = self._entries.get(key, (0.0, now, 0.0))
+                failures = self._decayed(failures, updated_at, now) + 1
+                # Failures moments apart have barely decayed; count them as whole
+                over = math.floor(failures + 0.01) - self.thresholds[key[0]]
+                if over >= 0:
+                    lockout = min(self.max_lockout, self.base_lockout * 2 ** min(over, 32))
+                    locked_until = max(locked_until, now + lockout)
+                self._entries[key] = (failures, now, locked_until)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def record_success(self, email: str) -> None:
+        """
+        Forget an email's failures once its password has been given correctly.
+        The client address keeps its failures until they decay, so logging into
+        one account cannot wipe out failures sprayed at others.
+        """
+        with self._lock:
+            self._entries.pop(("email", email.strip().casefold()), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+login_throttle = LoginThrottle()
@@ -0,0 +1,22 @@
+import base64
+import binascii
+from typing import Any, List, Sequence
+import orjson
+from fastapi import HTTPException, status
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Opaque cursor for keyset pagination: the sort key of the last item returned,
+    as URL safe base64 of a JSON array.
+    """
+    return base64.urlsafe_b64encode(orjson.dumps(list(values))).rstrip(b"=").decode()
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """The values given to encode_cursor; 400 if the cursor was not made by it"""
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        values = None
+    if not isinstance(values, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
@@ -0,0 +1,223 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Type
+from fastapi import HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.orm import Session
+from typing_extensions import NotRequired, TypedDict
+
+def _column_names(model: Any) -> set:
+    """Column names of a model's table; read from the table so mappers need not be configured yet"""
+    return set(model.__table__.columns.keys())
+
+class Expansion(NamedTuple):
+    """A nested object a list item can be expanded with"""
+    foreign_key: Any
+    model: Any
+    schema: Type[BaseModel]
+
+class Selection(NamedTuple):
+    """The fields and expansions a client asked for with ?fields= and ?expand="""
+    fields: tuple[str, ...]
+    expand: tuple[str, ...] = ()
+
+class ListProjection:
+    """
+    Fast serialization path for list endpoints, with sparse fieldsets.
+
+    Rows are selected as plain column tuples instead of ORM objects and are
+    serialized straight to JSON by a cached TypeAdapter built from the existing
+    response schema, so they are never validated into Pydantic models. Only the
+    columns behind the requested fields are selected, and nested objects are only
+    loaded, with one IN query each, when asked for with expand.
+    """
+
+    def __init__(self, model: Any, schema: Type[BaseModel], expansions: Optional[Dict[str, Expansion]] = None):
+        self.model = model
+        self.schema = schema
+        self.expansions = expansions or {}
+        column_names = _column_names(model)
+        self.column_names = [
+            name for name in schema.model_fields
+            if name in column_names and name not in self.expansions
+        ]
+        # Schema fields that are not columns (e.g. computed values) are filled in by the caller
+        self.extra_names = [
+            name for name in schema.model_fields
+            if name not in column_names and name not in self.expansions
+        ]
+        self.field_names = [name for name in schema.model_fields if name not in self.expansions]
+
+    def parse(self, fields: Optional[str] = None, expand: Optional[str] = None) -> Selection:
+        """
+        Parse comma separated fields and expand parameters, rejecting unknown names.
+        Without fields every field is returned; id is always returned.
+        """
+        requested = _split(fields)
+        expand_names = _split(expand)
+        unknown_fields = [name for name in requested if name not in self.field_names]
+        if unknown_fields:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields {', '.join(sorted(unknown_fields))}; expected any of {', '.join(self.field_names)}"
+            )
+        unknown_expand = [name for name in expand_names if name not in self.expansions]
+        if unknown_expand:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot expand {', '.join(sorted(unknown_expand))}; expected any of {', '.join(sorted(self.expansions))}"
+            )
+
+        if requested:
+            requested.add("id")
+            selected = tuple(name for name in self.field_names if name in requested)
+        else:
+            selected = tuple(self.field_names)
+        return Selection(selected, tuple(name for name in self.expansions if name in expand_names))
+
+    def include(self, selection: Selection, *names: str) -> Selection:
+        """Add fields to a selection, keeping schema order"""
+        wanted = set(selection.fields) | set(names)
+        return selection._replace(fields=tuple(name for name in self.field_names if name in wanted))
+
+    def columns(self, selection: Selection, *internal: str) -> List[Any]:
+        """
+        Columns to select for a selection: the requested fields, the foreign keys
+        of expanded objects and any internal columns the caller needs.
+        """
+        names = self._selected_column_names(selection, internal)
+        return [getattr(self.model, name) for name in names]
+
+    def to_dicts(
+        self,
+        db: Session,
+        rows: Iterable[Sequence[Any]],
+        selection: Selection,
+        *internal: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Turn rows selected with columns() into response dicts, loading the
+        requested nested objects. Pass the same internal names given to columns().
+        """
+        names = self._selected_column_names(selection, internal)
+        items = [dict(zip(names, row)) for row in rows]
+        for name in selection.expand:
+            expansion = self.expansions[name]
+            key = expansion.foreign_key.key
+            related = self._load_related(db, expansion, {item[key] for item in items if item[key] is not None})
+            for item in items:
+                item[name] = related.get(item[key])
+
+        computed = [name for name in selection.fields if name in self.extra_names]
+        hidden = [name for name in names if name not in selection.fields]
+        for item in items:
+            for name in computed:
+                item.setdefault(name, None)
+            for name in hidden:
+                del item[name]
+        return items
+
+    def _selected_column_names(self, selection: Selection, internal: Sequence[str]) -> List[str]:
+        wanted = set(selection.fields) | set(internal)
+        wanted.update(self.expansions[name].foreign_key.key for name in selection.expand)
+        return [name for name in self.column_names if name in wanted]
+
+    def _load_related(self, db: Session, expansion: Expansion, ids: set) -> Dict[Any, Dict[str, Any]]:
+        if not ids:
+            return {}
+        names = _schema_columns(expansion)
+        rows = db.query(*(getattr(expansion.model, name) for name in names)).filter(
+            expansion.model.id.in_(ids)
+        ).all()
+        return {row.id: dict(zip(names, row)) for row in rows}
+
+    def render(
+        self,
+        items: List[Dict[str, Any]],
+        message: str,
+        selection: Selection,
+        count: Optional[int] = None,
+        facets: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    ) -> Response:
+        """
+        Serialize items in the ListResponseModel envelope, with the total count
+        and facet counts of a CountedListResponseModel when given
+        """
+        adapter = _list_adapter(self, selection)
+        content = {"data": items, "message": message}
+        if count is not None:
+            content["count"] = count
+        if facets is not None:
+            content["facets"] = facets
+        return Response(content=adapter.dump_json(content), media_type="application/json")
+
+    def render_page(
+        self,
+        items: List[Dict[str, Any]],
+        next_cursor: Optional[str],
+        message: str,
+        selection: Selection
+    ) -> Response:
+        """Serialize one page of items, with the cursor of the next page (None on the last page)"""
+        adapter = _page_adapter(self, selection)
+        return Response(
+            content=adapter.dump_json({"data": items, "next_cursor": next_cursor, "message": message}),
+            media_type="application/json"
+        )
+
+    def stream(self, items: Iterator[Dict[str, Any]], selection: Selection) -> StreamingResponse:
+        """
+        Serialize items as newline delimited JSON while they are produced, so a
+        response of any length only holds one batch of rows in memory.
+        """
+        adapter = _item_adapter(self, selection)
+        return StreamingResponse(
+            (adapter.dump_json(item) + b"\n" for item in items),
+            media_type="application/x-ndjson"
+        )
+
+def _split(value: Optional[str]) -> set:
+    return {name.strip() for name in (value or "").split(",") if name.strip()}
+
+def _schema_columns(expansion: Expansion) -> List[str]:
+    """Fields of an expansion's schema that are columns of its model"""
+    related_columns = _column_names(expansion.model)
+    return [name for name in expansion.schema.model_fields if name in related_columns]
+
+def _typed_dict(schema: Type[BaseModel], names: Iterable[str], nested: Optional[Dict[str, Any]] = None) -> Any:
+    """A TypedDict mirroring the given fields of a schema, for validation-free serialization"""
+    fields = {name: schema.model_fields[name].annotation for name in names}
+    fields.update(nested or {})
+    return TypedDict(f"{schema.__name__}Row", fields)
+
+@lru_cache(maxsize=256)
+def _item_type(projection: ListProjection, selection: Selection) -> Any:
+    nested = {}
+    for name in selection.expand:
+        expansion = projection.expansions[name]
+        nested[name] = Optional[_typed_dict(expansion.schema, _schema_columns(expansion))]
+    return _typed_dict(projection.schema, selection.fields, nested)
+
+@lru_cache(maxsize=256)
+def _item_adapter(projection: ListProjection, selection: Selection) -> TypeAdapter:
+    return TypeAdapter(_item_type(projection, selection))
+
+@lru_cache(maxsize=256)
+def _list_adapter(projection: ListProjection, selection: Selection) -> TypeAdapter:
+    item = _item_type(projection, selection)
+    envelope = TypedDict(f"{projection.schema.__name__}ListResponse", {
+        "data": List[item],
+        "message": str,
+        "count": NotRequired[int],
+        "facets": NotRequired[Dict[str, List[Dict[str, Any]]]]
+    })
+    return TypeAdapter(envelope)
+
+@lru_cache(maxsize=256)
+def _page_adapter(projection: ListProjection, selection: Selection) -> TypeAdapter:
+    item = _item_type(projection, selection)
+    envelope = TypedDict(
+        f"{projection.schema.__name__}PageResponse",
+        {"data": List[item], "next_cursor": Optional[str], "message": str}
+    )
+    return TypeAdapter(envelope)
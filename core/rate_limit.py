@@ -0,0 +1,207 @@
+import inspect
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+from starlette.datastructures import MutableHeaders
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from core.config import settings
+from core.client_identity import identify_client
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # redis is only needed for the shared backend
+    redis = None
+
+RATE_LIMIT_CACHE_SIZE = 100000
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+# Probes must keep answering however busy a worker is
+EXEMPT_PATHS = {"/healthz", "/readyz"}
+
+class RateLimit(NamedTuple):
+    """A token bucket holding up to `capacity` requests, refilled over `period` seconds"""
+    capacity: int
+    period: float = 60.0
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.period
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    remaining: int
+    # Seconds until the bucket is full again
+    reset: float
+    # Seconds until the next request would be allowed; 0 when allowed
+    retry_after: float
+
+def _result(limit: RateLimit, tokens: float, allowed: bool) -> RateLimitResult:
+    return RateLimitResult(
+        allowed=allowed,
+        remaining=int(tokens),
+        reset=(limit.capacity - tokens) / limit.refill_rate,
+        retry_after=0.0 if allowed else (1 - tokens) / limit.refill_rate
+    )
+
+class InMemoryRateLimitBackend:
+    """
+    Token buckets kept in this process.
+
+    Each bucket is stored as (tokens, last refill time) and refilled lazily when
+    it is next used, so taking a token is a dict lookup and a little arithmetic.
+    The least recently used buckets are dropped past max_size; a dropped bucket
+    simply starts full again.
+    """
+
+    def __init__(self, max_size: int = RATE_LIMIT_CACHE_SIZE):
+        self.max_size = max_size
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, limit: RateLimit) -> RateLimitResult:
+        """Take one token from a bucket if it has one"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (limit.capacity, now))
+            tokens = min(limit.capacity, tokens + (now - updated_at) * limit.refill_rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_size:
+                self._buckets.popitem(last=False)
+        return _result(limit, tokens, allowed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+# Refill and take a token atomically on the Redis server
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+class RedisRateLimitBackend:
+    """
+    Token buckets shared by every worker through Redis, for deployments where
+    per-process buckets would multiply the effective limit by the worker count.
+    Buckets expire once they would have refilled, so idle keys cost nothing.
+    Redis is called through its asyncio client so a slow round trip does not
+    block the event loop.
+    """
+
+    def __init__(self, url: str, prefix: str = "rate_limit:"):
+        if redis is None:
+            raise RuntimeError("The redis package is required for RATE_LIMIT_REDIS_URL")
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._take = self.client.register_script(_TAKE_SCRIPT)
+
+    async def take(self, key: str, limit: RateLimit) -> RateLimitResult:
+        """Take one token from a bucket if it has one"""
+        allowed, tokens = await self._take(
+            keys=[self.prefix + key],
+            args=[limit.capacity, limit.refill_rate, time.time()]
+        )
+        return _result(limit, float(tokens), bool(allowed))
+
+    async def clear(self) -> None:
+        async for key in self.client.scan_iter(f"{self.prefix}*"):
+            await self.client.delete(key)
+
+def get_rate_limit_backend():
+    """The shared Redis backend when RATE_LIMIT_REDIS_URL is set, otherwise per process buckets"""
+    if settings.RATE_LIMIT_REDIS_URL:
+        return RedisRateLimitBackend(settings.RATE_LIMIT_REDIS_URL)
+    return InMemoryRateLimitBackend()
+
+def default_limits() -> Dict[str, RateLimit]:
+    """Per minute budgets of each route class, from settings"""
+    return {
+        "read": RateLimit(settings.RATE_LIMIT_READ_PER_MINUTE),
+        "write": RateLimit(settings.RATE_LIMIT_WRITE_PER_MINUTE),
+        "export": RateLimit(settings.RATE_LIMIT_EXPORT_PER_MINUTE),
+        "auth": RateLimit(settings.RATE_LIMIT_AUTH_PER_MINUTE),
+    }
+
+class RateLimitMiddleware:
+    """
+    Token bucket rate limiting per API key, per user and per route class.
+
+    Requests are counted against the X-API-Key they carry once it has been seen to
+    be valid, else the user of their bearer token, else their client address
+    (e.g. logins and unverified keys), in a separate bucket
+    for each route class: auth, export, write and read. Limited requests get a
+    429 before reaching any endpoint or the database. Every response carries
+    RateLimit-Limit, RateLimit-Remaining and RateLimit-Reset headers.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limits: Optional[Dict[str, RateLimit]] = None,
+        backend=None,
+        enabled: bool = True
+    ):
+        self.app = app
+        self.limits = limits or default_limits()
+        self.backend = backend or get_rate_limit_backend()
+        self.enabled = enabled
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.enabled or scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        route_class = self.classify(scope["method"], scope["path"])
+        limit = self.limits[route_class]
+        result = self.backend.take(f"{route_class}:{identify_client(scope)}", limit)
+        if inspect.isawaitable(result):
+            # The shared backend is asynchronous
+            result = await result
+        headers = {
+            "RateLimit-Limit": str(limit.capacity),
+            "RateLimit-Remaining": str(result.remaining),
+            "RateLimit-Reset": str(math.ceil(result.reset)),
+            "RateLimit-Policy": f"{limit.capacity};w={int(limit.period)}",
+        }
+        if not result.allowed:
+            headers["Retry-After"] = str(math.ceil(result.retry_after))
+            response = ORJSONResponse({"detail": "Rate limit exceeded"}, status_code=429, headers=headers)
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    @staticmethod
+    def classify(method: str, path: str) -> str:
+        """The route class whose budget a request is counted against"""
+        if path.startswith("/api/v1/auth"):
+            return "auth"
+        if "export" in path.rsplit("/", 2)[-2:]:
+            return "export"
+        if method in WRITE_METHODS:
+            return "write"
+        return "read"
@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from db.models.revoked_token import RevokedToken
+from db.models.user_auth import UserAuth
+
+logger = logging.getLogger(__name__)
+
+# How far before the newest created_at already seen each sync reads again.
+# A row's created_at is set when it is inserted, so a revocation whose
+# transaction commits later than this is only found by the next full load.
+SYNC_OVERLAP = timedelta(seconds=60)
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def _to_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+class TokenRevocationStore:
+    """
+    Denylist of revoked token ids (jti) and token families.
+
+    The revoked_tokens table is the source of truth so revocations are shared
+    between workers. Each process mirrors it in memory, so checking a token is a
+    dict lookup. Every login revokes the previous token family until it
+    expires, so the table holds about one row per login within the refresh
+    token lifetime. It is loaded in full once per process. After that, each
+    sync reads only the rows created since the newest one already seen, less
+    SYNC_OVERLAP. The overlap also picks up rows whose transaction committed
+    after a newer row had already been read.
+
+    Started with start(), a background task syncs every sync_interval seconds
+    and requests never wait on it. Without it, e.g. in scripts and tests, a
+    check syncs first once sync_interval has passed.
+    """
+
+    def __init__(self, sync_interval: float = 5.0):
+        self.sync_interval = sync_interval
+        self._revoked: Dict[str, datetime] = {}
+        self._last_synced_at = 0.0
+        # Newest created_at read so far; None until the first full load
+        self._watermark: Optional[datetime] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._refresher: Optional[asyncio.Task] = None
+
+    def revoke(self, db: Session, token_id: str, expires_at: datetime, user_id: Optional[int] = None) -> None:
+        """
+        Revoke a jti or token family until expires_at.
+        The caller is responsible for committing; the in-memory denylist only
+        takes the revocation once that commit succeeds.
+        """
+        expires_at = _to_naive_utc(expires_at)
+        if token_id in self._revoked:
+            return
+        if not db.query(RevokedToken.id).filter(RevokedToken.token_id == token_id).first():
+            db.add(RevokedToken(token_id=token_id, user_id=user_id, expires_at=expires_at))
+        db.info.setdefault("revocations", []).append((self, token_id, expires_at))
+
+    def remember(self, token_id: str, expires_at: datetime) -> None:
+        """Add a committed revocation to the in-memory denylist"""
+        with self._lock:
+            self._revoked[token_id] = expires_at
+
+    def is_revoked(self, db: Session, *token_ids: Optional[str]) -> bool:
+        """Check whether any of the given jti or family ids has been revoked"""
+        if self._refresher is None:
+            self._sync(db)
+        now = _utcnow()
+        for token_id in token_ids:
+            expires_at = self._revoked.get(token_id) if token_id else None
+            if expires_at and expires_at > now:
+                return True
+        return False
+
+    async def start(self, session_factory: Callable[[], Session]) -> None:
+        """Sync in a background task from now on, loading the denylist first"""
+        if self._refresher:
+            return
+        try:
+            await run_in_threadpool(self.sync, session_factory)
+        except Exception as e:
+            # The background task keeps retrying the full load
+            logger.error(f"Loading token revocations failed: {e}")
+        self._refresher = asyncio.create_task(self._refresh(session_factory))
+
+    async def stop(self) -> None:
+        if not self._refresher:
+            return
+        self._refresher.cancel()
+        try:
+            await self._refresher
+        except asyncio.CancelledError:
+            pass
+        self._refresher = None
+
+    async def _refresh(self, session_factory: Callable[[], Session]) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await run_in_threadpool(self.sync, session_factory)
+            except Exception as e:
+                # The previous denylist keeps serving until the database is back
+                logger.error(f"Syncing token revocations failed: {e}")
+
+    def sync(self, session_factory: Callable[[], Session]) -> None:
+        """Sync on a session of its own"""
+        db = session_factory()
+        try:
+            self._sync(db, force=True)
+        finally:
+            db.close()
+
+    def _sync(self, db: Session, force: bool = False) -> None:
+        if not force and time.monotonic() - self._last_synced_at < self.sync_interval:
+            return
+        now = _utcnow()
+        query = db.query(RevokedToken.token_id, RevokedToken.expires_at, RevokedToken.created_at).filter(
+            RevokedToken.expires_at > now
+        )
+        if self._loaded and self._watermark is not None:
+            # Served by the created_at index; only recent revocations are read
+            query = query.filter(RevokedToken.created_at >= self._watermark - SYNC_OVERLAP)
+        rows = query.all()
+        with self._lock:
+            # Merged rather than replaced, so a revocation committed here is kept
+            # even if this read came from a replica that has not caught up yet
+            self._revoked.update((token_id, expires_at) for token_id, expires_at, _ in rows)
+            # Expired entries can never match a valid token again
+            for token_id in [t for t, expires_at in self._revoked.items() if expires_at <= now]:
+                del self._revoked[token_id]
+            created = [created_at for _, _, created_at in rows if created_at is not None]
+            if created and (self._watermark is None or max(created) > self._watermark):
+                self._watermark = max(created)
+            self._loaded = True
+            self._last_synced_at = time.monotonic()
+
+    def purge_expired(self, db: Session) -> int:
+        """Delete revocations and login sessions whose tokens have all expired"""
+        now = _utcnow()
+        deleted = db.query(RevokedToken).filter(RevokedToken.expires_at <= now).delete(synchronize_session=False)
+        deleted += db.query(UserAuth).filter(UserAuth.expires_at <= now).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    def clear(self) -> None:
+        """Forget the in-memory denylist so the next check reloads it"""
+        with self._lock:
+            self._revoked.clear()
+            self._last_synced_at = 0.0
+            self._watermark = None
+            self._loaded = False
+
+revocation_store = TokenRevocationStore()
+
+@event.listens_for(Session, "after_commit")
+def _remember_revocations(session: Session) -> None:
+    pending: List[Tuple[TokenRevocationStore, str, datetime]] = session.info.pop("revocations", [])
+    for store, token_id, expires_at in pending:
+        store.remember(token_id, expires_at)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_revocations(session: Session) -> None:
+    # Rolled back revocations were never stored; a savepoint rollback also lands
+    # here, and the revocations it kept are picked up by the next sync instead
+    session.info.pop("revocations", None)
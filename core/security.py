@@ -1,11 +1,15 @@
 # JWT and password handling
 
-from passlib.context import CryptContext
+from functools import lru_cache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+@lru_cache(maxsize=None)
+def get_pwd_context():
+  # passlib is imported on first use so it does not slow down app startup
+  from passlib.context import CryptContext
+  return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def get_password_hash(password: str) -> str:
-  return pwd_context.hash(password)
+  return get_pwd_context().hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-  return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+  return get_pwd_context().verify(plain_password, hashed_password)
\ No newline at end of file
@@ -24,7 +24,8 @@ class AccountCRUD:
             
         db_account = Account(
             user_id=user_id,
-            balance=initial_balance
+            balance=initial_balance,
+            opening_balance=initial_balance
         )
         self.db.add(db_account)
         self.db.commit()
@@ -38,6 +39,9 @@ class AccountCRUD:
             return None
         
         update_data = account.model_dump(exclude_unset=True)
+        if update_data.get("balance") is not None:
+            # A manual balance change is an adjustment outside the ledger
+            db_account.opening_balance = (db_account.opening_balance or 0) + update_data["balance"] - (db_account.balance or 0)
         for field, value in update_data.items():
             setattr(db_account, field, value)
         
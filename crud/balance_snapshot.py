@@ -0,0 +1,107 @@
+from typing import Iterable
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from db.models.balance_snapshot import BalanceSnapshot
+from schemas.account import BalanceSnapshotGranularity
+
+class BalanceSnapshotCRUD:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_total_before(
+        self,
+        account_id: int,
+        granularity: BalanceSnapshotGranularity,
+        before: datetime,
+        for_update: bool = False
+    ) -> int:
+        """
+        Get the ledger total of every period starting before `before`: the
+        closing balance of the latest one, read with a single index lookup.
+        With for_update the row is locked until the caller commits.
+        """
+        query = self.db.query(BalanceSnapshot.closing_balance).filter(
+            BalanceSnapshot.account_id == account_id,
+            BalanceSnapshot.granularity == granularity,
+            BalanceSnapshot.period_start < before
+        ).order_by(BalanceSnapshot.period_start.desc()).limit(1)
+        if for_update:
+            query = query.with_for_update()
+        total = query.scalar()
+        return int(total or 0)
+
+    def apply(
+        self,
+        account_id: int,
+        granularity: BalanceSnapshotGranularity,
+        period_start: datetime,
+        amount_change: int
+    ) -> None:
+        """
+        Add amount_change to the net change and closing balance of a period,
+        creating its snapshot if needed, and to the closing balance of every
+        later period in one UPDATE. The caller is responsible for committing.
+        """
+        # The increments are done in SQL so concurrent writers do not lose updates
+        query = self.db.query(BalanceSnapshot).filter(
+            BalanceSnapshot.account_id == account_id,
+            BalanceSnapshot.granularity == granularity,
+            BalanceSnapshot.period_start == period_start
+        )
+        values = {
+            BalanceSnapshot.net_change: BalanceSnapshot.net_change + amount_change,
+            BalanceSnapshot.closing_balance: BalanceSnapshot.closing_balance + amount_change
+        }
+        if not query.update(values, synchronize_session=False):
+            # Lock the previous period so a concurrent backdated write waits for us
+            opening = self.get_total_before(account_id, granularity, period_start, for_update=True)
+            try:
+                with self.db.begin_nested():
+                    self.db.add(BalanceSnapshot(
+                        account_id=account_id,
+                        granularity=granularity,
+                        period_start=period_start,
+                        net_change=amount_change,
+                        closing_balance=opening + amount_change
+                    ))
+            except IntegrityError:
+                # A concurrent writer created the period first; add to its row instead
+                query.update(values, synchronize_session=False)
+
+        self.db.query(BalanceSnapshot).filter(
+            BalanceSnapshot.account_id == account_id,
+            BalanceSnapshot.granularity == granularity,
+            BalanceSnapshot.period_start > period_start
+        ).update(
+            {BalanceSnapshot.closing_balance: BalanceSnapshot.closing_balance + amount_change},
+            synchronize_session=False
+        )
+
+    def replace(
+        self,
+        account_id: int,
+        granularity: BalanceSnapshotGranularity,
+        net_changes: Iterable[tuple[datetime, int]]
+    ) -> None:
+        """
+        Replace all snapshots of an account with (period_start, net_change) pairs,
+        accumulating their closing balances. The caller is responsible for committing.
+        """
+        self.db.query(BalanceSnapshot).filter(
+            BalanceSnapshot.account_id == account_id,
+            BalanceSnapshot.granularity == granularity
+        ).delete(synchronize_session=False)
+        closing_balance = 0
+        snapshots = []
+        for period_start, net_change in sorted(net_changes):
+            closing_balance += net_change
+            snapshots.append(BalanceSnapshot(
+                account_id=account_id,
+                granularity=granularity,
+                period_start=period_start,
+                net_change=net_change,
+                closing_balance=closing_balance
+            ))
+        self.db.add_all(snapshots)
+        self.db.flush()
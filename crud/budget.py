@@ -1,6 +1,7 @@
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence
+from sqlalchemy import Row
 from datetime import datetime, timezone
-from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.orm import Session, joinedload, selectinload, lazyload
 from db.models.budget import Budget
 from schemas.budget import BudgetCreate, BudgetUpdate
 from fastapi import HTTPException
@@ -22,6 +23,7 @@ class BudgetCRUD:
             start_date=budget_data.start_date,
             color=budget_data.color,
             end_date=budget_data.end_date,
+            period=budget_data.period,
             is_active=True
         )
         self.db.add(db_budget)
@@ -41,11 +43,23 @@ class BudgetCRUD:
             .all()
         )
 
-    def get_by_id(self, budget_id: int, user_id: int) -> Optional[Budget]:
-        """Get a budget by ID with its transactions"""
+    def get_multi_rows(self, user_id: int, columns: Sequence[Any], skip: int = 0, limit: int = 100) -> List[Row]:
+        """Get multiple budgets as rows of the given columns, without loading their transactions"""
+        return (
+            self.db.query(*columns)
+            .filter(Budget.user_id == user_id, Budget.is_deleted == False)
+            .order_by(Budget.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    def get_by_id(self, budget_id: int, user_id: int, with_transactions: bool = True) -> Optional[Budget]:
+        """Get a budget by ID, with its transactions unless with_transactions is False"""
+        loader = selectinload(Budget.transactions) if with_transactions else lazyload(Budget.transactions)
         return (
             self.db.query(Budget)
-            .options(selectinload(Budget.transactions))
+            .options(loader)
             .filter(
                 Budget.id == budget_id,
                 Budget.user_id == user_id,
@@ -54,12 +68,15 @@ class BudgetCRUD:
             .first()
         )
 
-    def update(self, db_budget: Budget, update_data: dict) -> Budget:
-        """Update a budget with given data"""
+    def update(self, db_budget: Budget, update_data: dict, commit: bool = True) -> Budget:
+        """Update a budget with given data. With commit=False the caller commits it."""
         for field, value in update_data.items():
             setattr(db_budget, field, value)
         
         db_budget.updated_at = datetime.now(timezone.utc)
+        if not commit:
+            self.db.flush()
+            return db_budget
         self.db.commit()
         self.db.refresh(db_budget)
         return db_budget
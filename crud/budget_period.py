@@ -0,0 +1,63 @@
+from typing import List, Optional
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from db.models.budget_period import BudgetPeriod
+
+class BudgetPeriodCRUD:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, budget_id: int, period_start: datetime) -> Optional[BudgetPeriod]:
+        """Get a budget period by its (budget_id, period_start) key"""
+        return (
+            self.db.query(BudgetPeriod)
+            .filter(
+                BudgetPeriod.budget_id == budget_id,
+                BudgetPeriod.period_start == period_start
+            )
+            .first()
+        )
+
+    def get_multi(self, budget_id: int, skip: int = 0, limit: int = 100) -> List[BudgetPeriod]:
+        """Get the periods of a budget, most recent first"""
+        return (
+            self.db.query(BudgetPeriod)
+            .filter(BudgetPeriod.budget_id == budget_id)
+            .order_by(BudgetPeriod.period_start.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    def increment(self, budget_id: int, period_start: datetime, period_end: datetime, amount_change: int) -> None:
+        """
+        Add amount_change to the spent amount of a period, creating the row if needed.
+        The increment is done in SQL so concurrent writers do not lose updates.
+        The caller is responsible for committing.
+        """
+        query = self.db.query(BudgetPeriod).filter(
+            BudgetPeriod.budget_id == budget_id,
+            BudgetPeriod.period_start == period_start
+        )
+        values = {BudgetPeriod.spent_amount: BudgetPeriod.spent_amount + amount_change}
+        if query.update(values, synchronize_session=False):
+            return
+
+        try:
+            with self.db.begin_nested():
+                self.db.add(BudgetPeriod(
+                    budget_id=budget_id,
+                    period_start=period_start,
+                    period_end=period_end,
+                    spent_amount=amount_change
+                ))
+        except IntegrityError:
+            # A concurrent writer created the period first; add to its row instead
+            query.update(values, synchronize_session=False)
+
+    def delete_for_budget(self, budget_id: int) -> None:
+        """Delete every period of a budget. The caller is responsible for committing."""
+        self.db.query(BudgetPeriod).filter(
+            BudgetPeriod.budget_id == budget_id
+        ).delete(synchronize_session=False)
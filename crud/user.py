@@ -20,14 +20,17 @@ class UserCRUD:
         """Get all users with pagination"""
         return self.db.query(User).offset(skip).limit(limit).all()
 
-    def create(self, user: UserCreate) -> User:
-        """Create new user"""
+    def create(self, user: UserCreate, commit: bool = True) -> User:
+        """Create new user. With commit=False the caller commits it with its other changes."""
         db_user = User(
             username=user.username,
             email=user.email,
             hashed_password=user.password 
         )
         self.db.add(db_user)
+        if not commit:
+            self.db.flush()
+            return db_user
         self.db.commit()
         self.db.refresh(db_user)
         return db_user
@@ -1,11 +1,12 @@
 # DB seeding logic
-from db.session import engine
+from db.session import get_engine
 from db.base import Base
 from db.models import *  # This imports all models
 from sqlalchemy import text
 
 def init_db():
     """Drop all tables and recreate them"""
+    engine = get_engine()
     print("Dropping all tables...")
     # First, disable foreign key checks
     with engine.connect() as conn:
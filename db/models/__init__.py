@@ -1,20 +1,36 @@
 from .user import User
 from .account import Account
+from .balance_snapshot import BalanceSnapshot
 from .budget import Budget
+from .budget_period import BudgetPeriod
 from .category import Category
 from .pots import Pot
 from .transaction import Transaction
+from .archived_transaction import ArchivedTransaction
 from .user_auth import UserAuth
+from .revoked_token import RevokedToken
 from .activation_token import ActivationToken
+from .outbox_job import OutboxJob
+from .periodic_task_run import PeriodicTaskRun
+from .idempotency_key import IdempotencyKey
+from .recurring_transaction import RecurringTransaction
 
 # This ensures all models are imported and registered with Base
 __all__ = [
     "User",
     "Account",
+    "BalanceSnapshot",
     "Budget",
+    "BudgetPeriod",
     "Category",
     "Pot",
     "Transaction",
+    "ArchivedTransaction",
     "UserAuth",
-    "ActivationToken"
+    "RevokedToken",
+    "ActivationToken",
+    "OutboxJob",
+    "PeriodicTaskRun",
+    "IdempotencyKey",
+    "RecurringTransaction"
 ]
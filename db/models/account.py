@@ -9,10 +9,15 @@ class Account(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)
     balance = Column(BigInteger, default=0)
+    # Balance before any transaction; balance should equal this plus the ledger
+    opening_balance = Column(BigInteger, default=0, nullable=False)
+    # Bumped whenever the account's transactions change; keys cached counts
+    transactions_version = Column(BigInteger, default=0, nullable=False)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
     transactions = relationship("Transaction", back_populates="account")
+    balance_snapshots = relationship("BalanceSnapshot", back_populates="account", cascade="all, delete-orphan", lazy="noload")
     user = relationship("User", back_populates="account", uselist=False)
 
     def __repr__(self):
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, BigInteger, Index
+from sqlalchemy.sql import func
+from sqlalchemy.types import Enum
+from ..base import Base
+from schemas.transaction import TransactionType
+
+class ArchivedTransaction(Base):
+    """
+    A transaction moved out of the transactions table by the archive job once it
+    is older than TRANSACTION_ARCHIVE_AFTER_MONTHS. It keeps its id and columns,
+    so list queries reaching back that far can union both tables. The balance
+    snapshots and budget periods it contributed to are left as they were.
+    """
+    __tablename__ = "transactions_archive"
+    __table_args__ = (
+        Index("ix_transactions_archive_account_date", "account_id", "transaction_date"),
+    )
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    account_id = Column(Integer)
+    category_id = Column(Integer)
+    budget_id = Column(Integer, index=True)
+    user_id = Column(Integer)
+    pot_id = Column(Integer)
+    description = Column(String(255), nullable=True)
+    recipient = Column(String(255), nullable=True)
+    sender = Column(String(255), nullable=True)
+    amount = Column(BigInteger)
+    type = Column(Enum(TransactionType, name="transaction_type"))
+    transaction_date = Column(DateTime)
+    meta_data = Column(JSON, nullable=True)
+    fingerprint = Column(String(64), nullable=True)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, default=func.now())
+
+    def __repr__(self):
+        return f"<ArchivedTransaction {self.id}>"
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, BigInteger, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from sqlalchemy.types import Enum
+
+from ..base import Base
+from schemas.account import BalanceSnapshotGranularity
+
+class BalanceSnapshot(Base):
+    """
+    An account's ledger over a day or month: net_change is the sum of its
+    transactions dated within the period, closing_balance the sum of all its
+    transactions dated up to the period's end. The ledger total before a date is
+    the closing balance of the latest earlier period, a single row; a backdated
+    transaction adds to the closing balance of its period and every later one.
+    The opening balance is not included, so changing it does not invalidate
+    snapshots.
+    """
+    __tablename__ = "balance_snapshots"
+    __table_args__ = (
+        # Also serves "latest period before a date" lookups
+        UniqueConstraint("account_id", "granularity", "period_start", name="uq_balance_snapshots_account_granularity_start"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    account_id = Column(Integer, ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False)
+    granularity = Column(Enum(BalanceSnapshotGranularity, name="balance_snapshot_granularity"), nullable=False)
+    period_start = Column(DateTime, nullable=False)
+    net_change = Column(BigInteger, default=0, nullable=False)
+    closing_balance = Column(BigInteger, default=0, nullable=False)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    account = relationship("Account", back_populates="balance_snapshots")
+
+    def __repr__(self):
+        return f"<BalanceSnapshot {self.account_id} {self.period_start}>"
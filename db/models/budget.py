@@ -1,8 +1,10 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from sqlalchemy.types import Enum
 
 from ..base import Base
+from schemas.budget import BudgetPeriodType
 
 class Budget(Base):
     __tablename__ = "budgets"
@@ -18,6 +20,7 @@ class Budget(Base):
     remaining_amount = Column(Integer, default=0)
     start_date = Column(DateTime(timezone=True), default=func.now())
     end_date = Column(DateTime(timezone=True))
+    period = Column(Enum(BudgetPeriodType, name="budget_period_type"), nullable=True)
     is_active = Column(Boolean, default=True)
     is_deleted = Column(Boolean, default=False)
     color = Column(String(50), nullable=True)
@@ -31,6 +34,12 @@ class Budget(Base):
         order_by="desc(Transaction.transaction_date)",
         cascade="all, delete-orphan"
     )
+    periods = relationship(
+        "BudgetPeriod",
+        back_populates="budget",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
 
     def __repr__(self):
         return f"<Budget {self.name}>"
\ No newline at end of file
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+
+from ..base import Base
+
+class IdempotencyKey(Base):
+    """
+    The stored response of a write request made with an Idempotency-Key header.
+    Retries with the same key replay the response instead of repeating the write.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        # Keys are scoped per user; the unique index is also the lookup path
+        UniqueConstraint("user_id", "key", name="uq_idempotency_keys_user_id_key"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=False)
+    response_body = Column(JSON, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime, default=func.now())
+
+    def __repr__(self):
+        return f"<IdempotencyKey {self.key}>"
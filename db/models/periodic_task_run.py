@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, DateTime
+
+from ..base import Base
+
+class PeriodicTaskRun(Base):
+    """
+    The schedule of a background periodic task, shared by every worker process.
+    A worker runs a task only after taking its lease with a conditional UPDATE,
+    so each run happens on one worker, and records when the run finished, so
+    restarts and new workers wait out the rest of the interval.
+    """
+    __tablename__ = "periodic_task_runs"
+    name = Column(String(100), primary_key=True)
+    last_run_at = Column(DateTime, nullable=True)
+    # Another worker may take the lease once this passes, e.g. after a crash
+    locked_until = Column(DateTime, nullable=True)
+    locked_by = Column(String(64), nullable=True)
+
+    def __repr__(self):
+        return f"<PeriodicTaskRun {self.name}>"
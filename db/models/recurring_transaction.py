@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, BigInteger, Boolean, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from sqlalchemy.types import Enum
+from ..base import Base
+from schemas.recurring_transaction import RecurrenceInterval
+from schemas.transaction import TransactionType
+
+class RecurringTransaction(Base):
+    """
+    A rule creating a transaction from its template fields every interval_count
+    intervals from start_date. next_run is the date of the next occurrence not
+    yet created, and None once end_date has passed; the scheduler job creates
+    the due occurrences and moves it forward.
+    """
+    __tablename__ = "recurring_transactions"
+    __table_args__ = (
+        # The scheduler polls for active rules by next_run
+        Index("ix_recurring_transactions_is_active_next_run", "is_active", "next_run"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    account_id = Column(Integer, ForeignKey("accounts.id"), index=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
+    budget_id = Column(Integer, ForeignKey("budgets.id"), nullable=True)
+    pot_id = Column(Integer, ForeignKey("pots.id"), nullable=True)
+    description = Column(String(255), nullable=True)
+    recipient = Column(String(255), nullable=True)
+    sender = Column(String(255), nullable=True)
+    amount = Column(BigInteger, nullable=False)
+    type = Column(Enum(TransactionType, name="transaction_type"), nullable=False)
+    meta_data = Column(JSON, nullable=True)
+    interval = Column(Enum(RecurrenceInterval, name="recurrence_interval"), nullable=False)
+    interval_count = Column(Integer, default=1, nullable=False)
+    start_date = Column(DateTime, nullable=False)
+    end_date = Column(DateTime, nullable=True)
+    next_run = Column(DateTime, nullable=True)
+    # Occurrences created so far; the next one is computed from start_date and this
+    occurrences = Column(Integer, default=0, nullable=False)
+    is_active = Column(Boolean, default=True, nullable=False)
+    # Why the scheduler deactivated the rule, if it did
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    account = relationship("Account")
+    user = relationship("User")
+
+    def __repr__(self):
+        return f"<RecurringTransaction {self.id}>"
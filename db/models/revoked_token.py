@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+
+from ..base import Base
+
+class RevokedToken(Base):
+    """
+    A revoked token jti or token family. Rows are only needed until the
+    revoked tokens would have expired anyway, and are purged after that.
+    """
+    __tablename__ = "revoked_tokens"
+    id = Column(Integer, primary_key=True, index=True)
+    token_id = Column(String(32), unique=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    # Workers read the rows created since their last sync
+    created_at = Column(DateTime, default=func.now(), index=True)
+
+    def __repr__(self):
+        return f"<RevokedToken {self.token_id}>"
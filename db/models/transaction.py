@@ -1,12 +1,22 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, BigInteger
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, BigInteger, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.types import Enum
 from ..base import Base
 from schemas.transaction import TransactionType
+from datetime import datetime, timezone
+from typing import Optional
+import hashlib
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Duplicate detection is a single probe on this index, and it stops two
+        # concurrent inserts of the same transaction from both succeeding
+        UniqueConstraint("account_id", "fingerprint", name="uq_transactions_account_id_fingerprint"),
+        # Every list query filters on account_id and most sort or filter on the date
+        Index("ix_transactions_account_id_transaction_date", "account_id", "transaction_date"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     account_id = Column(Integer, ForeignKey("accounts.id"))
     category_id = Column(Integer, ForeignKey("categories.id"))
@@ -18,8 +28,10 @@ class Transaction(Base):
     sender = Column(String(255), index=True, nullable=True)
     amount = Column(BigInteger)
     type = Column(Enum(TransactionType, name="transaction_type"), index=True)
-    transaction_date = Column(DateTime, default=func.now())
+    # Archiving finds the transactions dated before its cutoff across accounts
+    transaction_date = Column(DateTime, default=func.now(), index=True)
     meta_data = Column(JSON, nullable=True)
+    fingerprint = Column(String(64), nullable=True)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
@@ -30,5 +42,23 @@ class Transaction(Base):
     budget = relationship("Budget", back_populates="transactions")
     pot = relationship("Pot", back_populates="transactions")
     
+    @staticmethod
+    def compute_fingerprint(
+        description: Optional[str],
+        recipient: Optional[str],
+        amount: Optional[int],
+        transaction_date: Optional[datetime]
+    ) -> str:
+        """SHA-256 of the normalized fields that identify a duplicate transaction"""
+        if transaction_date is not None and transaction_date.tzinfo is not None:
+            transaction_date = transaction_date.astimezone(timezone.utc).replace(tzinfo=None)
+        parts = [
+            (description or "").strip().casefold(),
+            (recipient or "").strip().casefold(),
+            str(amount or 0),
+            transaction_date.isoformat() if transaction_date else ""
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
     def __repr__(self):
         return f"<Transaction {self.id}>"
\ No newline at end of file
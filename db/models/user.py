@@ -19,7 +19,7 @@ class User(Base):
     account = relationship("Account", back_populates="user", uselist=False)
     budgets = relationship("Budget", back_populates="user")
     pots = relationship("Pot", back_populates="user")
-    user_auth = relationship("UserAuth", back_populates="user")
+    user_auth = relationship("UserAuth", back_populates="user", uselist=False)
     activation_token = relationship("ActivationToken", back_populates="user", uselist=False)
     api_keys = relationship("APIKey", back_populates="user")
     categories = relationship("Category", back_populates="user")
@@ -5,16 +5,26 @@ from sqlalchemy.sql import func
 from ..base import Base
 
 class UserAuth(Base):
+    """
+    The current login session of a user. There is one row per user, updated in
+    place on login and refresh, rather than a row per issued token pair.
+    """
     __tablename__ = "user_auth"
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)
     user = relationship("User", back_populates="user_auth")
     is_active = Column(Boolean, default=True)
-    is_expired = Column(Boolean, default=False)
-    access_token = Column(String(255), index=True)
-    refresh_token = Column(String(255), index=True)
+    # Shared by every token issued from one login, across refreshes
+    token_family = Column(String(32), nullable=False)
+    # jti of the only refresh token that may currently be used
+    refresh_jti = Column(String(32), nullable=False)
+    # Refresh token of a login from before token families; it carries no jti and
+    # is accepted once, in exchange for tokens of this session's family
+    refresh_token = Column(String(255), nullable=True)
+    # When the current refresh token expires; the row can be purged after this
+    expires_at = Column(DateTime, nullable=False, index=True)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
     def __repr__(self):
-        return f"<UserAuth {self.id}>"
\ No newline at end of file
+        return f"<UserAuth {self.id}>"
@@ -0,0 +1,114 @@
+# Optional MySQL partitioning of the transactions table
+from datetime import datetime, timezone
+from typing import List, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import ClauseElement
+
+PARTITIONING_NONE = "none"
+PARTITIONING_RANGE = "range"
+PARTITIONING_HASH = "hash"
+PARTITIONING_SCHEMES = (PARTITIONING_NONE, PARTITIONING_RANGE, PARTITIONING_HASH)
+
+# Catch-all partition that rows past the last monthly partition land in
+MAXVALUE_PARTITION = "pmax"
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+def add_months(value: datetime, months: int) -> datetime:
+    month_index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=month_index // 12, month=month_index % 12 + 1)
+
+def partition_name(month: datetime) -> str:
+    return f"p{month:%Y%m}"
+
+def monthly_partitions(first_month: datetime, last_month: datetime) -> List[str]:
+    """
+    Partition definitions holding one month of transaction_date each, from
+    first_month up to and including last_month.
+    """
+    definitions = []
+    month = month_start(first_month)
+    while month <= last_month:
+        upper = add_months(month, 1)
+        definitions.append(f"PARTITION {partition_name(month)} VALUES LESS THAN ('{upper:%Y-%m-%d}')")
+        month = upper
+    return definitions
+
+def partition_clause(
+    scheme: str,
+    first_month: Optional[datetime] = None,
+    last_month: Optional[datetime] = None,
+    hash_partitions: int = 16
+) -> str:
+    """
+    The PARTITION BY clause of a scheme.
+
+    RANGE gives each month of transaction_date its own partition, so date
+    filtered queries and archiving only touch the months involved. HASH spreads
+    accounts over hash_partitions partitions, so an account's queries, which
+    always filter on account_id, only read one partition.
+    """
+    if scheme == PARTITIONING_HASH:
+        return f"PARTITION BY HASH (account_id) PARTITIONS {hash_partitions}"
+    if scheme == PARTITIONING_RANGE:
+        if first_month is None or last_month is None:
+            raise ValueError("RANGE partitioning needs the first and last month")
+        definitions = monthly_partitions(first_month, last_month)
+        definitions.append(f"PARTITION {MAXVALUE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+        return "PARTITION BY RANGE COLUMNS (transaction_date) (\n    " + ",\n    ".join(definitions) + "\n)"
+    raise ValueError(f"Unknown partitioning scheme '{scheme}'; expected one of {', '.join(PARTITIONING_SCHEMES)}")
+
+def partition_method(connection: Connection, table: str = "transactions") -> Optional[str]:
+    """RANGE COLUMNS, HASH, ... if a MySQL table is partitioned, otherwise None"""
+    return connection.execute(
+        text(
+            "SELECT PARTITION_METHOD FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND PARTITION_NAME IS NOT NULL "
+            "LIMIT 1"
+        ),
+        {"table": table}
+    ).scalar()
+
+def add_future_partitions(connection: Connection, months_ahead: int, now: Optional[datetime] = None) -> int:
+    """
+    Split monthly partitions off the catch-all partition until there is one for
+    each of the next months_ahead months. Returns how many were added.
+
+    Reorganizing pmax only moves the rows it holds, which is none as long as
+    this runs before those months begin.
+    """
+    existing = connection.execute(
+        text(
+            "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'transactions' AND PARTITION_NAME IS NOT NULL"
+        )
+    ).scalars().all()
+    months = sorted(name for name in existing if name != MAXVALUE_PARTITION)
+    if not months:
+        return 0
+
+    last = datetime.strptime(months[-1], "p%Y%m")
+    target = month_start(add_months(now or datetime.now(timezone.utc).replace(tzinfo=None), months_ahead))
+    if last >= target:
+        return 0
+    definitions = monthly_partitions(add_months(last, 1), target)
+    definitions.append(f"PARTITION {MAXVALUE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    connection.execute(text(
+        f"ALTER TABLE transactions REORGANIZE PARTITION {MAXVALUE_PARTITION} INTO ({', '.join(definitions)})"
+    ))
+    return len(definitions) - 1
+
+def explain_partitions(connection: Connection, statement: ClauseElement) -> List[str]:
+    """
+    The partitions MySQL's plan reads for a statement, from the partitions
+    column of EXPLAIN. Used to check that a query is pruned.
+    """
+    compiled = statement.compile(dialect=connection.dialect)
+    rows = connection.exec_driver_sql(f"EXPLAIN {compiled}", compiled.params).mappings().all()
+    partitions = []
+    for row in rows:
+        if row.get("partitions"):
+            partitions.extend(row["partitions"].split(","))
+    return partitions
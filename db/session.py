@@ -1,37 +1,161 @@
 # DB session generator
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql.dml import UpdateBase
+from fastapi import Request
 from core.config import settings 
+from core.client_identity import identify_client
+from collections import OrderedDict
 from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
 import logging
+import threading
+import time
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create engine with connection pooling
-engine = create_engine(
-    settings.DB_URL,
-    poolclass=QueuePool,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_pre_ping=True
-)
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+READ_YOUR_WRITES_CACHE_SIZE = 100000
+
+class RoutingSession(Session):
+    """
+    Session that reads from a replica engine while use_replica is set.
+
+    Flushes and bulk INSERT/UPDATE/DELETE statements always go to the primary,
+    and once a session has written, its later reads go to the primary too, so a
+    request always sees its own writes. Without a replica_bind everything goes
+    to the primary.
+    """
+
+    def __init__(self, *args, replica_bind: Optional[Engine] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica_bind = replica_bind
+        self.use_replica = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["wrote"] = True
+            self.use_replica = False
+        elif self.use_replica and self.replica_bind is not None:
+            return self.replica_bind
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+class ReadYourWrites:
+    """
+    Clients that committed a write in the last `window` seconds.
+
+    A replica may lag behind the primary, so these clients' reads are kept on
+    the primary until the window has passed and they can see their own writes.
+    The window is tracked per process.
+    """
+
+    def __init__(self, window: float = settings.READ_YOUR_WRITES_SECONDS, max_size: int = READ_YOUR_WRITES_CACHE_SIZE):
+        self.window = window
+        self.max_size = max_size
+        self._written_at: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self, client: str) -> None:
+        with self._lock:
+            self._written_at[client] = time.monotonic()
+            self._written_at.move_to_end(client)
+            while len(self._written_at) > self.max_size:
+                self._written_at.popitem(last=False)
+
+    def is_recent(self, client: str) -> bool:
+        written_at = self._written_at.get(client)
+        return written_at is not None and time.monotonic() - written_at < self.window
+
+    def clear(self) -> None:
+        with self._lock:
+            self._written_at.clear()
+
+read_your_writes = ReadYourWrites()
 
-# Create session factory
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_write(session: Session) -> None:
+    client = session.info.get("client")
+    if session.info.pop("wrote", False) and client:
+        read_your_writes.mark(client)
+
+# Create session factory; it is bound to the engines once they are created
 SessionLocal = sessionmaker(
-    bind=engine,
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
     expire_on_commit=False  # Prevent detached instance errors
 )
 
-def get_db() -> Session:
-    """Get a database session."""
+_engine: Optional[Engine] = None
+_replica_engine: Optional[Engine] = None
+
+def get_engine() -> Engine:
+    """
+    Get the process-wide engine, creating it on first use.
+    The app creates it from its lifespan hook so importing the app stays cheap.
+    """
+    global _engine
+    if _engine is None:
+        # Create engine with connection pooling
+        _engine = create_engine(
+            settings.DB_URL,
+            poolclass=QueuePool,
+            pool_size=5,
+            max_overflow=10,
+            pool_timeout=30,
+            pool_pre_ping=True
+        )
+        SessionLocal.configure(bind=_engine)
+        get_replica_engine()
+    return _engine
+
+def get_replica_engine() -> Optional[Engine]:
+    """Get the read replica engine if DB_REPLICA_URL is set, creating it on first use"""
+    global _replica_engine
+    if _replica_engine is None and settings.DB_REPLICA_URL:
+        _replica_engine = create_engine(
+            settings.DB_REPLICA_URL,
+            poolclass=QueuePool,
+            pool_size=settings.DB_REPLICA_POOL_SIZE,
+            max_overflow=10,
+            pool_timeout=30,
+            pool_pre_ping=True
+        )
+        SessionLocal.configure(replica_bind=_replica_engine)
+    return _replica_engine
+
+def dispose_engine() -> None:
+    """Close the engines' pooled connections; they are created again on next use"""
+    global _engine, _replica_engine
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+    if _replica_engine is not None:
+        _replica_engine.dispose()
+        _replica_engine = None
+
+def __getattr__(name: str):
+    # `engine` used to be created at import time; keep `from db.session import engine` working
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def get_db(request: Request) -> Session:
+    """
+    Get a database session.
+    Read-only requests read from the replica, if one is configured, unless the
+    client wrote within the last READ_YOUR_WRITES_SECONDS.
+    """
     logger.info("Creating new database session")
+    get_engine()
     db = SessionLocal()
+    client = identify_client(request.scope)
+    db.info["client"] = client
+    db.use_replica = request.method in READ_METHODS and not read_your_writes.is_recent(client)
     try:
         logger.info("Yielding database session")
         yield db
@@ -46,11 +170,38 @@ def get_db() -> Session:
         else:
             logger.info("Session already closed")
 
+def get_session_factory() -> Callable[[], Session]:
+    """
+    Get the factory for sessions on the primary database, for work that opens
+    and closes its own sessions instead of using the request's
+    """
+    get_engine()
+    return SessionLocal
+
 @contextmanager
 def get_db_context():
     """Context manager for database sessions"""
+    get_engine()
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+@contextmanager
+def sibling_session(db: Session) -> Iterator[Optional[Session]]:
+    """
+    A second session reading from where db reads, closed on exit, so a query can
+    run on another thread alongside db's own. Yields None when db is not a
+    request session on the shared engines, e.g. one bound to a single
+    connection, which two threads cannot use at once.
+    """
+    if not isinstance(db, RoutingSession) or db.bind is None:
+        yield None
+        return
+    sibling = SessionLocal()
+    sibling.use_replica = db.use_replica
+    try:
+        yield sibling
+    finally:
+        sibling.close()
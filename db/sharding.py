@@ -0,0 +1,86 @@
+# Mapping of accounts to per-shard engines
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+from core.config import settings
+
+def parse_shard_urls(value: Optional[str]) -> List[str]:
+    return [url.strip() for url in (value or "").split(",") if url.strip()]
+
+class TransactionShardRouter:
+    """
+    Maps accounts to the databases holding their transactions.
+
+    Account n belongs to shard n % len(urls), the same function as MySQL's
+    HASH (account_id) partitioning, so a partitioned table can be split into
+    shards along its partitions. Engines are created on first use. Without
+    any urls every account stays on the caller's session.
+
+    Only the mapping is in place: every transaction read and write still goes
+    to the primary. Reads must not move to the shards before the writes do,
+    in one place, or they would miss rows written since the split.
+    """
+
+    def __init__(self, urls: Sequence[str] = (), pool_size: int = 5):
+        self.urls = list(urls)
+        self.pool_size = pool_size
+        self._engines: Dict[int, Engine] = {}
+        self._sessionmakers: Dict[int, sessionmaker] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.urls)
+
+    def shard_for(self, account_id: int) -> int:
+        """Index of the shard an account's transactions live in"""
+        return account_id % len(self.urls)
+
+    def get_engine(self, shard: int) -> Engine:
+        with self._lock:
+            if shard not in self._engines:
+                self._engines[shard] = create_engine(
+                    self.urls[shard],
+                    poolclass=QueuePool,
+                    pool_size=self.pool_size,
+                    max_overflow=10,
+                    pool_timeout=30,
+                    pool_pre_ping=True
+                )
+                self._sessionmakers[shard] = sessionmaker(
+                    bind=self._engines[shard],
+                    autocommit=False,
+                    autoflush=False,
+                    expire_on_commit=False
+                )
+            return self._engines[shard]
+
+    @contextmanager
+    def session_for(self, account_id: int, default: Session) -> Iterator[Session]:
+        """
+        A session on the account's shard, closed on exit, or `default` itself
+        when sharding is not configured.
+        """
+        if not self.enabled:
+            yield default
+            return
+        shard = self.shard_for(account_id)
+        self.get_engine(shard)
+        db = self._sessionmakers[shard]()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def dispose(self) -> None:
+        with self._lock:
+            for engine in self._engines.values():
+                engine.dispose()
+            self._engines.clear()
+            self._sessionmakers.clear()
+
+transaction_shard_router = TransactionShardRouter(parse_shard_urls(settings.TRANSACTION_SHARD_URLS))
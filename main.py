@@ -1,33 +1,54 @@
 # FastAPI app entry point
 
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api.v1.endpoints import auth_router, users_router, api_keys_router, categories_router, budgets_router, pots_router, transactions_router, accounts_router
-from db.session import engine
-from db.base import Base
-from db.models import *  # This imports all models
+from fastapi.responses import ORJSONResponse
+from api.v1.endpoints import auth_router, users_router, api_keys_router, categories_router, budgets_router, pots_router, transactions_router, recurring_transactions_router, accounts_router, health_router
+import db.models  # noqa: F401 - registers every model before the mappers are configured
+from db.session import SessionLocal, get_engine, dispose_engine
+from db.sharding import transaction_shard_router
 from services.email_service import EmailService
 from pydantic import EmailStr, BaseModel
 from core.deps import get_email_core
+from core.config import settings
+from core.compression import CompressionMiddleware
+from core.rate_limit import RateLimitMiddleware
+from tasks.background_jobs import job_queue
+from core.health import readiness, warm_up
+from core.revocation import revocation_store
+from fastapi.concurrency import run_in_threadpool
 from contextlib import asynccontextmanager
-from pathlib import Path
-import os
-from dotenv import load_dotenv
 
-BASE_DIR = Path(__file__).resolve().parent.parent
-ENV_FILE = os.path.join(BASE_DIR, ".env")
-load_dotenv(ENV_FILE, override=True)
+logger = logging.getLogger(__name__)
 
-frontend_url = os.getenv("FRONTEND_URL")
+frontend_url = settings.FRONTEND_URL
 
-print("FRONTEND_URL =>", frontend_url)
+logger.info(f"FRONTEND_URL => {frontend_url}")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
+    # Startup: the engine and the email client are built here rather than at
+    # import time so a worker process can import the app quickly
+    engine = get_engine()
+    await run_in_threadpool(warm_up, engine, SessionLocal, settings.DB_POOL_WARM_CONNECTIONS)
+    try:
+        get_email_core()
+    except Exception as e:
+        # Emails are sent from background jobs, which retry; the API can serve without them
+        logger.error(f"Failed to set up the email client: {e}")
+    if settings.TOKEN_REVOCATION_BACKGROUND_SYNC:
+        await revocation_store.start(SessionLocal)
+    if settings.BACKGROUND_JOBS_ENABLED:
+        await job_queue.start()
+    readiness.mark_ready()
     yield
     # Shutdown
-    pass
+    readiness.mark_not_ready()
+    await job_queue.stop()
+    await revocation_store.stop()
+    dispose_engine()
+    transaction_shard_router.dispose()
 
 # Create FastAPI app
 app = FastAPI(
@@ -37,6 +58,17 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+app.add_middleware(RateLimitMiddleware, enabled=settings.RATE_LIMIT_ENABLED)
+
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.GZIP_COMPRESSION_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY,
 )
 
 # Configure CORS
@@ -49,6 +81,7 @@ app.add_middleware(
 )
 
 # Include routers
+app.include_router(health_router, tags=["health"])
 app.include_router(auth_router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(users_router, prefix="/api/v1/users", tags=["users"])
 app.include_router(api_keys_router, prefix="/api/v1/api-keys", tags=["api-keys"])
@@ -56,6 +89,7 @@ app.include_router(categories_router, prefix="/api/v1/categories", tags=["catego
 app.include_router(budgets_router, prefix="/api/v1/budgets", tags=["budgets"])
 app.include_router(pots_router, prefix="/api/v1/pots", tags=["pots"])
 app.include_router(transactions_router, prefix="/api/v1/transactions", tags=["transactions"])
+app.include_router(recurring_transactions_router, prefix="/api/v1/recurring-transactions", tags=["recurring-transactions"])
 app.include_router(accounts_router, prefix="/api/v1/accounts", tags=["accounts"])
 
 class EmailRequest(BaseModel):
@@ -1,6 +1,11 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from typing import Optional
+from enum import Enum as PyEnum
+
+class BalanceSnapshotGranularity(PyEnum):
+    DAY = "DAY"
+    MONTH = "MONTH"
 
 class AccountBase(BaseModel):
     balance: int = 0
@@ -17,4 +22,16 @@ class Account(AccountBase):
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class BalanceDrift(BaseModel):
+    """An account whose stored balance does not match its ledger"""
+    account_id: int
+    balance: int
+    ledger_balance: int
+    drift: int
+
+class AccountBalance(BaseModel):
+    account_id: int
+    balance: int
+    at: datetime
@@ -2,6 +2,11 @@ from typing import Optional
 from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List
+from enum import Enum as PyEnum
+
+class BudgetPeriodType(PyEnum):
+    WEEKLY = "WEEKLY"
+    MONTHLY = "MONTHLY"
 
 class BudgetBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
@@ -11,6 +16,7 @@ class BudgetBase(BaseModel):
     start_date: datetime
     end_date: datetime
     color: Optional[str] = Field(None, max_length=50)
+    period: Optional[BudgetPeriodType] = Field(None, description="Recurrence of the budget; omit for a one-off budget")
 
 class BudgetCreate(BudgetBase):
     pass
@@ -24,6 +30,7 @@ class BudgetUpdate(BaseModel):
     end_date: Optional[datetime] = None
     is_active: Optional[bool] = None
     color: Optional[str] = Field(None, max_length=50)
+    period: Optional[BudgetPeriodType] = None
 
 class BudgetInDB(BudgetBase):
     id: int
@@ -40,6 +47,14 @@ class BudgetInDB(BudgetBase):
 class Budget(BudgetInDB):
     pass 
 
+class BudgetPeriod(BaseModel):
+    budget_id: int
+    period_start: datetime
+    period_end: datetime
+    total_amount: int
+    spent_amount: int
+    remaining_amount: int
+
 
 class BudgetSummaryChart(BaseModel):
     label: str
@@ -22,4 +22,14 @@ class CategoryInDBBase(CategoryBase):
     model_config = ConfigDict(from_attributes=True)
 
 class Category(CategoryInDBBase):
-    pass
\ No newline at end of file
+    pass
+
+class CategoryStats(BaseModel):
+    category_id: int
+    name: str
+    color: Optional[str] = None
+    transaction_count: int
+    total_debit: int
+    total_credit: int
+    average_amount: Optional[float] = None
+    last_activity: Optional[datetime] = None
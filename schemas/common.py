@@ -1,4 +1,4 @@
-from typing import Generic, TypeVar, List
+from typing import Dict, Generic, TypeVar, List, Optional, Union
 from pydantic import BaseModel
 
 DataT = TypeVar('DataT')
@@ -9,4 +9,19 @@ class ResponseModel(BaseModel, Generic[DataT]):
 
 class ListResponseModel(BaseModel, Generic[DataT]):
     data: List[DataT]
-    message: str 
\ No newline at end of file
+    message: str 
+
+class FacetCount(BaseModel):
+    value: Optional[Union[int, str]] = None
+    count: int
+
+class CountedListResponseModel(ListResponseModel[DataT], Generic[DataT]):
+    # Only present when asked for with ?include=count or ?include=facets
+    count: Optional[int] = None
+    facets: Optional[Dict[str, List[FacetCount]]] = None
+
+class CursorPageResponseModel(BaseModel, Generic[DataT]):
+    data: List[DataT]
+    # Pass as ?cursor= to get the next page; None on the last page
+    next_cursor: Optional[str] = None
+    message: str
@@ -0,0 +1,41 @@
+from typing import Optional, Dict
+from datetime import datetime
+from pydantic import BaseModel, Field, ConfigDict
+from enum import Enum as PyEnum
+from .transaction import TransactionType
+
+class RecurrenceInterval(PyEnum):
+    DAILY = "DAILY"
+    WEEKLY = "WEEKLY"
+    MONTHLY = "MONTHLY"
+    YEARLY = "YEARLY"
+
+class RecurringTransactionBase(BaseModel):
+    description: Optional[str] = Field(None, max_length=255)
+    recipient: Optional[str] = Field(None, max_length=255)
+    sender: Optional[str] = Field(None, max_length=255)
+    amount: int = Field(..., gt=0, description="Amount in cents/pence")
+    type: TransactionType = Field(description="Type of the transactions created")
+    category_id: Optional[int] = None
+    budget_id: Optional[int] = None
+    pot_id: Optional[int] = None
+    meta_data: Optional[Dict] = None
+    interval: RecurrenceInterval
+    interval_count: int = Field(1, ge=1, le=365, description="Occurs every interval_count intervals")
+    start_date: datetime = Field(description="Date of the first occurrence; later ones keep its day and time")
+    end_date: Optional[datetime] = Field(None, description="No occurrences after this date; omit to repeat indefinitely")
+
+class RecurringTransactionCreate(RecurringTransactionBase):
+    pass
+
+class RecurringTransaction(RecurringTransactionBase):
+    id: int
+    account_id: int
+    next_run: Optional[datetime] = Field(None, description="Date of the next occurrence; None once the rule has ended")
+    occurrences: int
+    is_active: bool
+    last_error: Optional[str] = Field(None, description="Why the rule was stopped, when an occurrence could not be created")
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
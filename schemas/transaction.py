@@ -46,6 +46,8 @@ class TransactionFilter(BaseModel):
     recipient: Optional[str] = None
     sender: Optional[str] = None
     pot_id: Optional[int] = None
+    # Union in the archive table even when the dates don't reach back past its cutoff
+    include_archived: bool = False
 
 class Transaction(TransactionBase):
     id: int
@@ -61,6 +63,9 @@ class Transaction(TransactionBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class TransactionWithRunningBalance(Transaction):
+    running_balance: Optional[int] = Field(None, description="Account balance after this transaction")
+
 class TransactionSummaryRequest(BaseModel):
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
@@ -1,32 +1,34 @@
 from typing import Optional
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from schemas.user import UserCreate, User as UserSchema, UserLogin
 from db.models.user_auth import UserAuth
 from core.security import get_password_hash, verify_password
-from core.jwt import create_access_token, create_refresh_token, verify_token
-from services.email_service import EmailService
+from core.jwt import create_access_token, create_refresh_token, verify_token, new_token_id
+from core.revocation import revocation_store
+from core.login_throttle import login_throttle
+from tasks.background_jobs import job_queue, SEND_ACTIVATION_EMAIL
 from core.activation import ActivationService
 from crud.user import UserCRUD
-from core.jwt import ACCESS_TOKEN_EXPIRE_MINUTES
+from core.jwt import ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS
 from jose import JWTError
 from db.models.activation_token import ActivationToken
 from services.account_service import AccountService
-import os
 
 class AuthService:
     def __init__(self, db: Session):
         self.db = db
         self.user_crud = UserCRUD(db)
 
-    async def register_user(self, user: UserCreate, email_service: EmailService) -> dict:
+    async def register_user(self, user: UserCreate) -> dict:
         """
-        Register a new user and send activation email.
+        Register a new user and queue their activation email.
+        The email is sent by the background job worker, so SMTP latency
+        and failures do not affect the registration request.
 
         Args:
             user: UserCreate object containing user details
-            email_service: Email service instance for sending activation email
 
         Returns:
             dict: Contains success message and user data
@@ -42,78 +44,66 @@ class AuthService:
         user_data = user.model_dump()
         user_data["password"] = get_password_hash(user.password)
         
-        # Create user
-        db_user = self.user_crud.create(UserCreate(**user_data))
-        
-        # Generate activation token and send email
-        activation_token = ActivationService.create_activation_token(self.db, db_user)
-        await email_service.send_activation_email(
-            email=db_user.email,
-            username=db_user.username,
-            activation_token=activation_token.token
-        )
+        # The user and email job are committed together, so a registration never
+        # exists without its activation email; the job mints the token itself
+        db_user = self.user_crud.create(UserCreate(**user_data), commit=False)
+        job_queue.enqueue(self.db, SEND_ACTIVATION_EMAIL, {"user_id": db_user.id})
+        self.db.commit()
 
         return {
             "message": "User registered successfully. Please check your email to activate your account.",
             "data": UserSchema.model_validate(db_user)
         }
 
-    async def login_user(self, user: UserLogin) -> dict:
+    async def login_user(self, user: UserLogin, client_ip: Optional[str] = None) -> dict:
         """
         Authenticate a user and generate access and refresh tokens.
+        Emails and client addresses with too many recent failures are turned
+        away with a 429 before the user lookup and password check.
 
         Args:
             user: UserLogin object containing email and password
+            client_ip: Address the request came from
 
         Returns:
             dict: Contains user data and authentication tokens
         """
+        login_throttle.check(user.email, client_ip)
+
         db_user = self.user_crud.get_by_email(email=user.email)
         if not db_user:
+            login_throttle.record_failure(user.email, client_ip)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid credentials"
             )
         
         if not verify_password(user.password, db_user.hashed_password):
+            login_throttle.record_failure(user.email, client_ip)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid credentials"
             )
+        login_throttle.record_success(user.email)
         
-        # Use test secret key if in test environment
-        secret_key = os.getenv("JWT_SECRET_KEY")
+        # A new login replaces the user's session: tokens from the previous
+        # login are revoked by family and the session row is reused
+        family = new_token_id()
+        access_token, refresh_token = self._issue_tokens(db_user.email, family)
+        refresh_expires_at = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
 
-        # Invalidate all existing and active tokens for the user
-        self.db.query(UserAuth).filter(
-            UserAuth.user_id == db_user.id,
-            UserAuth.is_active == True
-        ).update({
-            "is_active": False,
-            "is_expired": True
-        })
-        self.db.commit()
-        
-        # Create tokens
-        access_token = create_access_token(
-            data={"sub": db_user.email},
-            expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
-            secret_key=secret_key
-        )
-        refresh_token = create_refresh_token(
-            data={"sub": db_user.email},
-            secret_key=secret_key
-        )
-        
-        # Store tokens in database
-        user_auth = UserAuth(
-            user_id=db_user.id,
-            access_token=access_token,
-            refresh_token=refresh_token,
-            is_active=True,
-            is_expired=False
-        )
-        self.db.add(user_auth)
+        user_auth = self.db.query(UserAuth).filter(UserAuth.user_id == db_user.id).first()
+        if user_auth:
+            if user_auth.is_active:
+                revocation_store.revoke(self.db, user_auth.token_family, user_auth.expires_at, user_id=db_user.id)
+        else:
+            user_auth = UserAuth(user_id=db_user.id)
+            self.db.add(user_auth)
+        user_auth.token_family = family
+        user_auth.refresh_jti = self._get_claims(refresh_token)["jti"]
+        user_auth.refresh_token = None
+        user_auth.expires_at = refresh_expires_at.replace(tzinfo=None)
+        user_auth.is_active = True
         self.db.commit()
         
         return {
@@ -130,6 +120,7 @@ class AuthService:
         """
         Refresh access token using refresh token.
         Implements token rotation - each refresh token can only be used once.
+        Presenting an already used refresh token revokes the whole token family.
         
         Args:
             refresh_token: The refresh token to use
@@ -137,87 +128,67 @@ class AuthService:
         Returns:
             dict: Contains new access and refresh tokens
         """
-        try:
-            # Verify refresh token
-            payload = verify_token(refresh_token)
-            email = payload.get("sub")
-            if email is None:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid refresh token"
-                )
-            
-            # Get user from database
-            db_user = self.user_crud.get_by_email(email=email)
-            if not db_user:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="User not found"
-                )
-            
-            # Get existing auth record and validate refresh token
-            user_auth = self.db.query(UserAuth).filter(
-                UserAuth.user_id == db_user.id,
-                UserAuth.refresh_token == refresh_token,
-                UserAuth.is_active == True,
-                UserAuth.is_expired == False
-            ).first()
-            
-            if not user_auth:
-                # Potential reuse of refresh token - invalidate all tokens for security
-                self.db.query(UserAuth).filter(
-                    UserAuth.user_id == db_user.id,
-                    UserAuth.is_active == True
-                ).update({
-                    "is_active": False,
-                    "is_expired": True
-                })
-                self.db.commit()
-                
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Refresh token has been invalidated"
-                )
-            
-            # Generate new tokens
-            new_access_token = create_access_token(
-                data={"sub": db_user.email},
-                expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        payload = self._get_claims(refresh_token)
+        email = payload.get("sub")
+        family = payload.get("fam")
+        if email is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid refresh token"
             )
-            new_refresh_token = create_refresh_token(data={"sub": db_user.email})
-            
-            # Invalidate old refresh token
-            user_auth.is_active = False
-            user_auth.is_expired = True
-            
-            # Create new auth record with new tokens
-            new_user_auth = UserAuth(
-                user_id=db_user.id,
-                access_token=new_access_token,
-                refresh_token=new_refresh_token,
-                is_active=True,
-                is_expired=False
+        
+        # Get user from database
+        db_user = self.user_crud.get_by_email(email=email)
+        if not db_user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
             )
-            self.db.add(new_user_auth)
-            self.db.commit()
+        
+        user_auth = self.db.query(UserAuth).filter(UserAuth.user_id == db_user.id).first()
+        jti = payload.get("jti")
+        if family is None and user_auth is not None and user_auth.refresh_token == refresh_token:
+            # A refresh token from before token families moves its login into the session's family
+            family, jti = user_auth.token_family, user_auth.refresh_jti
+            user_auth.refresh_token = None
+        is_current = (
+            family is not None
+            and user_auth is not None
+            and user_auth.is_active
+            and user_auth.token_family == family
+            and user_auth.refresh_jti == jti
+            and not revocation_store.is_revoked(self.db, family)
+        )
+        if not is_current:
+            if user_auth and user_auth.is_active and user_auth.token_family == family:
+                # Potential reuse of refresh token - invalidate all tokens for security
+                revocation_store.revoke(self.db, family, user_auth.expires_at, user_id=db_user.id)
+                user_auth.is_active = False
+                self.db.commit()
             
-            return {
-                "message": "Tokens refreshed successfully",
-                "data": {
-                    "access_token": new_access_token,
-                    "refresh_token": new_refresh_token,
-                    "token_type": "bearer"
-                }
-            }
-        except JWTError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired refresh token"
+                detail="Refresh token has been invalidated"
             )
+        
+        # Rotate: only the new refresh token is accepted from now on
+        new_access_token, new_refresh_token = self._issue_tokens(db_user.email, family)
+        user_auth.refresh_jti = self._get_claims(new_refresh_token)["jti"]
+        user_auth.expires_at = (datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)).replace(tzinfo=None)
+        self.db.commit()
+        
+        return {
+            "message": "Tokens refreshed successfully",
+            "data": {
+                "access_token": new_access_token,
+                "refresh_token": new_refresh_token,
+                "token_type": "bearer"
+            }
+        }
 
     async def logout(self, access_token: str) -> dict:
         """
-        Logout user by invalidating tokens.
+        Logout user by revoking the access token and its token family.
 
         Args:
             access_token: The access token to invalidate
@@ -225,44 +196,58 @@ class AuthService:
         Returns:
             dict: Success message
         """
-        try:
-            # Verify access token
-            payload = verify_token(access_token)
-            email = payload.get("sub")
-            if email is None:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid access token"
-                )
-            
-            # Get user from database
-            db_user = self.user_crud.get_by_email(email=email)
-            if not db_user:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="User not found"
-                )
-            
-            # Invalidate tokens
-            user_auth = self.db.query(UserAuth).filter(
-                UserAuth.user_id == db_user.id,
-                UserAuth.access_token == access_token,
-                UserAuth.is_active == True
-            ).first()
-            
-            if user_auth:
-                user_auth.is_active = False
-                user_auth.is_expired = True
-                self.db.commit()
-            
-            return {
-                "message": "Successfully logged out"
-            }
-        except JWTError:
+        payload = self._get_claims(access_token, error_detail="Invalid access token")
+        email = payload.get("sub")
+        if email is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid access token"
             )
+        
+        # Get user from database
+        db_user = self.user_crud.get_by_email(email=email)
+        if not db_user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        
+        # Revoke the token itself, then the rest of its family
+        if payload.get("jti"):
+            revocation_store.revoke(
+                self.db,
+                payload["jti"],
+                datetime.fromtimestamp(payload["exp"], tz=timezone.utc),
+                user_id=db_user.id
+            )
+        user_auth = self.db.query(UserAuth).filter(UserAuth.user_id == db_user.id).first()
+        if user_auth and user_auth.is_active and user_auth.token_family == payload.get("fam"):
+            revocation_store.revoke(self.db, user_auth.token_family, user_auth.expires_at, user_id=db_user.id)
+            user_auth.is_active = False
+        self.db.commit()
+        
+        return {
+            "message": "Successfully logged out"
+        }
+
+    def _issue_tokens(self, email: str, family: str) -> tuple[str, str]:
+        """Create an access/refresh token pair belonging to a token family"""
+        access_token = create_access_token(
+            data={"sub": email, "fam": family},
+            expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        )
+        refresh_token = create_refresh_token(data={"sub": email, "fam": family})
+        return access_token, refresh_token
+
+    def _get_claims(self, token: str, error_detail: str = "Invalid or expired refresh token") -> dict:
+        """Verify a token and return its claims"""
+        try:
+            return verify_token(token)
+        except (JWTError, HTTPException):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=error_detail
+            )
 
     async def activate_account(self, token: str) -> dict:
         """
@@ -314,20 +299,14 @@ class AuthService:
         """
         Validate a token.
         """
-        try:
-            payload = verify_token(access_token)
-            email = payload.get("sub")
-            if email is None:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid access token"
-                )
-        
-            return {
-                "message": "Token validated successfully"
-            }
-        except JWTError:
+        payload = self._get_claims(access_token, error_detail="Invalid access token")
+        email = payload.get("sub")
+        if email is None or revocation_store.is_revoked(self.db, payload.get("jti"), payload.get("fam")):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid access token"
-            )
\ No newline at end of file
+            )
+    
+        return {
+            "message": "Token validated successfully"
+        }
\ No newline at end of file
@@ -0,0 +1,158 @@
+import calendar
+from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.orm import Session, lazyload
+from db.models.budget import Budget
+from crud.budget_period import BudgetPeriodCRUD
+from schemas.budget import BudgetPeriodType, BudgetPeriod as BudgetPeriodSchema
+from schemas.transaction import TransactionType
+from services.transaction_archive_service import transaction_history
+
+# Upper bound for one-off budgets that have no end date
+OPEN_ENDED_PERIOD_END = datetime(9999, 12, 31)
+
+def _to_naive_utc(value: datetime) -> datetime:
+    """Normalize a datetime to naive UTC so DB values and request values compare cleanly"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def _add_months(value: datetime, months: int) -> datetime:
+    """Shift a datetime by whole months, clamping the day to the end of the target month"""
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+class BudgetPeriodService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.crud = BudgetPeriodCRUD(db)
+
+    @staticmethod
+    def get_period_bounds(budget: Budget, at: datetime) -> Optional[tuple[datetime, datetime]]:
+        """
+        Get the (period_start, period_end) of the budget period containing `at`.
+
+        Weekly and monthly periods are anchored on the budget's start_date, so a
+        budget starting on the 15th runs from the 15th to the 15th. One-off budgets
+        have a single period spanning start_date to end_date.
+
+        Returns:
+            The period bounds as naive UTC datetimes, or None if `at` is outside the budget
+        """
+        start = _to_naive_utc(budget.start_date)
+        end = _to_naive_utc(budget.end_date) if budget.end_date else None
+        at = _to_naive_utc(at)
+
+        if at < start or (end is not None and at > end):
+            return None
+
+        if budget.period == BudgetPeriodType.WEEKLY:
+            elapsed_weeks = (at - start) // timedelta(weeks=1)
+            period_start = start + timedelta(weeks=elapsed_weeks)
+            period_end = period_start + timedelta(weeks=1)
+        elif budget.period == BudgetPeriodType.MONTHLY:
+            # Always offset from the original start so a budget anchored on the
+            # 31st returns to the 31st after a short month
+            elapsed_months = (at.year - start.year) * 12 + at.month - start.month
+            if _add_months(start, elapsed_months) > at:
+                elapsed_months -= 1
+            period_start = _add_months(start, elapsed_months)
+            period_end = _add_months(start, elapsed_months + 1)
+        else:
+            period_start = start
+            period_end = end or OPEN_ENDED_PERIOD_END
+
+        if end is not None and period_end > end:
+            period_end = end
+        return period_start, period_end
+
+    @staticmethod
+    def get_spend_change(transaction_type: TransactionType, amount: int) -> int:
+        """Debits add to a budget's spend, credits reduce it"""
+        return amount if transaction_type == TransactionType.DEBIT else -amount
+
+    def record_transaction(
+        self,
+        budget_id: Optional[int],
+        transaction_date: datetime,
+        transaction_type: TransactionType,
+        amount: int,
+        reverse: bool = False
+    ) -> None:
+        """
+        Apply a transaction's effect to the period it falls in.
+        Pass reverse=True to undo a previously recorded transaction.
+        The caller is responsible for committing.
+        """
+        if not budget_id or not amount:
+            return
+
+        budget = self.db.get(Budget, budget_id, options=[lazyload(Budget.transactions)])
+        if not budget:
+            return
+
+        bounds = self.get_period_bounds(budget, transaction_date)
+        if not bounds:
+            return
+
+        spend_change = self.get_spend_change(transaction_type, amount)
+        if reverse:
+            spend_change = -spend_change
+        self.crud.increment(budget.id, bounds[0], bounds[1], spend_change)
+
+    def get_current_period(self, budget: Budget, at: Optional[datetime] = None) -> Optional[BudgetPeriodSchema]:
+        """
+        Get the period containing `at` (defaults to now) with its precomputed spend.
+        This is a single lookup on the (budget_id, period_start) index.
+        """
+        bounds = self.get_period_bounds(budget, at or datetime.now(timezone.utc))
+        if not bounds:
+            return None
+
+        period = self.crud.get(budget.id, bounds[0])
+        spent_amount = period.spent_amount if period else 0
+        return self._to_schema(budget, bounds[0], bounds[1], spent_amount)
+
+    def get_periods(self, budget: Budget, skip: int = 0, limit: int = 100) -> List[BudgetPeriodSchema]:
+        """Get the recorded periods of a budget, most recent first"""
+        periods = self.crud.get_multi(budget.id, skip=skip, limit=limit)
+        return [
+            self._to_schema(budget, period.period_start, period.period_end, period.spent_amount)
+            for period in periods
+        ]
+
+    def rebuild_periods(self, budget: Budget) -> None:
+        """
+        Recompute every period of a budget from its transactions, archived ones included.
+        Needed when the period, start_date or end_date of a budget changes.
+        The caller is responsible for committing.
+        """
+        self.crud.delete_for_budget(budget.id)
+
+        source = transaction_history(
+            ("transaction_date", "type", "amount"),
+            lambda model: [model.budget_id == budget.id]
+        )
+        rows = self.db.query(source.c.transaction_date, source.c.type, source.c.amount).all()
+        totals: dict[tuple[datetime, datetime], int] = {}
+        for transaction_date, transaction_type, amount in rows:
+            bounds = self.get_period_bounds(budget, transaction_date)
+            if bounds and amount:
+                totals[bounds] = totals.get(bounds, 0) + self.get_spend_change(transaction_type, amount)
+
+        for (period_start, period_end), spent_amount in totals.items():
+            self.crud.increment(budget.id, period_start, period_end, spent_amount)
+
+    @staticmethod
+    def _to_schema(budget: Budget, period_start: datetime, period_end: datetime, spent_amount: int) -> BudgetPeriodSchema:
+        return BudgetPeriodSchema(
+            budget_id=budget.id,
+            period_start=period_start,
+            period_end=period_end,
+            total_amount=budget.total_amount,
+            spent_amount=spent_amount,
+            remaining_amount=budget.total_amount - spent_amount
+        )
@@ -2,14 +2,27 @@ from typing import List, Optional
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 from db.models.budget import Budget
-from schemas.budget import BudgetCreate, BudgetUpdate, BudgetSummary, BudgetSummaryChart
+from db.models.category import Category
+from schemas.budget import BudgetCreate, BudgetUpdate, BudgetSummary, BudgetSummaryChart, BudgetPeriod
+from schemas.budget import Budget as BudgetSchema
+from schemas.category import Category as CategorySchema
 from crud.budget import BudgetCRUD
+from services.budget_period_service import BudgetPeriodService
 from fastapi import HTTPException
+from core.projection import Expansion, ListProjection, Selection
+
+budget_projection = ListProjection(Budget, BudgetSchema, {
+    "category": Expansion(Budget.category_id, Category, CategorySchema),
+})
+
+# Changing any of these moves period boundaries, so recorded periods must be rebuilt
+PERIOD_BOUNDARY_FIELDS = {"period", "start_date", "end_date"}
 
 class BudgetService:
     def __init__(self, db: Session):
         self.db = db
         self.crud = BudgetCRUD(db)
+        self.period_service = BudgetPeriodService(db)
 
     def create_budget(self, user_id: int, budget_data: BudgetCreate) -> Budget:
         """Create a new budget for a user with validation"""
@@ -39,6 +52,21 @@ class BudgetService:
             limit=limit
         )
 
+    def get_budget_rows(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        selection: Optional[Selection] = None
+    ) -> List[dict]:
+        """
+        Same as get_budgets, but selects only the columns behind the selected fields
+        and returns plain dicts for budget_projection to serialize
+        """
+        selection = selection or budget_projection.parse()
+        rows = self.crud.get_multi_rows(user_id, budget_projection.columns(selection), skip=skip, limit=limit)
+        return budget_projection.to_dicts(self.db, rows, selection)
+
     def get_budget_by_id(self, budget_id: int, user_id: int) -> Optional[Budget]:
         """Get a specific budget by ID with its transactions"""
         return self.crud.get_by_id(
@@ -58,7 +86,14 @@ class BudgetService:
         if "total_amount" in update_data and "remaining_amount" not in update_data:
             update_data["remaining_amount"] = update_data["total_amount"] - db_budget.spent_amount
 
-        return self.crud.update(db_budget=db_budget, update_data=update_data)
+        # The budget and its rebuilt periods are committed together
+        db_budget = self.crud.update(db_budget=db_budget, update_data=update_data, commit=False)
+        if PERIOD_BOUNDARY_FIELDS & update_data.keys():
+            self.period_service.rebuild_periods(db_budget)
+        self.db.commit()
+        self.db.refresh(db_budget)
+
+        return db_budget
 
     def delete_budget(self, budget_id: int, user_id: int) -> bool:
         """Soft delete a budget"""
@@ -68,6 +103,20 @@ class BudgetService:
 
         return self.crud.soft_delete(db_budget=db_budget)
 
+    def get_current_budget_period(self, budget_id: int, user_id: int) -> Optional[BudgetPeriod]:
+        """Get the current period of a budget with its precomputed spend"""
+        db_budget = self.crud.get_by_id(budget_id=budget_id, user_id=user_id, with_transactions=False)
+        if not db_budget:
+            raise HTTPException(status_code=404, detail="Budget not found")
+        return self.period_service.get_current_period(db_budget)
+
+    def get_budget_periods(self, budget_id: int, user_id: int, skip: int = 0, limit: int = 100) -> List[BudgetPeriod]:
+        """Get the recorded periods of a budget, most recent first"""
+        db_budget = self.crud.get_by_id(budget_id=budget_id, user_id=user_id, with_transactions=False)
+        if not db_budget:
+            raise HTTPException(status_code=404, detail="Budget not found")
+        return self.period_service.get_periods(db_budget, skip=skip, limit=limit)
+
     def update_budget_spent_amount(self, budget_id: int, amount_change: int) -> Optional[Budget]:
         """Update the spent and remaining amounts of a budget"""
         return self.crud.update_spent_amount(budget_id=budget_id, amount_change=amount_change)
@@ -87,7 +136,8 @@ class BudgetService:
 
     def update_budget_amounts(self, budget_id: int, amount_change: int, is_debit: bool, user_id: int) -> Optional[Budget]:
         """
-        Update budget amounts when a transaction changes
+        Update budget amounts when a transaction changes.
+        Changes are left in the session for the caller's single commit.
         
         Args:
             budget_id: ID of the budget to update
@@ -97,7 +147,7 @@ class BudgetService:
         Returns:
             Updated budget or None if budget not found
         """
-        budget = self.crud.get_by_id(budget_id=budget_id, user_id=user_id)
+        budget = self.crud.get_by_id(budget_id=budget_id, user_id=user_id, with_transactions=False)
         if not budget:
             return None
             
@@ -114,11 +164,5 @@ class BudgetService:
             budget.spent_amount = 0
             budget.remaining_amount = budget.total_amount
             
-        # Update the budget
-        self.crud.update(budget, {
-            "spent_amount": budget.spent_amount,
-            "remaining_amount": budget.remaining_amount,
-            "updated_at": datetime.now(timezone.utc)
-        })
-        
+        budget.updated_at = datetime.now(timezone.utc)
         return budget
\ No newline at end of file
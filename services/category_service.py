@@ -1,8 +1,15 @@
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 from db.models.category import Category
-from schemas.category import CategoryCreate, CategoryUpdate
+from schemas.category import CategoryCreate, CategoryUpdate, CategoryStats, Category as CategorySchema
+from schemas.transaction import TransactionType
+from services.transaction_archive_service import reaches_archive, transaction_history
+from datetime import datetime
 from typing import List, Optional
 from fastapi import HTTPException
+from core.projection import ListProjection, Selection
+
+category_projection = ListProjection(Category, CategorySchema)
 
 class CategoryService:
     def __init__(self, db: Session):
@@ -11,6 +18,90 @@ class CategoryService:
     def get_categories(self, user_id: int) -> List[Category]:
         return self.db.query(Category).filter(Category.user_id == user_id).all()
 
+    def get_category_rows(self, user_id: int, selection: Optional[Selection] = None) -> List[dict]:
+        """
+        Same as get_categories, but selects only the columns behind the selected
+        fields and returns plain dicts for category_projection to serialize
+        """
+        selection = selection or category_projection.parse()
+        rows = self.db.query(*category_projection.columns(selection)).filter(Category.user_id == user_id).all()
+        return category_projection.to_dicts(self.db, rows, selection)
+
+    def get_category_stats(
+        self,
+        user_id: int,
+        account_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        include_archived: bool = False
+    ) -> List[CategoryStats]:
+        """
+        Per category activity of an account between start_date and end_date:
+        transaction count, debit and credit totals, average amount and the date
+        of the latest transaction. Transactions are grouped by category in one
+        query, which the (account_id, transaction_date) index serves, and joined
+        to the user's categories, so categories without activity come back
+        with zeros. Archived transactions are included with include_archived
+        or when the range reaches back past the archive cutoff.
+        """
+        if start_date and end_date and end_date < start_date:
+            raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+
+        def conditions(model) -> list:
+            conditions = [model.account_id == account_id]
+            if start_date:
+                conditions.append(model.transaction_date >= start_date)
+            if end_date:
+                conditions.append(model.transaction_date <= end_date)
+            return conditions
+
+        source = transaction_history(
+            ("category_id", "type", "amount", "transaction_date"),
+            conditions,
+            include_archived or reaches_archive(start_date, end_date)
+        )
+        is_debit = source.c.type == TransactionType.DEBIT
+        activity = (
+            select(
+                source.c.category_id,
+                func.count().label("transaction_count"),
+                func.sum(case((is_debit, source.c.amount), else_=0)).label("total_debit"),
+                func.sum(case((is_debit, 0), else_=source.c.amount)).label("total_credit"),
+                func.avg(source.c.amount).label("average_amount"),
+                func.max(source.c.transaction_date).label("last_activity")
+            )
+            .group_by(source.c.category_id)
+            .subquery("activity")
+        )
+        rows = self.db.execute(
+            select(
+                Category.id,
+                Category.name,
+                Category.color,
+                func.coalesce(activity.c.transaction_count, 0),
+                func.coalesce(activity.c.total_debit, 0),
+                func.coalesce(activity.c.total_credit, 0),
+                activity.c.average_amount,
+                activity.c.last_activity
+            )
+            .outerjoin(activity, activity.c.category_id == Category.id)
+            .where(Category.user_id == user_id)
+            .order_by(Category.name)
+        )
+        return [
+            CategoryStats(
+                category_id=category_id,
+                name=name,
+                color=color,
+                transaction_count=count,
+                total_debit=int(total_debit),
+                total_credit=int(total_credit),
+                average_amount=float(average) if average is not None else None,
+                last_activity=last_activity
+            )
+            for category_id, name, color, count, total_debit, total_credit, average, last_activity in rows
+        ]
+
     def get_category(self, category_id: int, user_id: int) -> Optional[Category]:
         category = self.db.query(Category).filter(
             Category.id == category_id,
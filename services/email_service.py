@@ -1,9 +1,12 @@
 from pydantic import EmailStr
-from core.email import EmailCore
 from fastapi import HTTPException
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.email import EmailCore
 
 class EmailService:
-    def __init__(self, email_core: EmailCore):
+    def __init__(self, email_core: "EmailCore"):
         self.email_core = email_core
 
     async def send_activation_email(self, email: EmailStr, username: str, activation_token: str) -> None:
@@ -0,0 +1,224 @@
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+from datetime import datetime, timezone
+from sqlalchemy import and_, case, func
+from sqlalchemy.orm import Session
+from db.models.account import Account
+from db.models.balance_snapshot import BalanceSnapshot
+from db.models.transaction import Transaction
+from crud.balance_snapshot import BalanceSnapshotCRUD
+from core.config import settings
+from schemas.account import BalanceDrift, BalanceSnapshotGranularity
+from schemas.transaction import TransactionType
+from services.transaction_archive_service import reaches_archive, transaction_history
+
+logger = logging.getLogger(__name__)
+
+def signed_amount(source):
+    """A transaction's effect on its account balance, over transaction_history()"""
+    return case((source.c.type == TransactionType.CREDIT, source.c.amount), else_=-source.c.amount)
+
+def _to_naive_utc(value: datetime) -> datetime:
+    """Normalize a datetime to naive UTC so DB values and request values compare cleanly"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+class LedgerService:
+    """
+    Account balances derived from the transaction ledger.
+
+    Each account keeps a snapshot per day or month (see BALANCE_SNAPSHOT_GRANULARITY)
+    of its ledger's net change and closing balance, updated in the same database
+    transaction as the transaction that changes it. The balance at any date is
+    the opening balance, plus the closing balance of the latest earlier period,
+    plus a scan of the transactions within the period, so a read costs one row
+    lookup however long the account's history. A write adds to its period's row
+    and, when backdated, to the closing balance of the later ones in one UPDATE.
+    """
+
+    def __init__(self, db: Session, granularity: Optional[BalanceSnapshotGranularity] = None):
+        self.db = db
+        self.crud = BalanceSnapshotCRUD(db)
+        self.granularity = granularity or BalanceSnapshotGranularity(settings.BALANCE_SNAPSHOT_GRANULARITY)
+
+    @staticmethod
+    def get_signed_amount(transaction_type: TransactionType, amount: int) -> int:
+        """Credits add to a balance, debits reduce it"""
+        return amount if transaction_type == TransactionType.CREDIT else -amount
+
+    def get_period_start(self, at: datetime) -> datetime:
+        """Start of the snapshot period containing `at`, as naive UTC"""
+        at = _to_naive_utc(at).replace(hour=0, minute=0, second=0, microsecond=0)
+        if self.granularity == BalanceSnapshotGranularity.MONTH:
+            at = at.replace(day=1)
+        return at
+
+    def record_transaction(
+        self,
+        account_id: Optional[int],
+        transaction_date: datetime,
+        transaction_type: TransactionType,
+        amount: int,
+        reverse: bool = False
+    ) -> None:
+        """
+        Apply a transaction's effect to the account's snapshots.
+        Pass reverse=True to undo a previously recorded transaction.
+        The caller is responsible for committing.
+        """
+        # Transactions without a date belong to no snapshot period
+        if not account_id or not amount or transaction_date is None:
+            return
+
+        amount_change = self.get_signed_amount(transaction_type, amount)
+        if reverse:
+            amount_change = -amount_change
+        self.crud.apply(account_id, self.granularity, self.get_period_start(transaction_date), amount_change)
+
+    def get_balance_at(self, account: Account, at: datetime, inclusive: bool = True) -> int:
+        """
+        Get an account's balance including every transaction dated at or before `at`.
+        With inclusive=False transactions dated exactly at `at` are left out.
+        """
+        at = _to_naive_utc(at)
+        period_start = self.get_period_start(at)
+        total_before = self.crud.get_total_before(account.id, self.granularity, period_start)
+        source = transaction_history(
+            ("type", "amount"),
+            lambda model: [
+                model.account_id == account.id,
+                model.transaction_date >= period_start,
+                model.transaction_date <= at if inclusive else model.transaction_date < at
+            ],
+            reaches_archive(period_start)
+        )
+        delta = self.db.query(func.coalesce(func.sum(signed_amount(source)), 0)).scalar()
+        return (account.opening_balance or 0) + total_before + int(delta)
+
+    def get_running_balances(self, account: Account, transactions: Iterable[Transaction]) -> Dict[int, int]:
+        """
+        Get the account balance right after each of the given transactions, in
+        ledger order (transaction_date, then id). Only the date range the
+        transactions span is scanned, with a window function on top of the
+        balance at its start.
+        """
+        transactions = [t for t in transactions if t.transaction_date is not None]
+        if not transactions:
+            return {}
+
+        start = min(t.transaction_date for t in transactions)
+        end = max(t.transaction_date for t in transactions)
+        opening = self.get_balance_at(account, start, inclusive=False)
+        source = transaction_history(
+            ("id", "transaction_date", "type", "amount"),
+            lambda model: [
+                model.account_id == account.id,
+                model.transaction_date >= start,
+                model.transaction_date <= end
+            ],
+            reaches_archive(start)
+        )
+        running_total = func.sum(signed_amount(source)).over(
+            order_by=(source.c.transaction_date, source.c.id)
+        )
+        rows = self.db.query(source.c.id, running_total).all()
+        wanted = {t.id for t in transactions}
+        return {
+            transaction_id: opening + int(total)
+            for transaction_id, total in rows
+            if transaction_id in wanted
+        }
+
+    def rebuild_snapshots(self, account_id: int, include_archive: bool = True) -> None:
+        """
+        Recompute an account's snapshots from its transactions, archived ones included
+        unless include_archive is False. The caller is responsible for committing.
+        """
+        source = transaction_history(
+            ("transaction_date", "type", "amount"),
+            lambda model: [model.account_id == account_id, model.transaction_date.isnot(None)],
+            include_archive
+        )
+        rows = (
+            self.db.query(source.c.transaction_date, source.c.type, source.c.amount)
+            .yield_per(1000)
+        )
+        net_changes = defaultdict(int)
+        for transaction_date, transaction_type, amount in rows:
+            net_changes[self.get_period_start(transaction_date)] += self.get_signed_amount(transaction_type, amount or 0)
+        self.crud.replace(account_id, self.granularity, net_changes.items())
+
+    def reconcile(self, fix: bool = False) -> List[BalanceDrift]:
+        """
+        Recompute every account's balance from its ledger and report the accounts
+        whose stored balance has drifted. Snapshots that disagree with the ledger
+        are rebuilt; stored balances are only corrected when fix is set.
+        """
+        source = transaction_history(
+            ("account_id", "transaction_date", "type", "amount"),
+            lambda model: [model.account_id.isnot(None)]
+        )
+        # Transactions without a date belong to no period, so snapshots only
+        # cover the dated ones; the stored balance covers them all
+        ledger_totals = {
+            account_id: (int(total or 0), int(dated_total or 0))
+            for account_id, total, dated_total in (
+                self.db.query(
+                    source.c.account_id,
+                    func.sum(signed_amount(source)),
+                    func.sum(case((source.c.transaction_date.isnot(None), signed_amount(source)), else_=0))
+                )
+                .group_by(source.c.account_id)
+                .all()
+            )
+        }
+        snapshot_totals = dict(
+            self.db.query(BalanceSnapshot.account_id, func.sum(BalanceSnapshot.net_change))
+            .filter(BalanceSnapshot.granularity == self.granularity)
+            .group_by(BalanceSnapshot.account_id)
+            .all()
+        )
+        latest = (
+            self.db.query(BalanceSnapshot.account_id, func.max(BalanceSnapshot.period_start).label("period_start"))
+            .filter(BalanceSnapshot.granularity == self.granularity)
+            .group_by(BalanceSnapshot.account_id)
+            .subquery()
+        )
+        closing_balances = dict(
+            self.db.query(BalanceSnapshot.account_id, BalanceSnapshot.closing_balance)
+            .join(latest, and_(
+                BalanceSnapshot.account_id == latest.c.account_id,
+                BalanceSnapshot.period_start == latest.c.period_start
+            ))
+            .filter(BalanceSnapshot.granularity == self.granularity)
+            .all()
+        )
+
+        drifts = []
+        for account in self.db.query(Account).all():
+            ledger_total, dated_total = ledger_totals.get(account.id, (0, 0))
+            snapshot_total = int(snapshot_totals.get(account.id) or 0)
+            closing_balance = int(closing_balances.get(account.id) or 0)
+            if snapshot_total != dated_total or closing_balance != dated_total:
+                logger.warning(f"Balance snapshots of account {account.id} disagree with its ledger, rebuilding")
+                self.rebuild_snapshots(account.id)
+
+            ledger_balance = (account.opening_balance or 0) + ledger_total
+            balance = account.balance or 0
+            if balance == ledger_balance:
+                continue
+            drift = BalanceDrift(
+                account_id=account.id,
+                balance=balance,
+                ledger_balance=ledger_balance,
+                drift=balance - ledger_balance
+            )
+            logger.warning(f"Account {account.id} balance {balance} drifts from ledger balance {ledger_balance} by {drift.drift}")
+            if fix:
+                account.balance = ledger_balance
+            drifts.append(drift)
+
+        self.db.commit()
+        return drifts
@@ -1,13 +1,16 @@
 from sqlalchemy.orm import Session
 from db.models.pots import Pot
 from db.models.transaction import Transaction
-from schemas.pot import PotCreate, PotUpdate, PotSummary
+from schemas.pot import PotCreate, PotUpdate, PotSummary, Pot as PotSchema
 from schemas.transaction import TransactionType, TransactionCreate
 from typing import List, Optional
 from fastapi import HTTPException
 from datetime import datetime, timezone
 from services.transaction_service import TransactionService
 from db.models.user import User
+from core.projection import ListProjection, Selection
+
+pot_projection = ListProjection(Pot, PotSchema)
 
 class PotService:
     def __init__(self, db: Session):
@@ -47,6 +50,27 @@ class PotService:
             .all()
         )
 
+    def get_pot_rows(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        selection: Optional[Selection] = None
+    ) -> List[dict]:
+        """
+        Same as get_pots, but selects only the columns behind the selected fields
+        and returns plain dicts for pot_projection to serialize
+        """
+        selection = selection or pot_projection.parse()
+        rows = (
+            self.db.query(*pot_projection.columns(selection))
+            .filter(Pot.user_id == user_id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        return pot_projection.to_dicts(self.db, rows, selection)
+
     def get_pot_by_id(self, pot_id: int, user_id: int) -> Optional[Pot]:
         """Get a specific pot by ID"""
         pot = self.db.query(Pot).filter(
@@ -77,8 +101,11 @@ class PotService:
         self.db.commit()
         return True
 
-    def update_saved_amount(self, pot_id: int, user_id: int, user: User, amount: int, reason: str) -> Pot:
-        """Update the saved amount of a pot and create a transaction record"""
+    def update_saved_amount(self, pot_id: int, user_id: int, user: User, amount: int, reason: str, commit: bool = True) -> Pot:
+        """
+        Update the saved amount of a pot and create a transaction record.
+        Pass commit=False to leave both changes for the caller to commit.
+        """
         pot = self.get_pot_by_id(pot_id, user_id)
         
         # Ensure the new amount is not negative
@@ -105,14 +132,14 @@ class PotService:
             sender="Self",
             recipient=pot.name,
         )
-        self.transaction_service.create_transaction(transaction_data, user)
+        self.transaction_service.create_transaction(transaction_data, user, commit=False)
         
-        # Update pot's saved amount
+        # Update pot's saved amount in the same commit as the transaction
         pot.saved_amount += amount
         pot.updated_at = datetime.now(timezone.utc)
         
-        self.db.commit()
-        self.db.refresh(pot)
+        if commit:
+            self.db.commit()
         return pot
 
     def get_pot_summary(self, user_id: int) -> PotSummary:
@@ -0,0 +1,185 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, InterfaceError, OperationalError
+from sqlalchemy.orm import Session
+from db.models.recurring_transaction import RecurringTransaction
+from db.models.user import User
+from core.config import settings
+from schemas.recurring_transaction import RecurrenceInterval, RecurringTransactionCreate
+from schemas.transaction import TransactionType
+from services.budget_period_service import _add_months
+from services.transaction_service import TransactionService
+
+logger = logging.getLogger(__name__)
+
+# Template columns copied to every transaction a rule creates
+TEMPLATE_COLUMNS = (
+    "account_id", "user_id", "category_id", "budget_id", "pot_id",
+    "description", "recipient", "sender", "amount", "type", "meta_data"
+)
+
+def _to_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def occurrence_date(rule: RecurringTransaction, index: int) -> datetime:
+    """
+    Date of a rule's occurrence number `index`, counting from 0 at start_date.
+    Always offset from start_date, so monthly rules on the 31st return to the
+    31st after a short month.
+    """
+    steps = index * rule.interval_count
+    if rule.interval == RecurrenceInterval.DAILY:
+        return rule.start_date + timedelta(days=steps)
+    if rule.interval == RecurrenceInterval.WEEKLY:
+        return rule.start_date + timedelta(weeks=steps)
+    if rule.interval == RecurrenceInterval.MONTHLY:
+        return _add_months(rule.start_date, steps)
+    return _add_months(rule.start_date, 12 * steps)
+
+class RecurringTransactionService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.transaction_service = TransactionService(db)
+
+    def create_rule(self, data: RecurringTransactionCreate, user: User) -> RecurringTransaction:
+        """Create a rule; its occurrences are created by the scheduler from start_date on"""
+        start_date = _to_naive_utc(data.start_date)
+        end_date = _to_naive_utc(data.end_date) if data.end_date else None
+        if end_date is not None and end_date < start_date:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end_date must not be before start_date")
+
+        rule = RecurringTransaction(
+            **data.model_dump(exclude={"start_date", "end_date", "recipient", "sender"}),
+            account_id=user.account.id,
+            user_id=user.id,
+            # The same defaults create_transaction applies
+            recipient=data.recipient if data.type == TransactionType.DEBIT else user.username,
+            sender=data.sender if data.type == TransactionType.CREDIT else user.username,
+            start_date=start_date,
+            end_date=end_date,
+            next_run=start_date,
+            occurrences=0,
+            is_active=True
+        )
+        self.db.add(rule)
+        self.db.commit()
+        self.db.refresh(rule)
+        return rule
+
+    def get_rules(self, account_id: int) -> List[RecurringTransaction]:
+        return self.db.scalars(
+            select(RecurringTransaction)
+            .where(RecurringTransaction.account_id == account_id)
+            .order_by(RecurringTransaction.id)
+        ).all()
+
+    def deactivate_rule(self, rule_id: int, account_id: int) -> RecurringTransaction:
+        """Stop a rule; transactions it already created are kept"""
+        rule = self.db.scalars(
+            select(RecurringTransaction).where(
+                RecurringTransaction.id == rule_id,
+                RecurringTransaction.account_id == account_id
+            )
+        ).first()
+        if not rule:
+            raise HTTPException(status_code=404, detail="Recurring transaction not found")
+        rule.is_active = False
+        rule.next_run = None
+        self.db.commit()
+        return rule
+
+    def post_due(self, now: Optional[datetime] = None, batch_size: int = settings.RECURRING_TRANSACTIONS_BATCH_SIZE) -> int:
+        """
+        Create every occurrence due by `now`, including those missed while no
+        worker ran, committing about batch_size transactions at a time.
+
+        Each batch locks its rules with SELECT ... FOR UPDATE SKIP LOCKED until it
+        commits, so workers running this at the same time take different rules
+        and an occurrence is never posted twice. Once a batch commits, its rules'
+        next_run has moved past what was posted. All occurrences of a batch go
+        through the bulk write path together, so catching up on a long outage
+        costs a few statements per batch rather than several per occurrence.
+        A batch that fails is retried one occurrence at a time (see _post).
+
+        Returns:
+            Number of transactions created
+        """
+        now = _to_naive_utc(now or datetime.now(timezone.utc))
+        created = 0
+        while True:
+            rules = self.db.scalars(
+                select(RecurringTransaction)
+                .where(RecurringTransaction.is_active == True, RecurringTransaction.next_run <= now)
+                .order_by(RecurringTransaction.next_run)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if not rules:
+                # Ends the transaction the locking read began
+                self.db.commit()
+                break
+
+            rows: List[Tuple[RecurringTransaction, Dict[str, Any]]] = []
+            for rule in rules:
+                # A rule far behind takes the rest of the batch and continues in the next one
+                while rule.next_run is not None and rule.next_run <= now and len(rows) < batch_size:
+                    template = {name: getattr(rule, name) for name in TEMPLATE_COLUMNS}
+                    rows.append((rule, {**template, "transaction_date": rule.next_run}))
+                    rule.occurrences += 1
+                    next_run = occurrence_date(rule, rule.occurrences)
+                    rule.next_run = None if rule.end_date is not None and next_run > rule.end_date else next_run
+                if len(rows) >= batch_size:
+                    break
+
+            created += self._post(rows)
+            self.db.commit()
+        if created:
+            logger.info(f"Created {created} recurring transactions")
+        return created
+
+    def _post(self, rows: List[Tuple[RecurringTransaction, Dict[str, Any]]]) -> int:
+        """
+        Create a batch's occurrences under a savepoint. If the batch fails, each
+        occurrence is retried under its own savepoint: one that duplicates an
+        existing transaction is skipped, and a rule whose occurrence fails for
+        any other reason, such as a value the column rejects or a budget that no
+        longer exists, is deactivated with the error recorded in last_error.
+        Neither holds back the other rules. Lost connections are not caught, so
+        an outage stops the run instead of deactivating every rule.
+        The rules' advanced next_run is flushed before the savepoints and kept.
+
+        Returns:
+            Number of transactions created
+        """
+        try:
+            with self.db.begin_nested():
+                return self.transaction_service.create_transactions_bulk([row for _, row in rows])
+        except (OperationalError, InterfaceError):
+            raise
+        except Exception as e:
+            logger.warning(f"Recurring transaction batch failed, posting its occurrences one by one: {e}")
+
+        created = 0
+        for rule, row in rows:
+            if not rule.is_active:
+                continue
+            try:
+                with self.db.begin_nested():
+                    created += self.transaction_service.create_transactions_bulk([row])
+            except (OperationalError, InterfaceError):
+                raise
+            except Exception as e:
+                error = e.orig if isinstance(e, IntegrityError) else e
+                if isinstance(e, IntegrityError) and "fingerprint" in str(error):
+                    logger.warning(f"Skipped occurrence {row['transaction_date']} of recurring transaction {rule.id}: it already exists")
+                    continue
+                logger.error(f"Deactivated recurring transaction {rule.id}: its occurrence {row['transaction_date']} failed: {error}")
+                rule.is_active = False
+                rule.next_run = None
+                rule.last_error = f"Occurrence {row['transaction_date']} failed: {error}"
+        return created
@@ -0,0 +1,104 @@
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Optional, Sequence
+from sqlalchemy import delete, insert, select, union_all, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import FromClause
+from db.models.account import Account
+from db.models.archived_transaction import ArchivedTransaction
+from db.models.transaction import Transaction
+from db.partitioning import add_months
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Columns both tables share, in the order the archive copies them
+ARCHIVED_COLUMNS = [column.key for column in Transaction.__table__.columns]
+
+def archive_cutoff(now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Transactions dated before this may live in the archive table.
+    None when archiving is turned off.
+    """
+    if settings.TRANSACTION_ARCHIVE_AFTER_MONTHS <= 0:
+        return None
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    return add_months(now, -settings.TRANSACTION_ARCHIVE_AFTER_MONTHS)
+
+def _naive(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def reaches_archive(start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> bool:
+    """
+    Whether a date range reaches back past the archive cutoff. A range without
+    a start date only reaches it through its end date; reads covering all time
+    ask for the archive explicitly, see TransactionFilter.include_archived.
+    """
+    cutoff = archive_cutoff()
+    if cutoff is None:
+        return False
+    return any(date is not None and _naive(date) < cutoff for date in (start_date, end_date))
+
+def transaction_history(
+    columns: Sequence[str] = ARCHIVED_COLUMNS,
+    conditions: Callable[[Any], List[Any]] = lambda model: [],
+    include_archive: bool = True
+) -> FromClause:
+    """
+    The named columns of the transactions matching conditions, a function of the
+    model returning WHERE clauses, and with include_archive of the archived ones
+    too. The conditions are applied inside each arm of the union, so every table
+    is read through its own indexes rather than filtered after the union.
+    """
+    arms = [
+        select(*(getattr(model, name) for name in columns)).where(*conditions(model))
+        for model in ((Transaction, ArchivedTransaction) if include_archive else (Transaction,))
+    ]
+    source = union_all(*arms) if include_archive else arms[0]
+    return source.subquery("transaction_history")
+
+class TransactionArchiveService:
+    """Moves transactions older than the archive cutoff to the archive table"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def archive(self, cutoff: Optional[datetime] = None, batch_size: int = settings.TRANSACTION_ARCHIVE_BATCH_SIZE) -> int:
+        """
+        Move transactions dated before cutoff to the archive in batches of
+        batch_size, committing each batch so locks are held briefly.
+        Returns how many were moved.
+        """
+        cutoff = cutoff or archive_cutoff()
+        if cutoff is None:
+            return 0
+
+        moved = 0
+        while True:
+            ids = self.db.scalars(
+                select(Transaction.id)
+                .where(Transaction.transaction_date < cutoff)
+                .order_by(Transaction.id)
+                .limit(batch_size)
+            ).all()
+            if not ids:
+                break
+            self.db.execute(
+                insert(ArchivedTransaction).from_select(
+                    ARCHIVED_COLUMNS,
+                    select(*(getattr(Transaction, name) for name in ARCHIVED_COLUMNS)).where(Transaction.id.in_(ids))
+                )
+            )
+            self.db.execute(delete(Transaction).where(Transaction.id.in_(ids)))
+            # Lists that leave the archive out no longer count these rows
+            self.db.execute(
+                update(Account)
+                .where(Account.id.in_(select(ArchivedTransaction.account_id).where(ArchivedTransaction.id.in_(ids))))
+                .values(transactions_version=Account.transactions_version + 1)
+            )
+            self.db.commit()
+            moved += len(ids)
+        logger.info(f"Archived {moved} transactions dated before {cutoff}")
+        return moved
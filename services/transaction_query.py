@@ -0,0 +1,258 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, NamedTuple, Optional, Sequence, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import and_, bindparam, func, or_, select, union_all
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import Executable
+from core.config import settings
+from db.models.archived_transaction import ArchivedTransaction
+from db.models.transaction import Transaction
+from schemas.transaction import TransactionFilter
+from services.transaction_archive_service import reaches_archive
+
+# Columns lists can be sorted by; each is the second column of an index
+# starting with account_id, or the primary key
+SORT_FIELDS = ("transaction_date", "amount", "created_at", "id")
+DATETIME_SORT_FIELDS = {"transaction_date", "created_at"}
+# Columns totals can be grouped by
+GROUP_FIELDS = ("type", "category_id", "budget_id", "pot_id")
+
+# The condition each TransactionFilter field adds, with its value as a bound parameter
+FILTER_CONDITIONS: Dict[str, Callable[[Any], Any]] = {
+    "start_date": lambda model: model.transaction_date >= bindparam("start_date"),
+    "end_date": lambda model: model.transaction_date <= bindparam("end_date"),
+    "type": lambda model: model.type == bindparam("type"),
+    "category_id": lambda model: model.category_id == bindparam("category_id"),
+    "budget_id": lambda model: model.budget_id == bindparam("budget_id"),
+    "pot_id": lambda model: model.pot_id == bindparam("pot_id"),
+    "min_amount": lambda model: model.amount >= bindparam("min_amount"),
+    "max_amount": lambda model: model.amount <= bindparam("max_amount"),
+    "recipient": lambda model: model.recipient.ilike(bindparam("recipient")),
+    "sender": lambda model: model.sender.ilike(bindparam("sender")),
+}
+# Filters matched anywhere in the column
+SUBSTRING_FILTERS = {"recipient", "sender"}
+
+class Statement(NamedTuple):
+    """A cached statement and the parameters to execute it with: db.execute(*statement)"""
+    statement: Executable
+    params: Dict[str, Any]
+
+class _Shape(NamedTuple):
+    """Everything that changes a statement's SQL, as opposed to its parameters"""
+    kind: str
+    names: Tuple[str, ...]
+    filters: Tuple[str, ...]
+    sort_by: str
+    sort_order: str
+    keyset: bool
+    # Whether the cursor's sort value is NULL, which needs its own condition
+    after_null: bool
+    limited: bool
+    include_archive: bool
+
+class TransactionQuery:
+    """
+    A transaction list query compiled from a TransactionFilter, a whitelisted
+    sort and optionally a keyset cursor position.
+
+    Each combination of filters, sort and selected columns maps to one statement
+    whose values are bound parameters. It is built once per process and reused,
+    so SQLAlchemy reuses its memoized cache key and compiled SQL, and a request
+    only supplies the parameters. Every statement starts from account_id, so the
+    (account_id, transaction_date) index or a unique key led by account_id
+    serves it. The list, page, stream, count and summary queries are all built here.
+
+    The archive table is unioned in when the filters ask for it with
+    include_archived or their dates reach back past the archive cutoff.
+    """
+
+    def __init__(
+        self,
+        account_id: int,
+        filters: Optional[TransactionFilter] = None,
+        sort_by: str = "transaction_date",
+        sort_order: str = "desc",
+        after: Optional[tuple] = None
+    ):
+        if sort_by not in SORT_FIELDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot sort by {sort_by}; expected one of {', '.join(SORT_FIELDS)}"
+            )
+        self.account_id = account_id
+        self.filters = filters or TransactionFilter()
+        self.sort_by = sort_by
+        self.sort_order = "asc" if sort_order.lower() == "asc" else "desc"
+        self.after = after
+        self.include_archive = self.filters.include_archived or reaches_archive(self.filters.start_date, self.filters.end_date)
+
+    def rows(self, names: Sequence[str], offset: int = 0, limit: Optional[int] = None) -> Statement:
+        """Select the named columns of the matching transactions, sorted"""
+        statement = _build(self._shape("rows", tuple(names), limit is not None))
+        return Statement(statement, self._params(offset=offset, limit=limit))
+
+    def entities(self, offset: int = 0, limit: Optional[int] = None) -> Statement:
+        """
+        Select matching Transaction objects, sorted, with budget and pot loaded.
+        Archived transactions have no ORM objects and are left out.
+        """
+        shape = self._shape("entities", (), limit is not None)._replace(include_archive=False)
+        return Statement(_build(shape), self._params(offset=offset, limit=limit))
+
+    def totals(self, group_by: Optional[str] = None) -> Statement:
+        """
+        Count and sum the amounts of matching transactions, in one group per
+        value of group_by if given: rows of (value, count, amount), or a
+        single (count, amount) row.
+        """
+        if group_by is not None and group_by not in GROUP_FIELDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot group by {group_by}; expected one of {', '.join(GROUP_FIELDS)}"
+            )
+        names = () if group_by is None else (group_by,)
+        shape = self._shape("totals", names, False)._replace(sort_by="", sort_order="", keyset=False, after_null=False)
+        return Statement(_build(shape), self._params())
+
+    def cache_key(self) -> tuple:
+        """Identifies the rows the query matches, whatever their sort or slice"""
+        params = self._params()
+        params.pop("after_value", None)
+        params.pop("after_id", None)
+        return (self.include_archive, *sorted(params.items()))
+
+    def _shape(self, kind: str, names: Tuple[str, ...], limited: bool) -> _Shape:
+        filters = tuple(name for name in FILTER_CONDITIONS if getattr(self.filters, name))
+        return _Shape(
+            kind, names, filters, self.sort_by, self.sort_order,
+            self.after is not None, self.after is not None and self.after[0] is None,
+            limited, self.include_archive
+        )
+
+    def _params(self, **extra: Any) -> Dict[str, Any]:
+        params = {"account_id": self.account_id}
+        for name in FILTER_CONDITIONS:
+            value = getattr(self.filters, name)
+            if value:
+                params[name] = f"%{value}%" if name in SUBSTRING_FILTERS else value
+        if self.after is not None:
+            params["after_value"], params["after_id"] = self.after
+            if params["after_value"] is None:
+                del params["after_value"]
+        params.update((name, value) for name, value in extra.items() if value is not None)
+        return params
+
+def _conditions(model, shape: _Shape) -> list:
+    conditions = [model.account_id == bindparam("account_id")]
+    conditions.extend(FILTER_CONDITIONS[name](model) for name in shape.filters)
+    if shape.keyset:
+        conditions.append(_after_condition(model, shape))
+    return conditions
+
+def _after_condition(model, shape: _Shape) -> Any:
+    """
+    Rows sorting after (value, id), the sort key of the last row of the previous
+    page. transaction_date, amount and created_at are nullable, and NULL sorts
+    below every value, as MySQL and SQLite order it: last when descending, first
+    when ascending. Comparing with NULL matches nothing, so NULLs get their own
+    branches.
+    """
+    column = getattr(model, shape.sort_by)
+    if shape.sort_order == "desc":
+        if shape.after_null:
+            return and_(column.is_(None), model.id < bindparam("after_id"))
+        return or_(
+            column < bindparam("after_value"),
+            and_(column == bindparam("after_value"), model.id < bindparam("after_id")),
+            column.is_(None)
+        )
+    if shape.after_null:
+        return or_(
+            and_(column.is_(None), model.id > bindparam("after_id")),
+            column.is_not(None)
+        )
+    return or_(
+        column > bindparam("after_value"),
+        and_(column == bindparam("after_value"), model.id > bindparam("after_id"))
+    )
+
+@lru_cache(maxsize=1024)
+def _build(shape: _Shape) -> Executable:
+    models = (Transaction, ArchivedTransaction) if shape.include_archive else (Transaction,)
+
+    if shape.kind == "totals":
+        if shape.include_archive:
+            source = union_all(*(
+                select(*(getattr(model, name) for name in shape.names), model.amount).where(*_conditions(model, shape))
+                for model in models
+            )).subquery("transaction_history")
+        else:
+            source = Transaction.__table__
+        keys = [source.c[name] for name in shape.names]
+        statement = select(*keys, func.count(), func.coalesce(func.sum(source.c.amount), 0))
+        if not shape.include_archive:
+            statement = statement.where(*_conditions(Transaction, shape))
+        return statement.group_by(*keys) if keys else statement
+
+    if shape.kind == "entities":
+        statement = select(Transaction).where(*_conditions(Transaction, shape)).options(
+            selectinload(Transaction.budget),
+            selectinload(Transaction.pot)
+        )
+        sort_column, id_column = getattr(Transaction, shape.sort_by), Transaction.id
+    elif shape.include_archive:
+        statement = union_all(*(
+            select(*(getattr(model, name) for name in shape.names)).where(*_conditions(model, shape))
+            for model in models
+        ))
+        sort_column, id_column = statement.selected_columns[shape.sort_by], statement.selected_columns["id"]
+    else:
+        statement = select(*(getattr(Transaction, name) for name in shape.names)).where(*_conditions(Transaction, shape))
+        sort_column, id_column = getattr(Transaction, shape.sort_by), Transaction.id
+
+    # id breaks ties so the order, and therefore every page, is stable
+    if shape.sort_order == "desc":
+        statement = statement.order_by(sort_column.desc(), id_column.desc())
+    else:
+        statement = statement.order_by(sort_column.asc(), id_column.asc())
+    statement = statement.offset(bindparam("offset"))
+    if shape.limited:
+        statement = statement.limit(bindparam("limit"))
+    return statement
+
+class CountCache:
+    """
+    Per process LRU cache of transaction list counts and facets.
+
+    Callers put the account's transactions_version in the key. Every write to an
+    account's transactions bumps it, so later reads miss and recount, and entries
+    for old versions are evicted as the cache fills.
+    """
+
+    def __init__(self, max_size: int = settings.TRANSACTION_COUNT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[tuple, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[dict]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: tuple, value: dict) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+transaction_count_cache = CountCache()
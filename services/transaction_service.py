@@ -1,19 +1,51 @@
-from sqlalchemy.orm import Session, joinedload, selectinload
-from sqlalchemy import desc, asc
-from typing import List, Optional
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session, joinedload, lazyload
+from sqlalchemy.exc import IntegrityError
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
+from collections import defaultdict
 from fastapi import HTTPException
 from datetime import datetime, timezone
 
 from db.models.transaction import Transaction
+from db.models.account import Account
+from db.models.budget import Budget
+from db.models.pots import Pot
 from schemas.transaction import TransactionCreate, TransactionUpdate, TransactionFilter, TransactionType, TransactionResponse
 from db.models.user import User
-from schemas.transaction import CategoryWithBudget, CategoryWithPot
+from schemas.transaction import CategoryWithBudget, CategoryWithPot, Transaction as TransactionSchema, TransactionWithRunningBalance
+from schemas.budget import Budget as BudgetSchema
+from schemas.pot import Pot as PotSchema
 from services.budget_service import BudgetService
+from services.budget_period_service import BudgetPeriodService
+from services.ledger_service import LedgerService
+from services.transaction_query import DATETIME_SORT_FIELDS, TransactionQuery, transaction_count_cache
+from core.projection import Expansion, ListProjection, Selection
+from core.pagination import decode_cursor, encode_cursor
+
+TRANSACTION_EXPANSIONS = {
+    "budget": Expansion(Transaction.budget_id, Budget, BudgetSchema),
+    "pot": Expansion(Transaction.pot_id, Pot, PotSchema),
+}
+transaction_projection = ListProjection(Transaction, TransactionSchema, TRANSACTION_EXPANSIONS)
+# Used instead of transaction_projection when running balances are requested
+running_balance_projection = ListProjection(Transaction, TransactionWithRunningBalance, TRANSACTION_EXPANSIONS)
+
+# Rows fetched per query while streaming a list
+STREAM_BATCH_SIZE = 500
+# Columns ?include=facets counts transactions by
+FACET_FIELDS = ("type", "category_id", "budget_id")
+
+class TransactionPage(NamedTuple):
+    items: List[dict]
+    # Cursor of the following page; None on the last page
+    next_cursor: Optional[str]
 
 class TransactionService:
     def __init__(self, db: Session):
         self.db = db
         self.budget_service = BudgetService(db)
+        self.budget_period_service = BudgetPeriodService(db)
+        self.ledger_service = LedgerService(db)
 
     def _adjust_account_balance(self, transaction: Transaction) -> None:
         """Helper method to adjust account balance based on transaction type"""
@@ -29,6 +61,35 @@ class TransactionService:
         else:  # DEBIT
             transaction.account.balance += transaction.amount
 
+    def _touch_account(self, transaction: Transaction) -> None:
+        """Bump the account's transactions_version so cached counts for the old data are not served"""
+        # Incremented in SQL so concurrent writers never end up on the same version
+        transaction.account.transactions_version = Account.transactions_version + 1
+
+    def _set_fingerprint(self, transaction: Transaction) -> None:
+        """Derive the duplicate detection fingerprint from the transaction's fields"""
+        transaction.fingerprint = Transaction.compute_fingerprint(
+            transaction.description,
+            transaction.recipient,
+            transaction.amount,
+            transaction.transaction_date
+        )
+
+    def _flush_unique(self, transaction: Transaction) -> None:
+        """
+        Write a new or changed transaction under a savepoint. A clash on the
+        (account_id, fingerprint) index means a duplicate and only undoes this write.
+        """
+        try:
+            # begin_nested flushes pending changes first, so the row is only added inside it
+            with self.db.begin_nested():
+                self._set_fingerprint(transaction)
+                self.db.add(transaction)
+        except IntegrityError as e:
+            if "fingerprint" not in str(e.orig):
+                raise
+            raise HTTPException(status_code=400, detail="Transaction already exists")
+
     def _update_budget_for_transaction(self, transaction: Transaction, is_new: bool = True, old_amount: Optional[int] = None) -> None:
         """Helper method to update budget amounts when a transaction changes"""
         if not transaction.budget_id:
@@ -55,18 +116,14 @@ class TransactionService:
                     user_id=transaction.user_id
                 )
 
-    def create_transaction(self, transaction_data: TransactionCreate, user: User) -> Transaction:
-        """Create a new transaction"""
-        # Check for duplicate transaction
-        if self.db.query(Transaction).filter(
-            Transaction.account_id == user.account.id,
-            Transaction.description == transaction_data.description,
-            Transaction.recipient == transaction_data.recipient,
-            Transaction.amount == transaction_data.amount,
-            Transaction.transaction_date == transaction_data.transaction_date,
-        ).first():
-            raise HTTPException(status_code=400, detail="Transaction already exists")
-        
+    def create_transaction(self, transaction_data: TransactionCreate, user: User, commit: bool = True) -> Transaction:
+        """
+        Create a new transaction and apply it to the account balance and budget.
+
+        The transaction, balance and budget changes are written in one database
+        transaction. Pass commit=False when the caller has more changes to make
+        in the same unit of work and will commit itself.
+        """
         db_transaction = Transaction(
             account_id=user.account.id,
             category_id=transaction_data.category_id,
@@ -81,21 +138,105 @@ class TransactionService:
             user_id=user.id,
             pot_id=transaction_data.pot_id
         )
-        self.db.add(db_transaction)
-        self.db.commit()
-        self.db.refresh(db_transaction)
+        # Insert before touching balances so a duplicate leaves nothing to undo
+        self._flush_unique(db_transaction)
         
         # Update account balance
         self._adjust_account_balance(db_transaction)
+        self._touch_account(db_transaction)
+        self.ledger_service.record_transaction(
+            db_transaction.account_id,
+            db_transaction.transaction_date,
+            db_transaction.type,
+            db_transaction.amount
+        )
         
         # Update budget amounts if this transaction is associated with a budget
         self._update_budget_for_transaction(db_transaction)
+        self.budget_period_service.record_transaction(
+            db_transaction.budget_id,
+            db_transaction.transaction_date,
+            db_transaction.type,
+            db_transaction.amount
+        )
         
-        # Commit all changes
-        self.db.commit()
-        self.db.refresh(db_transaction)
+        if commit:
+            self.db.commit()
+        else:
+            # Assign the id and server defaults so the caller can use the row before committing
+            self.db.flush()
         return db_transaction
 
+    def create_transactions_bulk(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Bulk write path for generated transactions, such as recurring ones.
+
+        rows are dicts of Transaction columns, with recipient and sender already
+        resolved. They are inserted with one executemany INSERT. Their effect on
+        balances, snapshots and budgets is summed first, then applied with one
+        update per account, snapshot period, budget and budget period, not one
+        per transaction. A duplicate fails the whole batch rather than being
+        skipped, so callers that can meet one run it under a savepoint. The
+        caller is responsible for committing.
+
+        Returns:
+            Number of transactions inserted
+        """
+        if not rows:
+            return 0
+        for row in rows:
+            row["fingerprint"] = Transaction.compute_fingerprint(
+                row.get("description"), row.get("recipient"), row["amount"], row["transaction_date"]
+            )
+        self.db.execute(insert(Transaction), rows)
+
+        budget_ids = {row["budget_id"] for row in rows if row.get("budget_id")}
+        budgets = {
+            budget.id: budget
+            for budget in self.db.scalars(
+                select(Budget).where(Budget.id.in_(budget_ids)).options(lazyload(Budget.transactions))
+            )
+        } if budget_ids else {}
+
+        balance_changes = defaultdict(int)
+        snapshot_changes = defaultdict(int)
+        budget_changes = defaultdict(int)
+        period_changes = defaultdict(int)
+        for row in rows:
+            signed = self.ledger_service.get_signed_amount(row["type"], row["amount"])
+            balance_changes[row["account_id"]] += signed
+            snapshot_changes[(row["account_id"], self.ledger_service.get_period_start(row["transaction_date"]))] += signed
+            if not row.get("budget_id"):
+                continue
+            spend = self.budget_period_service.get_spend_change(row["type"], row["amount"])
+            budget_changes[(row["budget_id"], row["user_id"])] += spend
+            budget = budgets.get(row["budget_id"])
+            bounds = self.budget_period_service.get_period_bounds(budget, row["transaction_date"]) if budget else None
+            if bounds:
+                period_changes[(row["budget_id"], *bounds)] += spend
+
+        for account_id, change in balance_changes.items():
+            self.db.execute(
+                update(Account)
+                .where(Account.id == account_id)
+                .values(balance=Account.balance + change, transactions_version=Account.transactions_version + 1)
+                .execution_options(synchronize_session=False)
+            )
+            # The update bypasses the session, so a loaded account reloads these on next access
+            account = self.db.identity_map.get(self.db.identity_key(Account, account_id))
+            if account is not None:
+                self.db.expire(account, ["balance", "transactions_version"])
+        for (account_id, period_start), change in snapshot_changes.items():
+            if change:
+                self.ledger_service.crud.apply(account_id, self.ledger_service.granularity, period_start, change)
+        for (budget_id, user_id), change in budget_changes.items():
+            if change:
+                self.budget_service.update_budget_amounts(budget_id, change, is_debit=True, user_id=user_id)
+        for (budget_id, period_start, period_end), change in period_changes.items():
+            if change:
+                self.budget_period_service.crud.increment(budget_id, period_start, period_end, change)
+        return len(rows)
+
     def get_transactions(
         self,
         account_id: int,
@@ -103,50 +244,171 @@ class TransactionService:
         limit: int = 100,
         sort_by: str = "transaction_date",
         sort_order: str = "desc",
-        filters: Optional[TransactionFilter] = None
+        filters: Optional[TransactionFilter] = None,
+        with_running_balance: bool = False
     ) -> List[Transaction]:
-        """Get all transactions with filtering and sorting"""
-        # Start with a query that eagerly loads budget and pot using selectinload
-        query = (
-            self.db.query(Transaction)
-            .filter(Transaction.account_id == account_id)
-            .options(
-                selectinload(Transaction.budget),
-                selectinload(Transaction.pot)
-            )
-        )
+        """
+        Get all transactions with filtering and sorting.
+        With with_running_balance each transaction gets a running_balance
+        attribute holding the account balance right after it.
+        """
+        # Budget and pot are eagerly loaded using selectinload
+        query = TransactionQuery(account_id, filters, sort_by, sort_order)
+        transactions = self.db.scalars(*query.entities(skip, limit)).all()
+        if with_running_balance and transactions:
+            running_balances = self._get_running_balances(account_id, transactions)
+            for transaction in transactions:
+                transaction.running_balance = running_balances.get(transaction.id)
+        return transactions
+
+    def get_transaction_rows(
+        self,
+        account_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        sort_by: str = "transaction_date",
+        sort_order: str = "desc",
+        filters: Optional[TransactionFilter] = None,
+        selection: Optional[Selection] = None,
+        with_running_balance: bool = False
+    ) -> List[dict]:
+        """
+        Same as get_transactions, but selects only the columns behind the selected
+        fields and returns plain dicts for transaction_projection to serialize,
+        or running_balance_projection with with_running_balance.
+        Budget and pot are only loaded when the selection expands them.
+        Archived transactions are included when the filters ask for them or
+        their dates reach back past the archive cutoff.
+        """
+        query = TransactionQuery(account_id, filters, sort_by, sort_order)
+        projection = running_balance_projection if with_running_balance else transaction_projection
+        selection = selection or projection.parse()
+        # Running balances are worked out from each row's id and date
+        internal = ("id", "transaction_date") if with_running_balance else ()
+        names = [column.key for column in projection.columns(selection, *internal)]
+        rows = self.db.execute(*query.rows(names, skip, limit)).all()
+
+        items = projection.to_dicts(self.db, rows, selection, *internal)
+        if with_running_balance and rows:
+            running_balances = self._get_running_balances(account_id, rows)
+            for item, row in zip(items, rows):
+                item["running_balance"] = running_balances.get(row.id)
+        return items
+
+    def get_transaction_page(
+        self,
+        account_id: int,
+        limit: int = 100,
+        sort_by: str = "transaction_date",
+        sort_order: str = "desc",
+        filters: Optional[TransactionFilter] = None,
+        cursor: Optional[str] = None,
+        selection: Optional[Selection] = None
+    ) -> TransactionPage:
+        """
+        One page of transactions as projection dicts, continuing after `cursor`,
+        the next_cursor of the previous page. Pages are found by their sort key
+        (sort_by, then id) rather than by offset, so deep pages cost the same as
+        the first and rows written meanwhile are neither skipped nor repeated.
+        """
+        query = TransactionQuery(account_id, filters, sort_by, sort_order)
+        if cursor:
+            query.after = self._decode_cursor(cursor, query.sort_by, query.sort_order)
+        selection = selection or transaction_projection.parse()
+        internal = ("id", sort_by)
+        names = [column.key for column in transaction_projection.columns(selection, *internal)]
+        # One extra row tells whether there is a next page
+        rows = self.db.execute(*query.rows(names, limit=limit + 1)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor([query.sort_by, query.sort_order, getattr(last, sort_by), last.id])
+        items = transaction_projection.to_dicts(self.db, rows, selection, *internal)
+        return TransactionPage(items, next_cursor)
+
+    def iter_transaction_rows(
+        self,
+        account_id: int,
+        sort_by: str = "transaction_date",
+        sort_order: str = "desc",
+        filters: Optional[TransactionFilter] = None,
+        selection: Optional[Selection] = None,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> Iterator[dict]:
+        """Every matching transaction, fetched a page of batch_size at a time"""
+        cursor = None
+        while True:
+            page = self.get_transaction_page(account_id, batch_size, sort_by, sort_order, filters, cursor, selection)
+            yield from page.items
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
+    def count_transactions(self, account_id: int, filters: Optional[TransactionFilter] = None) -> int:
+        """Number of transactions matching the list filters"""
+        count, _ = self.db.execute(*TransactionQuery(account_id, filters).totals()).one()
+        return count
+
+    def get_transaction_counts(
+        self,
+        account_id: int,
+        data_version: int,
+        filters: Optional[TransactionFilter] = None,
+        facets: bool = False,
+        db: Optional[Session] = None
+    ) -> dict:
+        """
+        {"count": n} for the transactions matching the list filters and, with
+        facets, {"facets": {field: [{"value": v, "count": n}, ...]}} counting
+        them by each of FACET_FIELDS with one grouped query per field.
+
+        Results are cached under data_version, the account's transactions_version,
+        so repeated requests cost no query until the account's transactions change.
+        Pass db to query on another session than the service's, e.g. one used
+        from another thread.
+        """
+        query = TransactionQuery(account_id, filters)
+        key = (query.cache_key(), data_version, facets)
+        counts = transaction_count_cache.get(key)
+        if counts is not None:
+            return counts
 
-        # Apply filters if provided
-        if filters:
-            if filters.start_date:
-                query = query.filter(Transaction.transaction_date >= filters.start_date)
-            if filters.end_date:
-                query = query.filter(Transaction.transaction_date <= filters.end_date)
-            if filters.type:
-                query = query.filter(Transaction.type == filters.type)
-            if filters.category_id:
-                query = query.filter(Transaction.category_id == filters.category_id)
-            if filters.budget_id:
-                query = query.filter(Transaction.budget_id == filters.budget_id)
-            if filters.min_amount:
-                query = query.filter(Transaction.amount >= filters.min_amount)
-            if filters.max_amount:
-                query = query.filter(Transaction.amount <= filters.max_amount)
-            if filters.recipient:
-                query = query.filter(Transaction.recipient.ilike(f"%{filters.recipient}%"))
-            if filters.sender:
-                query = query.filter(Transaction.sender.ilike(f"%{filters.sender}%"))
-            if filters.pot_id:
-                query = query.filter(Transaction.pot_id == filters.pot_id)
-
-        # Apply sorting
-        sort_column = getattr(Transaction, sort_by, Transaction.transaction_date)
-        if sort_order.lower() == "desc":
-            query = query.order_by(desc(sort_column))
+        db = db or self.db
+        if facets:
+            by_field = {}
+            for name in FACET_FIELDS:
+                groups = [
+                    {"value": getattr(value, "value", value), "count": count}
+                    for value, count, _ in db.execute(*query.totals(name))
+                ]
+                groups.sort(key=lambda group: group["count"], reverse=True)
+                by_field[name] = groups
+            # Every transaction has a type, so its groups add up to the total
+            counts = {"count": sum(group["count"] for group in by_field["type"]), "facets": by_field}
         else:
-            query = query.order_by(asc(sort_column))
+            count, _ = db.execute(*query.totals()).one()
+            counts = {"count": count}
+        transaction_count_cache.set(key, counts)
+        return counts
 
-        return query.offset(skip).limit(limit).all()
+    @staticmethod
+    def _decode_cursor(cursor: str, sort_by: str, sort_order: str) -> tuple:
+        values = decode_cursor(cursor)
+        if len(values) != 4 or values[:2] != [sort_by, sort_order]:
+            raise HTTPException(status_code=400, detail="Cursor does not match the sort order")
+        value, last_id = values[2:]
+        if sort_by in DATETIME_SORT_FIELDS and value is not None:
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+        return value, last_id
+
+    def _get_running_balances(self, account_id: int, transactions: Sequence) -> dict:
+        account = self.db.get(Account, account_id)
+        return self.ledger_service.get_running_balances(account, transactions)
 
     def get_transaction_by_id(self, transaction_id: int, account_id: int) -> Optional[Transaction]:
         """Get a specific transaction by ID"""
@@ -171,11 +433,14 @@ class TransactionService:
         old_amount = transaction.amount
         old_type = transaction.type
         old_budget_id = transaction.budget_id
+        old_transaction_date = transaction.transaction_date
         
         # Update the transaction with the new data
         update_data = transaction_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(transaction, field, value)
+        if update_data.keys() & {"description", "recipient", "amount", "transaction_date"}:
+            self._flush_unique(transaction)
         
         # If amount or type changed, adjust the balance
         if transaction_data.amount is not None or transaction_data.type is not None:
@@ -188,6 +453,16 @@ class TransactionService:
             # Then apply the new transaction's effect
             self._adjust_account_balance(transaction)
 
+        if (old_transaction_date, old_type, old_amount) != (
+            transaction.transaction_date, transaction.type, transaction.amount
+        ):
+            self.ledger_service.record_transaction(
+                transaction.account_id, old_transaction_date, old_type, old_amount, reverse=True
+            )
+            self.ledger_service.record_transaction(
+                transaction.account_id, transaction.transaction_date, transaction.type, transaction.amount
+            )
+
         # Handle budget updates
         if old_budget_id != transaction.budget_id:
             # If budget changed, revert changes from old budget and update new budget
@@ -206,10 +481,21 @@ class TransactionService:
         else:
             # Same budget, but amount might have changed
             self._update_budget_for_transaction(transaction, is_new=False, old_amount=old_amount)
+
+        # Move the transaction's spend between budget periods if anything that places it changed
+        if (old_budget_id, old_transaction_date, old_type, old_amount) != (
+            transaction.budget_id, transaction.transaction_date, transaction.type, transaction.amount
+        ):
+            self.budget_period_service.record_transaction(
+                old_budget_id, old_transaction_date, old_type, old_amount, reverse=True
+            )
+            self.budget_period_service.record_transaction(
+                transaction.budget_id, transaction.transaction_date, transaction.type, transaction.amount
+            )
         
         transaction.updated_at = datetime.now(timezone.utc)
+        self._touch_account(transaction)
         self.db.commit()
-        self.db.refresh(transaction)
         return transaction
 
     def delete_transaction(self, transaction_id: int, account_id: int) -> bool:
@@ -218,6 +504,13 @@ class TransactionService:
         
         # Revert the account balance changes
         self._revert_account_balance(transaction)
+        self.ledger_service.record_transaction(
+            transaction.account_id,
+            transaction.transaction_date,
+            transaction.type,
+            transaction.amount,
+            reverse=True
+        )
         
         # If transaction was associated with a budget, update the budget amounts
         if transaction.budget_id:
@@ -229,7 +522,15 @@ class TransactionService:
                 is_debit=transaction.type != TransactionType.DEBIT,
                 user_id=transaction.user_id
             )
+            self.budget_period_service.record_transaction(
+                transaction.budget_id,
+                transaction.transaction_date,
+                transaction.type,
+                transaction.amount,
+                reverse=True
+            )
         
+        self._touch_account(transaction)
         self.db.delete(transaction)
         self.db.commit()
         return True
@@ -238,37 +539,67 @@ class TransactionService:
         self,
         account_id: int,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        include_archived: bool = False
     ) -> dict:
-        """Get a summary of transactions for an account"""
-        query = self.db.query(Transaction).filter(Transaction.account_id == account_id)
-        
-        if start_date:
-            query = query.filter(Transaction.transaction_date >= start_date)
-        if end_date:
-            query = query.filter(Transaction.transaction_date <= end_date)
-
-        transactions = query.all()
-        
-        total_income = sum(t.amount for t in transactions if t.type == TransactionType.CREDIT)
-        total_expense = sum(t.amount for t in transactions if t.type == TransactionType.DEBIT)
-        print("total_expense =>", total_expense)
+        """
+        Get a summary of transactions for an account, including archived
+        transactions with include_archived or when the date range reaches back
+        past the archive cutoff
+        """
+        filters = TransactionFilter(start_date=start_date, end_date=end_date, include_archived=include_archived)
+        totals = {
+            transaction_type: (count, amount)
+            for transaction_type, count, amount in self.db.execute(*TransactionQuery(account_id, filters).totals("type"))
+        }
+        total_income = int(totals.get(TransactionType.CREDIT, (0, 0))[1])
+        total_expense = int(totals.get(TransactionType.DEBIT, (0, 0))[1])
         
         return {
-            "total_transactions": len(transactions),
+            "total_transactions": sum(count for count, _ in totals.values()),
             "total_income": total_income,
             "total_expense": total_expense,
             "net_amount": total_income - total_expense
         } 
     
-    def get_transactions_by_budget(self, budget_id: int, account_id: int) -> List[Transaction]:
-        """Get all transactions by budget"""
-        return self.db.query(Transaction).filter(Transaction.budget_id == budget_id, Transaction.account_id == account_id).all()
+    def get_transactions_by_budget(
+        self,
+        budget_id: int,
+        account_id: int,
+        limit: int = 100,
+        sort_by: str = "transaction_date",
+        sort_order: str = "desc",
+        cursor: Optional[str] = None,
+        selection: Optional[Selection] = None
+    ) -> TransactionPage:
+        """Get a page of transactions by budget"""
+        filters = TransactionFilter(budget_id=budget_id)
+        return self.get_transaction_page(account_id, limit, sort_by, sort_order, filters, cursor, selection)
     
-    def get_transactions_by_pot(self, pot_id: int, account_id: int) -> List[Transaction]:
-        """Get all transactions by pot"""
-        return self.db.query(Transaction).filter(Transaction.pot_id == pot_id, Transaction.account_id == account_id).all()
+    def get_transactions_by_pot(
+        self,
+        pot_id: int,
+        account_id: int,
+        limit: int = 100,
+        sort_by: str = "transaction_date",
+        sort_order: str = "desc",
+        cursor: Optional[str] = None,
+        selection: Optional[Selection] = None
+    ) -> TransactionPage:
+        """Get a page of transactions by pot"""
+        filters = TransactionFilter(pot_id=pot_id)
+        return self.get_transaction_page(account_id, limit, sort_by, sort_order, filters, cursor, selection)
     
-    def get_transactions_by_category(self, category_id: int, account_id: int) -> List[Transaction]:
-        """Get all transactions by category"""
-        return self.db.query(Transaction).filter(Transaction.category_id == category_id, Transaction.account_id == account_id).all()
\ No newline at end of file
+    def get_transactions_by_category(
+        self,
+        category_id: int,
+        account_id: int,
+        limit: int = 100,
+        sort_by: str = "transaction_date",
+        sort_order: str = "desc",
+        cursor: Optional[str] = None,
+        selection: Optional[Selection] = None
+    ) -> TransactionPage:
+        """Get a page of transactions by category"""
+        filters = TransactionFilter(category_id=category_id)
+        return self.get_transaction_page(account_id, limit, sort_by, sort_order, filters, cursor, selection)
@@ -1 +1,445 @@
-# Background task examples
\ No newline at end of file
+# Background jobs backed by a persistent outbox table
+import asyncio
+import logging
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from sqlalchemy import and_, event, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from db.models.outbox_job import OutboxJob, OutboxJobStatus
+from db.models.periodic_task_run import PeriodicTaskRun
+from db.models.user import User
+from db.session import SessionLocal
+from db.partitioning import PARTITIONING_RANGE, add_future_partitions
+from core.config import settings
+from core.activation import ActivationService
+from core.deps import get_email_core
+from core.revocation import revocation_store
+from core.idempotency import idempotency_store
+from services.email_service import EmailService
+from services.ledger_service import LedgerService
+from services.transaction_archive_service import TransactionArchiveService
+from services.recurring_transaction_service import RecurringTransactionService
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], Session]
+JobHandler = Callable[[Dict[str, Any], SessionFactory], Awaitable[None]]
+PeriodicTask = Callable[[Session], None]
+
+def _utcnow() -> datetime:
+    """Naive UTC now, matching how the outbox columns are stored"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+class JobQueue:
+    """
+    In-process async job queue.
+
+    Jobs are written to the outbox_jobs table in the caller's database transaction,
+    so a job exists if and only if the write that produced it was committed. A worker
+    task started from the app lifespan claims due jobs, runs their handlers with a
+    bounded concurrency and retries failures with exponential backoff.
+
+    Periodic tasks (maintenance such as purges) are run by the same worker on a
+    fixed interval. Their schedule lives in the periodic_task_runs table: a worker
+    runs a task only after taking its lease there, and records when the run
+    finished, so each run happens on one worker however many are started and a
+    restart does not run every task again.
+
+    Handlers get the job's payload and the session factory the queue runs with,
+    for any database work of their own.
+
+    Database work never runs on the event loop: claiming jobs, recording each
+    job's outcome and every periodic task run in the threadpool, each with a
+    session of its own, so one job's commit or rollback cannot affect another.
+    """
+
+    def __init__(
+        self,
+        session_factory: SessionFactory = SessionLocal,
+        concurrency: int = 4,
+        poll_interval: float = 5.0,
+        batch_size: int = 20,
+        base_delay: float = 2.0,
+        max_delay: float = 600.0,
+        lock_timeout: float = 600.0
+    ):
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lock_timeout = lock_timeout
+        self.handlers: Dict[str, JobHandler] = {}
+        self.periodic_tasks: Dict[str, tuple[float, PeriodicTask]] = {}
+        # Identifies this queue's periodic task leases
+        self.owner = uuid.uuid4().hex
+        self._next_periodic_run: Dict[str, float] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def register(self, job_type: str) -> Callable[[JobHandler], JobHandler]:
+        """Register an async handler for a job type"""
+        def decorator(handler: JobHandler) -> JobHandler:
+            self.handlers[job_type] = handler
+            return handler
+        return decorator
+
+    def periodic(self, name: str, interval: float) -> Callable[[PeriodicTask], PeriodicTask]:
+        """Register a task run in the threadpool by the worker every `interval` seconds"""
+        def decorator(task: PeriodicTask) -> PeriodicTask:
+            self.periodic_tasks[name] = (interval, task)
+            return task
+        return decorator
+
+    def enqueue(
+        self,
+        db: Session,
+        job_type: str,
+        payload: Dict[str, Any],
+        max_attempts: int = 5,
+        delay: Optional[timedelta] = None
+    ) -> OutboxJob:
+        """
+        Add a job to the outbox. The caller is responsible for committing;
+        the worker is woken as soon as the session commits.
+        """
+        if job_type not in self.handlers:
+            raise ValueError(f"No handler registered for job type '{job_type}'")
+
+        job = OutboxJob(
+            job_type=job_type,
+            payload=payload,
+            status=OutboxJobStatus.PENDING,
+            attempts=0,
+            max_attempts=max_attempts,
+            next_attempt_at=_utcnow() + (delay or timedelta())
+        )
+        db.add(job)
+        db.flush()
+        event.listen(db, "after_commit", lambda session: self.notify(), once=True)
+        return job
+
+    def notify(self) -> None:
+        """Wake the worker so newly committed jobs are picked up without waiting for the next poll"""
+        if self._loop and self._wakeup and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def start(self) -> None:
+        """Start the worker task on the running event loop"""
+        if self._worker:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._worker = asyncio.create_task(self._run())
+        logger.info("Background job worker started")
+
+    async def stop(self) -> None:
+        """Stop the worker task. Jobs left RUNNING are reclaimed once their lock expires."""
+        if not self._worker:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        self._wakeup = None
+        self._loop = None
+        self._next_periodic_run.clear()
+        logger.info("Background job worker stopped")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self.run_pending()
+            except Exception as e:
+                logger.error(f"Background job worker error: {e}")
+                processed = 0
+            await self.run_periodic()
+
+            # A full batch means more jobs are probably due, so go again straight away
+            if processed >= self.batch_size:
+                continue
+            try:
+                timeout = self.poll_interval
+                if self._next_periodic_run:
+                    next_periodic = min(self._next_periodic_run.values()) - self._loop.time()
+                    timeout = max(0.0, min(timeout, next_periodic))
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def run_pending(self, session_factory: Optional[SessionFactory] = None) -> int:
+        """
+        Claim and run every due job once.
+
+        Args:
+            session_factory: Creates the sessions to use; defaults to the queue's
+
+        Returns:
+            Number of jobs that were run
+        """
+        session_factory = session_factory or self.session_factory
+        jobs = await run_in_threadpool(self._claim_due_jobs, session_factory)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(*(self._execute(session_factory, job, semaphore) for job in jobs))
+        return len(jobs)
+
+    async def run_periodic(self, force: bool = False) -> None:
+        """
+        Run the periodic tasks that are due and whose lease this worker takes,
+        or with force every task whose lease is free
+        """
+        now = asyncio.get_running_loop().time()
+        for name, (interval, task) in self.periodic_tasks.items():
+            if not force and self._next_periodic_run.get(name, now) > now:
+                continue
+            try:
+                due_in = await run_in_threadpool(self._run_periodic_task, name, interval, task, force)
+            except Exception as e:
+                logger.error(f"Periodic task {name} failed: {e}")
+                due_in = interval
+            self._next_periodic_run[name] = now + due_in
+
+    def _run_periodic_task(self, name: str, interval: float, task: PeriodicTask, force: bool) -> float:
+        """Run a task if its lease is taken; returns the seconds until it is next due"""
+        due_in = self._claim_periodic_task(name, interval, force)
+        if due_in > 0:
+            return due_in
+        db = self.session_factory()
+        try:
+            task(db)
+        finally:
+            db.close()
+            self._release_periodic_task(name)
+        return interval
+
+    def _claim_periodic_task(self, name: str, interval: float, force: bool) -> float:
+        """
+        Take the lease of a task whose interval has passed since its last run, or
+        with force of any task, unless another worker holds it. The conditional
+        UPDATE stops two workers taking the same lease. Returns 0 when it is taken,
+        otherwise the seconds until the task is due or its lease expires.
+        """
+        now = _utcnow()
+        lease_free = or_(PeriodicTaskRun.locked_until.is_(None), PeriodicTaskRun.locked_until < now)
+        due = or_(PeriodicTaskRun.last_run_at.is_(None), PeriodicTaskRun.last_run_at <= now - timedelta(seconds=interval))
+        lease = {
+            PeriodicTaskRun.locked_until: now + timedelta(seconds=self.lock_timeout),
+            PeriodicTaskRun.locked_by: self.owner
+        }
+        db = self.session_factory()
+        try:
+            query = db.query(PeriodicTaskRun).filter(PeriodicTaskRun.name == name)
+            if query.filter(lease_free if force else and_(lease_free, due)).update(lease, synchronize_session=False):
+                db.commit()
+                return 0.0
+
+            run = query.first()
+            if run is None:
+                try:
+                    with db.begin_nested():
+                        db.add(PeriodicTaskRun(name=name, locked_until=lease[PeriodicTaskRun.locked_until], locked_by=self.owner))
+                    db.commit()
+                    return 0.0
+                except IntegrityError:
+                    # Another worker ran the task first; look again on the next poll
+                    db.commit()
+                    return self.poll_interval
+            due_at = run.last_run_at + timedelta(seconds=interval) if run.last_run_at else now
+            if run.locked_until is not None and run.locked_until >= now:
+                due_at = max(due_at, run.locked_until)
+            db.commit()
+            return max((due_at - now).total_seconds(), self.poll_interval)
+        finally:
+            db.close()
+
+    def _release_periodic_task(self, name: str) -> None:
+        """Record the end of this worker's run of a task and give up its lease"""
+        db = self.session_factory()
+        try:
+            db.query(PeriodicTaskRun).filter(
+                PeriodicTaskRun.name == name,
+                PeriodicTaskRun.locked_by == self.owner
+            ).update(
+                {PeriodicTaskRun.last_run_at: _utcnow(), PeriodicTaskRun.locked_until: None, PeriodicTaskRun.locked_by: None},
+                synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def purge_finished(self, db: Session, older_than: timedelta) -> int:
+        """
+        Delete the succeeded and failed jobs last due more than older_than ago.
+        The (status, next_attempt_at) index serves the delete.
+        """
+        deleted = db.query(OutboxJob).filter(
+            OutboxJob.status.in_((OutboxJobStatus.SUCCEEDED, OutboxJobStatus.FAILED)),
+            OutboxJob.next_attempt_at < _utcnow() - older_than
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    def _claim_due_jobs(self, session_factory: SessionFactory) -> List[OutboxJob]:
+        """
+        Mark due jobs as RUNNING; the conditional UPDATE stops two workers claiming
+        the same job. The returned jobs are detached from the session used here.
+        """
+        now = _utcnow()
+        stale_before = now - timedelta(seconds=self.lock_timeout)
+        claimable = or_(
+            and_(OutboxJob.status == OutboxJobStatus.PENDING, OutboxJob.next_attempt_at <= now),
+            and_(OutboxJob.status == OutboxJobStatus.RUNNING, OutboxJob.locked_at < stale_before)
+        )
+        db = session_factory()
+        try:
+            candidate_ids = [
+                job_id for (job_id,) in (
+                    db.query(OutboxJob.id)
+                    .filter(claimable)
+                    .order_by(OutboxJob.next_attempt_at)
+                    .limit(self.batch_size)
+                    .all()
+                )
+            ]
+
+            claimed_ids = []
+            for job_id in candidate_ids:
+                claimed = (
+                    db.query(OutboxJob)
+                    .filter(OutboxJob.id == job_id, claimable)
+                    .update(
+                        {OutboxJob.status: OutboxJobStatus.RUNNING, OutboxJob.locked_at: now},
+                        synchronize_session=False
+                    )
+                )
+                if claimed:
+                    claimed_ids.append(job_id)
+            db.commit()
+
+            if not claimed_ids:
+                return []
+            jobs = (
+                db.query(OutboxJob)
+                .populate_existing()
+                .filter(OutboxJob.id.in_(claimed_ids))
+                .all()
+            )
+            db.expunge_all()
+            return jobs
+        finally:
+            db.close()
+
+    async def _execute(self, session_factory: SessionFactory, job: OutboxJob, semaphore: asyncio.Semaphore) -> None:
+        handler = self.handlers.get(job.job_type)
+        error = None
+        async with semaphore:
+            try:
+                if handler is None:
+                    raise LookupError(f"No handler registered for job type '{job.job_type}'")
+                await handler(job.payload, session_factory)
+            except Exception as e:
+                error = e
+        await run_in_threadpool(self._record_outcome, session_factory, job.id, error)
+
+    def _record_outcome(self, session_factory: SessionFactory, job_id: int, error: Optional[Exception]) -> None:
+        db = session_factory()
+        try:
+            job = db.get(OutboxJob, job_id)
+            job.attempts += 1
+            if error is not None:
+                self._record_failure(job, error)
+            else:
+                job.status = OutboxJobStatus.SUCCEEDED
+                job.last_error = None
+            job.locked_at = None
+            db.commit()
+        finally:
+            db.close()
+
+    def _record_failure(self, job: OutboxJob, error: Exception) -> None:
+        job.last_error = str(error)
+        if job.attempts >= job.max_attempts:
+            job.status = OutboxJobStatus.FAILED
+            logger.error(f"Job {job.id} ({job.job_type}) failed permanently after {job.attempts} attempts: {error}")
+            return
+
+        # Exponential backoff with jitter so failing jobs don't retry in lockstep
+        delay = min(self.max_delay, self.base_delay * 2 ** (job.attempts - 1))
+        delay *= random.uniform(0.5, 1.0)
+        job.status = OutboxJobStatus.PENDING
+        job.next_attempt_at = _utcnow() + timedelta(seconds=delay)
+        logger.warning(f"Job {job.id} ({job.job_type}) failed on attempt {job.attempts}, retrying in {delay:.1f}s: {error}")
+
+job_queue = JobQueue(
+    concurrency=settings.BACKGROUND_JOBS_CONCURRENCY,
+    poll_interval=settings.BACKGROUND_JOBS_POLL_INTERVAL
+)
+
+SEND_ACTIVATION_EMAIL = "send_activation_email"
+
+@job_queue.register(SEND_ACTIVATION_EMAIL)
+async def send_activation_email(payload: Dict[str, Any], session_factory: SessionFactory) -> None:
+    # The payload only holds the user id, so outbox rows never contain a usable
+    # token; each attempt mints a fresh one, replacing any unused earlier token
+    email_data = await run_in_threadpool(_mint_activation_token, session_factory, payload["user_id"])
+    if email_data is not None:
+        await EmailService(get_email_core()).send_activation_email(**email_data)
+
+def _mint_activation_token(session_factory: SessionFactory, user_id: int) -> Optional[Dict[str, str]]:
+    """The activation email's fields, or None once the user is gone or activated"""
+    db = session_factory()
+    try:
+        user = db.get(User, user_id)
+        if user is None or user.is_activated:
+            return None
+        activation_token = ActivationService.create_activation_token(db, user)
+        return {"email": user.email, "username": user.username, "activation_token": activation_token.token}
+    finally:
+        db.close()
+
+@job_queue.periodic("purge_finished_jobs", interval=3600)
+def purge_finished_jobs(db: Session) -> None:
+    deleted = job_queue.purge_finished(db, timedelta(days=settings.BACKGROUND_JOBS_RETENTION_DAYS))
+    logger.info(f"Purged {deleted} finished background jobs")
+
+@job_queue.periodic("purge_expired_tokens", interval=3600)
+def purge_expired_tokens(db: Session) -> None:
+    deleted = revocation_store.purge_expired(db)
+    logger.info(f"Purged {deleted} expired token rows")
+
+@job_queue.periodic("purge_expired_idempotency_keys", interval=3600)
+def purge_expired_idempotency_keys(db: Session) -> None:
+    deleted = idempotency_store.purge_expired(db)
+    logger.info(f"Purged {deleted} expired idempotency keys")
+
+@job_queue.periodic("reconcile_account_balances", interval=86400)
+def reconcile_account_balances(db: Session) -> None:
+    drifts = LedgerService(db).reconcile()
+    logger.info(f"Reconciled account balances, {len(drifts)} accounts drift from their ledger")
+
+@job_queue.periodic("archive_old_transactions", interval=86400)
+def archive_old_transactions(db: Session) -> None:
+    # Does nothing unless TRANSACTION_ARCHIVE_AFTER_MONTHS is set
+    TransactionArchiveService(db).archive()
+
+@job_queue.periodic("post_recurring_transactions", interval=300)
+def post_recurring_transactions(db: Session) -> None:
+    # Each batch also locks the rules it posts, so a run outliving its lease is safe
+    RecurringTransactionService(db).post_due()
+
+@job_queue.periodic("add_transaction_partitions", interval=86400)
+def add_transaction_partitions(db: Session) -> None:
+    # Only RANGE partitioned MySQL tables need new partitions as months go by
+    if settings.TRANSACTIONS_PARTITIONING != PARTITIONING_RANGE or db.get_bind().dialect.name != "mysql":
+        return
+    added = add_future_partitions(db.connection(), settings.TRANSACTIONS_PARTITION_MONTHS_AHEAD)
+    logger.info(f"Added {added} monthly transaction partitions")
@@ -1,18 +1,29 @@
 import pytest
 import os
 from datetime import datetime, timezone, timedelta
+
+# Tests drive background jobs explicitly through job_queue.run_pending
+os.environ.setdefault("BACKGROUND_JOBS_ENABLED", "false")
+# The app's startup warm-up would connect to DB_URL rather than the test database
+os.environ.setdefault("DB_POOL_WARM_CONNECTIONS", "0")
+# The background revocation sync would also read DB_URL; checks sync inline instead
+os.environ.setdefault("TOKEN_REVOCATION_BACKGROUND_SYNC", "false")
+# Rate limiting is covered by its own tests; the suite makes many requests from one client
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from main import app
 from db.base import Base
-from db.session import get_db
+from db.session import get_db, get_session_factory
 from core.config import settings
 from core.security import get_password_hash
+from core.login_throttle import login_throttle
+from services.transaction_query import transaction_count_cache
 
 # Test configuration
-TEST_JWT_SECRET = "test_secret_key_for_testing_123456789"
 DATABASE_URL = settings.TEST_DB_URL
 
 # Create test engine
@@ -30,12 +41,8 @@ TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engin
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_env():
-    """Setup test environment variables"""
-    os.environ["JWT_SECRET_KEY"] = TEST_JWT_SECRET
+    """Clean up the test database at the end of the session"""
     yield
-    # Clean up if needed
-    if "JWT_SECRET_KEY" in os.environ:
-        del os.environ["JWT_SECRET_KEY"]
     # Clean up database at the end of test session
     Base.metadata.drop_all(bind=engine)
 
@@ -46,6 +53,8 @@ def db_session():
     connection = engine.connect()
     transaction = connection.begin()
     session = TestingSessionLocal(bind=connection)
+    # Rolled back rows reuse ids and data versions, so cached counts would carry over
+    transaction_count_cache.clear()
 
     try:
         yield session
@@ -55,7 +64,46 @@ def db_session():
         connection.close()
 
 @pytest.fixture(scope="function")
-def client(db_session):
+def session_factory(db_session):
+    """Creates further sessions on db_session's connection, for code that opens its own"""
+    return lambda: TestingSessionLocal(bind=db_session.get_bind())
+
+@pytest.fixture(scope="function")
+def query_counter(db_session):
+    """Record the SQL statements executed and the commits made on db_session.
+    Use counter.reset() once fixtures are set up to measure only the code under test."""
+    class QueryCounter:
+        def __init__(self):
+            self.reset()
+
+        def reset(self):
+            self.statements = []
+            self.commits = 0
+
+        @property
+        def count(self):
+            return len(self.statements)
+
+    counter = QueryCounter()
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        counter.statements.append(statement)
+
+    def on_commit(session):
+        # Releasing a savepoint is not a commit
+        if not session.in_nested_transaction():
+            counter.commits += 1
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    event.listen(db_session, "after_commit", on_commit)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+        event.remove(db_session, "after_commit", on_commit)
+
+@pytest.fixture(scope="function")
+def client(db_session, session_factory):
     def override_get_db():
         try:
             yield db_session
@@ -63,6 +111,8 @@ def client(db_session):
             pass  # Session cleanup is handled by db_session fixture
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    login_throttle.clear()
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -92,12 +142,12 @@ def test_user(db_session):
 @pytest.fixture(scope="function")
 def test_access_token(test_user):
     from core.jwt import create_access_token
-    # Create a token that expires far in the future for testing
+    # Create a token that expires far in the future for testing, signed with
+    # the JWT_SECRET_KEY the app verifies tokens with
     expires_delta = timedelta(hours=1)
     access_token = create_access_token(
         data={"sub": test_user.email},
-        expires_delta=expires_delta,
-        secret_key=TEST_JWT_SECRET
+        expires_delta=expires_delta
     )
     return access_token
 
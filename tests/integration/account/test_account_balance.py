@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+from fastapi import status
+
+def _post(client, auth_headers, amount, transaction_type, transaction_date):
+    response = client.post("/api/v1/transactions/", json={
+        "description": f"Entry {amount}",
+        "recipient": "Someone",
+        "amount": amount,
+        "type": transaction_type,
+        "transaction_date": transaction_date
+    }, headers=auth_headers)
+    assert response.status_code == status.HTTP_201_CREATED
+
+def test_get_balance_at_date(client, auth_headers):
+    _post(client, auth_headers, 800, "CREDIT", "2026-01-10T10:00:00Z")
+    _post(client, auth_headers, 300, "DEBIT", "2026-02-05T10:00:00Z")
+
+    response = client.get("/api/v1/accounts/me/balance?at=2026-01-31T00:00:00Z", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["data"]["balance"] == 800
+
+    response = client.get("/api/v1/accounts/me/balance", headers=auth_headers)
+    assert response.json()["data"]["balance"] == 500
+
+def test_get_transactions_with_running_balance(client, auth_headers):
+    _post(client, auth_headers, 800, "CREDIT", "2026-01-10T10:00:00Z")
+    _post(client, auth_headers, 300, "DEBIT", "2026-02-05T10:00:00Z")
+
+    response = client.get("/api/v1/transactions/?running_balance=true&sort_order=asc", headers=auth_headers)
+    assert [t["running_balance"] for t in response.json()["data"]] == [800, 500]
+
+    response = client.get("/api/v1/transactions/", headers=auth_headers)
+    assert all("running_balance" not in t for t in response.json()["data"])
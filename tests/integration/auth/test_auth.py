@@ -1,4 +1,6 @@
+import asyncio
 from fastapi import status
+from tasks.background_jobs import job_queue
 
 def test_login_success(client, test_user):
     response = client.post(
@@ -33,7 +35,7 @@ def test_protected_route_with_token(client, test_user, test_access_token):
     data = response.json()
     assert data["email"] == test_user.email
 
-def test_register_success(client, mocker):
+def test_register_success(client, db_session, session_factory, mocker):
     # Mock the email service
     mock_email_service = mocker.patch('services.email_service.EmailService.send_activation_email')
     
@@ -53,7 +55,9 @@ def test_register_success(client, mocker):
     assert data["data"]["email"] == "newuser@example.com"
     assert data["data"]["username"] == "newuser"
     
-    # Verify the email service was called
+    # The activation email is sent by the background job worker, not the request
+    mock_email_service.assert_not_called()
+    asyncio.run(job_queue.run_pending(session_factory))
     mock_email_service.assert_called_once()
 
 
@@ -77,4 +81,89 @@ def test_login_flow(client, test_user):
     )
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
-    assert data["email"] == test_user.email 
\ No newline at end of file
+    assert data["email"] == test_user.email 
+
+def _login(client, test_user):
+    response = client.post(
+        "/api/v1/auth/login",
+        json={
+            "email": test_user.email,
+            "password": "testpassword123"
+        }
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()["data"]
+
+def test_login_reuses_session_row_and_revokes_previous_tokens(client, db_session, test_user):
+    from db.models.user_auth import UserAuth
+
+    first = _login(client, test_user)
+    second = _login(client, test_user)
+
+    assert db_session.query(UserAuth).filter_by(user_id=test_user.id).count() == 1
+    response = client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {first['access_token']}"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    response = client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {second['access_token']}"})
+    assert response.status_code == status.HTTP_200_OK
+
+def test_refresh_token_rotation_and_reuse_detection(client, test_user):
+    tokens = _login(client, test_user)
+
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == status.HTTP_200_OK
+    rotated = response.json()["data"]
+
+    # Reusing the old refresh token revokes the whole family
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": rotated["refresh_token"]})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    response = client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {rotated['access_token']}"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_logout_revokes_access_token(client, test_user):
+    tokens = _login(client, test_user)
+
+    response = client.post("/api/v1/auth/logout", json={"access_token": tokens["access_token"]})
+    assert response.status_code == status.HTTP_200_OK
+
+    response = client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    response = client.post("/api/v1/auth/validate-token", json={"access_token": tokens["access_token"]})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_login_locked_out_before_password_check(client, test_user, mocker):
+    for _ in range(5):
+        response = client.post("/api/v1/auth/login", json={"email": test_user.email, "password": "wrongpassword"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    verify = mocker.patch("services.auth_service.verify_password")
+    response = client.post("/api/v1/auth/login", json={"email": test_user.email, "password": "testpassword123"})
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["Retry-After"]) > 0
+    verify.assert_not_called()
+
+def test_refresh_token_from_before_token_families(client, db_session, test_user):
+    from datetime import datetime, timedelta
+    from core.jwt import create_refresh_token
+    from db.models.user_auth import UserAuth
+
+    # A migrated session row keeps the login's original refresh token
+    legacy_token = create_refresh_token(data={"sub": test_user.email})
+    db_session.add(UserAuth(
+        user_id=test_user.id,
+        token_family="legacy-family",
+        refresh_jti="",
+        refresh_token=legacy_token,
+        expires_at=datetime.utcnow() + timedelta(days=7)
+    ))
+    db_session.commit()
+
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": legacy_token})
+    assert response.status_code == status.HTTP_200_OK
+    # It is only accepted once
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": legacy_token})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -115,4 +115,30 @@ def test_unauthorized_access(client, test_budget):
     for method, endpoint in endpoints:
         response = client.request(method, endpoint)
         # Accept either 401 Unauthorized or 403 Forbidden as both indicate auth failure
-        assert response.status_code in [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN] 
\ No newline at end of file
+        assert response.status_code in [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN] 
+def test_get_current_budget_period(client, auth_headers, test_budget):
+    response = client.get(f"/api/v1/budgets/{test_budget.id}/periods/current", headers=auth_headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    period = response.json()["data"]
+    assert period["budget_id"] == test_budget.id
+    assert period["spent_amount"] == 0
+    assert period["remaining_amount"] == test_budget.total_amount
+
+def test_get_current_budget_period_not_found(client, auth_headers):
+    response = client.get("/api/v1/budgets/999/periods/current", headers=auth_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+def test_get_budgets_fields_and_expand(client, auth_headers, test_budget):
+    response = client.get("/api/v1/budgets/?fields=name,total_amount", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    budgets = response.json()["data"]
+    assert budgets == [{"id": test_budget.id, "name": test_budget.name, "total_amount": test_budget.total_amount}]
+
+    response = client.get("/api/v1/budgets/?fields=name&expand=category", headers=auth_headers)
+    budget = response.json()["data"][0]
+    assert set(budget) == {"id", "name", "category"}
+    assert budget["category"]["id"] == test_budget.category_id
+
+    response = client.get("/api/v1/budgets/?fields=transactions", headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -30,6 +30,18 @@ def test_get_categories(client, auth_headers):
     assert any(cat["name"] == "Test Category 1" for cat in categories)
     assert any(cat["name"] == "Test Category 2" for cat in categories)
 
+def test_get_categories_fields(client, auth_headers):
+    client.post("/api/v1/categories/", headers=auth_headers, json={"name": "Groceries", "color": "#00ff00"})
+
+    response = client.get("/api/v1/categories/?fields=name,color", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    categories = response.json()["data"]
+    assert [set(cat) for cat in categories] == [{"id", "name", "color"}]
+    assert categories[0]["color"] == "#00ff00"
+
+    response = client.get("/api/v1/categories/?fields=budgets", headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
 def test_create_category(client, auth_headers):
     response = client.post(
         "/api/v1/categories/",
@@ -134,4 +146,14 @@ def test_delete_non_existent_category(client, auth_headers):
     )
     assert response.status_code == status.HTTP_404_NOT_FOUND
     data = response.json()
-    assert data["detail"] == "Category not found" 
\ No newline at end of file
+    assert data["detail"] == "Category not found" 
+def test_get_category_stats(client, auth_headers, test_transaction_data):
+    client.post("/api/v1/transactions/", headers=auth_headers, json=test_transaction_data)
+
+    response = client.get("/api/v1/categories/stats", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    stats = {s["category_id"]: s for s in response.json()["data"]}
+    category_stats = stats[test_transaction_data["category_id"]]
+    assert category_stats["transaction_count"] == 1
+    assert category_stats["total_debit"] == test_transaction_data["amount"]
+    assert category_stats["total_credit"] == 0
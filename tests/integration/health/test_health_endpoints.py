@@ -0,0 +1,44 @@
+import time
+from fastapi import status
+from api.v1.endpoints import health
+from core.health import readiness
+
+def test_liveness(client):
+    response = client.get("/healthz")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"status": "ok"}
+
+def test_readiness(client):
+    response = client.get("/readyz")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"status": "ready"}
+
+def test_not_ready_while_warming_up(client):
+    readiness.mark_not_ready()
+    try:
+        response = client.get("/readyz")
+    finally:
+        readiness.mark_ready()
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+def test_not_ready_without_database(client, monkeypatch):
+    def unreachable(session_factory):
+        raise ConnectionError("database is down")
+    monkeypatch.setattr(health, "check_database", unreachable)
+
+    response = client.get("/readyz")
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json()["detail"] == "Database unavailable"
+
+def test_readiness_times_out(client, monkeypatch):
+    monkeypatch.setattr(health.settings, "READINESS_DB_TIMEOUT", 0.01)
+    monkeypatch.setattr(health, "check_database", lambda session_factory: time.sleep(0.2))
+
+    response = client.get("/readyz")
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json()["detail"] == "Database check timed out"
@@ -29,6 +29,12 @@ def test_get_pots(client, auth_headers, test_pot):
     assert pots[0]["id"] == test_pot.id
     assert pots[0]["name"] == test_pot.name
 
+def test_get_pots_fields(client, auth_headers, test_pot):
+    response = client.get("/api/v1/pots/?fields=saved_amount", headers=auth_headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["data"] == [{"id": test_pot.id, "saved_amount": test_pot.saved_amount}]
+
 def test_get_pot_by_id(client, auth_headers, test_pot):
     response = client.get(f"/api/v1/pots/{test_pot.id}", headers=auth_headers)
     
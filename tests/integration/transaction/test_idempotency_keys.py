@@ -0,0 +1,64 @@
+import pytest
+from fastapi import status
+from core.idempotency import idempotency_store, REPLAYED_HEADER
+from db.models.idempotency_key import IdempotencyKey
+from db.models.transaction import Transaction
+
+@pytest.fixture(autouse=True)
+def clear_idempotency_cache():
+    idempotency_store.clear()
+    yield
+    idempotency_store.clear()
+
+def test_create_transaction_retry_is_replayed(client, db_session, auth_headers, test_transaction_data):
+    headers = {**auth_headers, "Idempotency-Key": "retry-1"}
+    first = client.post("/api/v1/transactions/", json=test_transaction_data, headers=headers)
+    assert first.status_code == status.HTTP_201_CREATED
+
+    retry = client.post("/api/v1/transactions/", json=test_transaction_data, headers=headers)
+    assert retry.status_code == status.HTTP_201_CREATED
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.json() == first.json()
+    assert db_session.query(Transaction).count() == 1
+
+def test_retry_is_replayed_from_database(client, db_session, auth_headers, test_transaction_data, query_counter):
+    headers = {**auth_headers, "Idempotency-Key": "retry-2"}
+    first = client.post("/api/v1/transactions/", json=test_transaction_data, headers=headers)
+    # Another worker would not have the response cached
+    idempotency_store.clear()
+    query_counter.reset()
+
+    retry = client.post("/api/v1/transactions/", json=test_transaction_data, headers=headers)
+    assert retry.json() == first.json()
+    assert query_counter.commits == 0
+    assert not any(s.lstrip().startswith(("INSERT", "UPDATE")) for s in query_counter.statements)
+
+def test_key_reused_for_different_request(client, auth_headers, test_transaction_data):
+    headers = {**auth_headers, "Idempotency-Key": "retry-3"}
+    client.post("/api/v1/transactions/", json=test_transaction_data, headers=headers)
+
+    response = client.post(
+        "/api/v1/transactions/",
+        json={**test_transaction_data, "amount": 5},
+        headers=headers
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+def test_pot_update_saved_amount_retry_is_replayed(client, db_session, auth_headers, test_pot):
+    headers = {**auth_headers, "Idempotency-Key": "deposit-1"}
+    payload = {"amount": 200, "reason": "Saving"}
+    url = f"/api/v1/pots/{test_pot.id}/update-saved-amount"
+
+    first = client.patch(url, json=payload, headers=headers)
+    retry = client.patch(url, json=payload, headers=headers)
+
+    assert first.status_code == status.HTTP_200_OK
+    assert retry.json() == first.json()
+    db_session.refresh(test_pot)
+    assert test_pot.saved_amount == 200
+    assert db_session.query(IdempotencyKey).count() == 1
+
+def test_requests_without_key_are_not_stored(client, db_session, auth_headers, test_transaction_data):
+    response = client.post("/api/v1/transactions/", json=test_transaction_data, headers=auth_headers)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert db_session.query(IdempotencyKey).count() == 0
@@ -1,3 +1,4 @@
+import json
 import pytest
 from datetime import datetime, timezone, timedelta
 from fastapi import status
@@ -392,4 +393,118 @@ def test_delete_transaction_with_account_update(client, auth_headers, test_accou
     )
     assert account_response.status_code == status.HTTP_200_OK
     account_data = account_response.json()["data"]
-    assert account_data["balance"] == initial_balance 
\ No newline at end of file
+    assert account_data["balance"] == initial_balance 
+def test_get_transactions_matches_model_serialization(client, db_session, auth_headers, test_transaction_data):
+    from schemas.common import ListResponseModel
+    from schemas.transaction import Transaction as TransactionSchema
+    from services.transaction_service import TransactionService
+
+    client.post("/api/v1/transactions/", json=test_transaction_data, headers=auth_headers)
+    client.post("/api/v1/transactions/", json={**test_transaction_data, "amount": 7, "pot_id": None}, headers=auth_headers)
+
+    response = client.get("/api/v1/transactions/", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    transactions = TransactionService(db_session).get_transactions(account_id=test_transaction_data["account_id"])
+    expected = ListResponseModel[TransactionSchema](
+        data=transactions,
+        message="Transactions fetched successfully"
+    ).model_dump(mode="json")
+    assert response.json() == expected
+
+def test_get_transactions_expand(client, auth_headers, test_transaction_data):
+    client.post("/api/v1/transactions/", json=test_transaction_data, headers=auth_headers)
+
+    response = client.get("/api/v1/transactions/?expand=", headers=auth_headers)
+    transaction = response.json()["data"][0]
+    assert "budget" not in transaction and "pot" not in transaction
+    assert transaction["budget_id"] == test_transaction_data["budget_id"]
+
+    response = client.get("/api/v1/transactions/?expand=pot", headers=auth_headers)
+    transaction = response.json()["data"][0]
+    assert transaction["pot"]["id"] == test_transaction_data["pot_id"]
+    assert "budget" not in transaction
+
+    response = client.get("/api/v1/transactions/?expand=category", headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+def test_get_transactions_fields(client, auth_headers, test_transaction_data):
+    client.post("/api/v1/transactions/", json=test_transaction_data, headers=auth_headers)
+
+    response = client.get("/api/v1/transactions/?fields=amount,description&expand=budget", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    transaction = response.json()["data"][0]
+    assert set(transaction) == {"id", "amount", "description", "budget"}
+    assert transaction["budget"]["id"] == test_transaction_data["budget_id"]
+
+    response = client.get("/api/v1/transactions/?fields=amount&running_balance=true", headers=auth_headers)
+    transaction = response.json()["data"][0]
+    assert set(transaction) == {"id", "amount", "running_balance", "budget", "pot"}
+    assert transaction["running_balance"] is not None
+
+    response = client.get("/api/v1/transactions/?fields=amount,account", headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+def test_get_transactions_by_budget_pages(client, auth_headers, test_transaction_data):
+    for amount in (100, 200, 300):
+        client.post(
+            "/api/v1/transactions/",
+            json={**test_transaction_data, "amount": amount, "description": f"Groceries {amount}"},
+            headers=auth_headers
+        )
+    url = f"/api/v1/transactions/budgets/{test_transaction_data['budget_id']}"
+
+    response = client.get(f"{url}?limit=2&sort_by=amount&sort_order=asc&fields=amount&expand=", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    page = response.json()
+    assert [item["amount"] for item in page["data"]] == [100, 200]
+    assert page["next_cursor"]
+
+    response = client.get(
+        f"{url}?limit=2&sort_by=amount&sort_order=asc&fields=amount&expand=&cursor={page['next_cursor']}",
+        headers=auth_headers
+    )
+    page = response.json()
+    assert [item["amount"] for item in page["data"]] == [300]
+    assert page["next_cursor"] is None
+
+    response = client.get(f"{url}?stream=true&sort_by=amount&fields=amount&expand=", headers=auth_headers)
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["amount"] for line in response.text.splitlines()] == [300, 200, 100]
+
+    response = client.get(f"{url}?sort_by=description", headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = client.get(f"{url}?cursor=not-a-cursor", headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+def test_get_transactions_include_counts(client, auth_headers, test_transaction_data):
+    for amount, transaction_type in ((100, "DEBIT"), (200, "DEBIT"), (300, "CREDIT")):
+        client.post(
+            "/api/v1/transactions/",
+            json={**test_transaction_data, "amount": amount, "type": transaction_type, "description": f"Item {amount}"},
+            headers=auth_headers
+        )
+
+    response = client.get("/api/v1/transactions/?limit=1&include=count,facets", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert len(body["data"]) == 1
+    assert body["count"] == 3
+    assert body["facets"]["type"] == [{"value": "DEBIT", "count": 2}, {"value": "CREDIT", "count": 1}]
+    assert body["facets"]["budget_id"] == [{"value": test_transaction_data["budget_id"], "count": 3}]
+
+    response = client.get("/api/v1/transactions/?type=DEBIT&include=count", headers=auth_headers)
+    assert response.json()["count"] == 2
+    assert "facets" not in response.json()
+
+    # A write moves the account to a new data version, so the cached count is not reused
+    client.post(
+        "/api/v1/transactions/",
+        json={**test_transaction_data, "amount": 400, "description": "Item 400"},
+        headers=auth_headers
+    )
+    response = client.get("/api/v1/transactions/?type=DEBIT&include=count", headers=auth_headers)
+    assert response.json()["count"] == 3
+
+    response = client.get("/api/v1/transactions/?include=total", headers=auth_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+from db.models.transaction import Transaction
+from schemas.transaction import TransactionCreate, TransactionType
+from services.pot_service import PotService
+from services.transaction_service import TransactionService
+
+# Statement budget for writing one budget-linked transaction: the fingerprinted
+# insert under a savepoint, budget lookup, period upsert, balance snapshot
+# upsert and account/budget updates. The first write to a new period inserts
+# its row under a savepoint, the snapshot's after reading the previous closing
+# balance, and later snapshot periods get their closing balances updated.
+MAX_CREATE_STATEMENTS = 16
+
+def _transaction_data(test_user, test_category, test_budget, **overrides):
+    return TransactionCreate(**{
+        "account_id": test_user.account.id,
+        "category_id": test_category.id,
+        "budget_id": test_budget.id,
+        "description": "Groceries",
+        "recipient": "Store",
+        "sender": "Me",
+        "amount": 300,
+        "type": TransactionType.DEBIT,
+        "transaction_date": datetime.now(timezone.utc),
+        "user_id": test_user.id,
+        **overrides
+    })
+
+def test_create_transaction_commits_once(db_session, query_counter, test_user, test_category, test_budget):
+    balance = test_user.account.balance
+    transaction_data = _transaction_data(test_user, test_category, test_budget)
+    query_counter.reset()
+
+    TransactionService(db_session).create_transaction(transaction_data, test_user)
+
+    assert query_counter.commits == 1
+    assert query_counter.count <= MAX_CREATE_STATEMENTS
+    db_session.expire_all()
+    assert test_user.account.balance == balance - 300
+    assert test_budget.spent_amount == 300
+    assert test_budget.remaining_amount == 700
+
+def test_create_transaction_without_commit(db_session, query_counter, test_user, test_category, test_budget):
+    transaction_data = _transaction_data(test_user, test_category, test_budget)
+    query_counter.reset()
+
+    transaction = TransactionService(db_session).create_transaction(transaction_data, test_user, commit=False)
+
+    assert query_counter.commits == 0
+    assert transaction.budget_id == test_budget.id
+    assert test_budget.spent_amount == 300
+
+def test_pot_deposit_commits_once(db_session, query_counter, test_user, test_pot):
+    query_counter.reset()
+
+    pot = PotService(db_session).update_saved_amount(test_pot.id, test_user.id, test_user, 250, "Saving")
+
+    assert query_counter.commits == 1
+    assert pot.saved_amount == 250
+    assert db_session.query(Transaction).filter(Transaction.pot_id == test_pot.id).count() == 1
@@ -0,0 +1,111 @@
+import pytest
+from datetime import datetime, timedelta
+from db.models.balance_snapshot import BalanceSnapshot
+from schemas.account import BalanceSnapshotGranularity
+from schemas.transaction import TransactionCreate, TransactionUpdate, TransactionType
+from services.ledger_service import LedgerService
+from services.transaction_service import TransactionService
+
+def _create(service, user, amount, transaction_type, transaction_date, description="Entry"):
+    return service.create_transaction(TransactionCreate(
+        description=f"{description} {transaction_date.isoformat()} {amount}",
+        recipient="Someone",
+        amount=amount,
+        type=transaction_type,
+        transaction_date=transaction_date
+    ), user)
+
+@pytest.fixture
+def ledger(db_session, test_user):
+    """Three transactions on different days, the second one backdated"""
+    service = TransactionService(db_session)
+    test_user.account.balance = 1000
+    test_user.account.opening_balance = 1000
+    db_session.commit()
+    _create(service, test_user, 500, TransactionType.CREDIT, datetime(2026, 3, 1, 9))
+    _create(service, test_user, 200, TransactionType.DEBIT, datetime(2026, 3, 3, 12))
+    _create(service, test_user, 50, TransactionType.DEBIT, datetime(2026, 3, 2, 18))
+    return service
+
+def test_balance_at_date(db_session, test_user, ledger):
+    ledger_service = LedgerService(db_session)
+    account = test_user.account
+
+    assert ledger_service.get_balance_at(account, datetime(2026, 2, 28)) == 1000
+    assert ledger_service.get_balance_at(account, datetime(2026, 3, 1, 9)) == 1500
+    assert ledger_service.get_balance_at(account, datetime(2026, 3, 2, 12)) == 1500
+    assert ledger_service.get_balance_at(account, datetime(2026, 3, 2, 23)) == 1450
+    assert ledger_service.get_balance_at(account, datetime(2026, 4, 1)) == 1250
+    assert account.balance == 1250
+
+def test_backdated_transaction_carries_into_later_closing_balances(db_session, test_user, ledger):
+    snapshots = (
+        db_session.query(BalanceSnapshot.period_start, BalanceSnapshot.net_change, BalanceSnapshot.closing_balance)
+        .filter(BalanceSnapshot.account_id == test_user.account.id)
+        .order_by(BalanceSnapshot.period_start)
+        .all()
+    )
+    assert snapshots == [
+        (datetime(2026, 3, 1), 500, 500),
+        (datetime(2026, 3, 2), -50, 450),
+        (datetime(2026, 3, 3), -200, 250),
+    ]
+
+def test_balance_at_date_reads_one_snapshot(db_session, query_counter, test_user, ledger):
+    query_counter.reset()
+    assert LedgerService(db_session).get_balance_at(test_user.account, datetime(2026, 4, 1)) == 1250
+    snapshot_reads = [s for s in query_counter.statements if "balance_snapshots" in s]
+    assert len(snapshot_reads) == 1
+    assert "sum(" not in snapshot_reads[0].lower()
+
+def test_monthly_snapshots(db_session, test_user, ledger):
+    ledger_service = LedgerService(db_session, BalanceSnapshotGranularity.MONTH)
+    ledger_service.rebuild_snapshots(test_user.account.id)
+
+    assert ledger_service.get_balance_at(test_user.account, datetime(2026, 3, 2, 23)) == 1450
+    assert ledger_service.get_balance_at(test_user.account, datetime(2026, 5, 1)) == 1250
+
+def test_update_and_delete_move_snapshots(db_session, test_user, ledger):
+    transaction = _create(ledger, test_user, 100, TransactionType.DEBIT, datetime(2026, 3, 5))
+    ledger.update_transaction(transaction.id, test_user.account.id, TransactionUpdate(transaction_date=datetime(2026, 3, 1, 10)))
+    ledger_service = LedgerService(db_session)
+    assert ledger_service.get_balance_at(test_user.account, datetime(2026, 3, 1, 23)) == 1400
+
+    ledger.delete_transaction(transaction.id, test_user.account.id)
+    assert ledger_service.get_balance_at(test_user.account, datetime(2026, 3, 1, 23)) == 1500
+    assert ledger_service.get_balance_at(test_user.account, datetime(2026, 4, 1)) == 1250
+
+def test_reconcile_reports_drift(db_session, test_user, ledger):
+    ledger_service = LedgerService(db_session)
+    assert ledger_service.reconcile() == []
+
+    test_user.account.balance += 75
+    db_session.query(BalanceSnapshot).delete()
+    db_session.commit()
+
+    drifts = ledger_service.reconcile()
+    assert [(d.account_id, d.drift) for d in drifts] == [(test_user.account.id, 75)]
+    # Snapshots are rebuilt, balances are only corrected on request
+    assert ledger_service.get_balance_at(test_user.account, datetime(2026, 4, 1)) == 1250
+    assert test_user.account.balance == 1325
+
+    ledger_service.reconcile(fix=True)
+    assert test_user.account.balance == 1250
+
+def test_reconcile_ignores_undated_transactions_in_snapshots(db_session, test_user, ledger):
+    undated = _create(ledger, test_user, 30, TransactionType.DEBIT, datetime(2026, 3, 4))
+    undated.transaction_date = None
+    db_session.query(BalanceSnapshot).filter(BalanceSnapshot.period_start == datetime(2026, 3, 4)).delete()
+    db_session.commit()
+
+    # The balance still counts the debit; no snapshot period does
+    ledger_service = LedgerService(db_session)
+    assert ledger_service.reconcile() == []
+    assert test_user.account.balance == 1220
+
+def test_running_balances(db_session, test_user, ledger):
+    transactions = TransactionService(db_session).get_transactions(
+        account_id=test_user.account.id, limit=2, with_running_balance=True
+    )
+    # Newest first: the 3 Mar debit, then the backdated 2 Mar debit
+    assert [(t.amount, t.running_balance) for t in transactions] == [(200, 1250), (50, 1450)]
@@ -0,0 +1,56 @@
+import time
+import pytest
+from datetime import timedelta
+from fastapi import HTTPException
+from jose import jwt
+from core.jwt import ClaimsCache, claims_cache, create_access_token, verify_token
+
+SECRET = "unit-test-secret"
+
+def test_verify_token_caches_claims(mocker):
+    claims_cache.clear()
+    token = create_access_token({"sub": "user@example.com"}, timedelta(minutes=5), SECRET)
+    decode = mocker.spy(jwt, "decode")
+
+    first = verify_token(token, SECRET)
+    second = verify_token(token, SECRET)
+
+    assert first == second
+    assert first["sub"] == "user@example.com"
+    assert decode.call_count == 1
+
+def test_cached_claims_require_same_key():
+    claims_cache.clear()
+    token = create_access_token({"sub": "user@example.com"}, timedelta(minutes=5), SECRET)
+    verify_token(token, SECRET)
+
+    with pytest.raises(HTTPException) as exc_info:
+        verify_token(token, "another-secret")
+    assert exc_info.value.status_code == 401
+
+def test_cached_claims_expire_with_token():
+    cache = ClaimsCache()
+    cache.put("token", SECRET, {"sub": "user@example.com", "exp": time.time() - 1})
+
+    assert cache.get("token", SECRET) is None
+    assert len(cache) == 0
+
+def test_cache_is_bounded_lru():
+    cache = ClaimsCache(max_size=2)
+    exp = time.time() + 60
+    cache.put("a", SECRET, {"exp": exp})
+    cache.put("b", SECRET, {"exp": exp})
+    cache.get("a", SECRET)
+    cache.put("c", SECRET, {"exp": exp})
+
+    assert cache.get("a", SECRET) is not None
+    assert cache.get("b", SECRET) is None
+    assert cache.get("c", SECRET) is not None
+
+def test_cached_claims_are_copies():
+    claims_cache.clear()
+    token = create_access_token({"sub": "user@example.com"}, timedelta(minutes=5), SECRET)
+
+    verify_token(token, SECRET)["sub"] = "tampered"
+
+    assert verify_token(token, SECRET)["sub"] == "user@example.com"
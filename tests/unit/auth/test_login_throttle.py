@@ -0,0 +1,84 @@
+import pytest
+from fastapi import HTTPException
+from core import login_throttle as throttle_module
+from core.login_throttle import LoginThrottle
+
+@pytest.fixture
+def clock(monkeypatch):
+    class Clock:
+        now = 1000.0
+    monkeypatch.setattr(throttle_module.time, "monotonic", lambda: Clock.now)
+    return Clock
+
+def _throttle(decay_half_life: float = 60) -> LoginThrottle:
+    return LoginThrottle(
+        max_failures_per_email=3,
+        max_failures_per_ip=5,
+        base_lockout=10,
+        max_lockout=40,
+        decay_half_life=decay_half_life
+    )
+
+def test_email_is_locked_out_after_threshold(clock):
+    throttle = _throttle()
+    for _ in range(2):
+        throttle.record_failure("User@Example.com", "1.1.1.1")
+    throttle.check("user@example.com", "1.1.1.1")
+
+    throttle.record_failure("user@example.com", "1.1.1.1")
+    with pytest.raises(HTTPException) as exc:
+        throttle.check("USER@example.com", "2.2.2.2")
+    assert exc.value.status_code == 429
+    assert exc.value.headers["Retry-After"] == "10"
+
+    clock.now += 10
+    throttle.check("user@example.com", "2.2.2.2")
+
+def test_lockout_doubles_up_to_the_maximum(clock):
+    throttle = _throttle(decay_half_life=86400)
+    retry_afters = []
+    for _ in range(6):
+        throttle.record_failure("user@example.com")
+        try:
+            throttle.check("user@example.com")
+        except HTTPException as e:
+            retry_afters.append(int(e.headers["Retry-After"]))
+            clock.now += retry_afters[-1]
+    assert retry_afters == [10, 20, 40, 40]
+
+def test_ip_is_locked_out_across_emails(clock):
+    throttle = _throttle()
+    for i in range(5):
+        throttle.record_failure(f"user{i}@example.com", "1.1.1.1")
+
+    with pytest.raises(HTTPException):
+        throttle.check("someone@example.com", "1.1.1.1")
+    throttle.check("someone@example.com", "2.2.2.2")
+
+def test_failures_decay(clock):
+    throttle = _throttle()
+    for _ in range(2):
+        throttle.record_failure("user@example.com")
+
+    # Two half-lives later the two failures count as half of one
+    clock.now += 120
+    throttle.record_failure("user@example.com")
+    throttle.check("user@example.com")
+
+def test_success_resets_the_email(clock):
+    throttle = _throttle()
+    for _ in range(2):
+        throttle.record_failure("user@example.com")
+    throttle.record_success("user@example.com")
+
+    throttle.record_failure("user@example.com")
+    throttle.check("user@example.com")
+
+def test_success_keeps_the_address_locked_out(clock):
+    throttle = _throttle()
+    for i in range(5):
+        throttle.record_failure(f"user{i}@example.com", "1.1.1.1")
+    throttle.record_success("attacker@example.com")
+
+    with pytest.raises(HTTPException):
+        throttle.check("someone@example.com", "1.1.1.1")
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+from core.revocation import TokenRevocationStore
+from db.models.revoked_token import RevokedToken
+from db.models.user_auth import UserAuth
+
+def test_revoked_token_is_denied(db_session, test_user):
+    store = TokenRevocationStore()
+    store.revoke(db_session, "jti-1", datetime.utcnow() + timedelta(minutes=5), user_id=test_user.id)
+    db_session.commit()
+
+    assert store.is_revoked(db_session, "jti-1", None)
+    assert store.is_revoked(db_session, "other", "jti-1")
+    assert not store.is_revoked(db_session, "jti-2", None)
+
+def test_revocations_are_shared_through_the_database(db_session, test_user):
+    writer = TokenRevocationStore()
+    reader = TokenRevocationStore()
+    assert not reader.is_revoked(db_session, "family-1")
+
+    writer.revoke(db_session, "family-1", datetime.utcnow() + timedelta(days=1), user_id=test_user.id)
+    db_session.commit()
+
+    # The reader picks the row up on its next sync
+    reader._last_synced_at = 0.0
+    assert reader.is_revoked(db_session, "family-1")
+
+def test_revocation_is_only_remembered_once_committed(db_session, test_user):
+    store = TokenRevocationStore()
+    store.revoke(db_session, "jti-1", datetime.utcnow() + timedelta(minutes=5), user_id=test_user.id)
+    assert "jti-1" not in store._revoked
+
+    db_session.commit()
+    assert "jti-1" in store._revoked
+
+def test_sync_finds_rows_committed_out_of_id_order(db_session):
+    expires_at = datetime.utcnow() + timedelta(minutes=5)
+    reader = TokenRevocationStore()
+    db_session.add(RevokedToken(id=10, token_id="later-id", expires_at=expires_at))
+    db_session.commit()
+    assert reader.is_revoked(db_session, "later-id")
+
+    # A transaction holding a lower id commits after the reader has synced
+    db_session.add(RevokedToken(id=5, token_id="earlier-id", expires_at=expires_at))
+    db_session.commit()
+    reader._last_synced_at = 0.0
+    assert reader.is_revoked(db_session, "earlier-id")
+
+def test_expired_revocation_no_longer_matches(db_session):
+    store = TokenRevocationStore()
+    store.revoke(db_session, "jti-old", datetime.utcnow() - timedelta(seconds=1))
+
+    assert not store.is_revoked(db_session, "jti-old")
+
+def test_purge_expired(db_session, test_user):
+    now = datetime.utcnow()
+    db_session.add_all([
+        RevokedToken(token_id="expired", expires_at=now - timedelta(minutes=1)),
+        RevokedToken(token_id="live", expires_at=now + timedelta(minutes=1)),
+        UserAuth(user_id=test_user.id, token_family="f", refresh_jti="r", expires_at=now - timedelta(days=1)),
+    ])
+    db_session.commit()
+
+    deleted = TokenRevocationStore().purge_expired(db_session)
+
+    assert deleted == 2
+    assert [t.token_id for t in db_session.query(RevokedToken).all()] == ["live"]
+    assert db_session.query(UserAuth).count() == 0
+
+def test_sync_after_the_first_load_reads_only_recent_rows(db_session, query_counter):
+    expires_at = datetime.utcnow() + timedelta(days=1)
+    store = TokenRevocationStore()
+    db_session.add(RevokedToken(token_id="old", expires_at=expires_at, created_at=datetime.utcnow() - timedelta(days=3)))
+    db_session.commit()
+    assert store.is_revoked(db_session, "old")
+
+    db_session.add(RevokedToken(token_id="new", expires_at=expires_at))
+    db_session.commit()
+    query_counter.reset()
+    store._last_synced_at = 0.0
+    assert store.is_revoked(db_session, "new")
+    assert "created_at >=" in query_counter.statements[0]
+
+def test_background_sync_keeps_checks_off_the_database(db_session, session_factory, query_counter):
+    import asyncio
+    store = TokenRevocationStore(sync_interval=0.01)
+    db_session.add(RevokedToken(token_id="family-1", expires_at=datetime.utcnow() + timedelta(days=1)))
+    db_session.commit()
+
+    async def check():
+        await store.start(session_factory)
+        try:
+            query_counter.reset()
+            assert store.is_revoked(db_session, "family-1")
+            assert query_counter.count == 0
+        finally:
+            await store.stop()
+    asyncio.run(check())
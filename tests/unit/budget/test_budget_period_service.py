@@ -0,0 +1,188 @@
+import pytest
+from datetime import datetime, timezone, timedelta
+from services.budget_period_service import BudgetPeriodService
+from services.budget_service import BudgetService
+from services.transaction_service import TransactionService
+from schemas.budget import BudgetPeriodType, BudgetUpdate
+from schemas.transaction import TransactionCreate, TransactionUpdate, TransactionType
+from db.models.budget import Budget
+from db.models.budget_period import BudgetPeriod
+
+def _make_budget(db_session, test_user, start_date, end_date, period=None):
+    budget = Budget(
+        user_id=test_user.id,
+        name="Recurring Budget",
+        total_amount=1000,
+        spent_amount=0,
+        remaining_amount=1000,
+        start_date=start_date,
+        end_date=end_date,
+        period=period,
+        is_active=True
+    )
+    db_session.add(budget)
+    db_session.commit()
+    db_session.refresh(budget)
+    return budget
+
+def test_monthly_period_bounds_are_anchored_on_start_date(db_session, test_user):
+    budget = _make_budget(
+        db_session, test_user,
+        start_date=datetime(2025, 1, 31),
+        end_date=datetime(2026, 1, 31),
+        period=BudgetPeriodType.MONTHLY
+    )
+
+    assert BudgetPeriodService.get_period_bounds(budget, datetime(2025, 2, 15)) == (
+        datetime(2025, 1, 31), datetime(2025, 2, 28)
+    )
+    # After a short month the anchor day is restored
+    assert BudgetPeriodService.get_period_bounds(budget, datetime(2025, 3, 31)) == (
+        datetime(2025, 3, 31), datetime(2025, 4, 30)
+    )
+    assert BudgetPeriodService.get_period_bounds(budget, datetime(2024, 12, 1)) is None
+    assert BudgetPeriodService.get_period_bounds(budget, datetime(2026, 2, 1)) is None
+
+def test_weekly_period_bounds(db_session, test_user):
+    budget = _make_budget(
+        db_session, test_user,
+        start_date=datetime(2025, 1, 1),
+        end_date=datetime(2025, 3, 1),
+        period=BudgetPeriodType.WEEKLY
+    )
+
+    assert BudgetPeriodService.get_period_bounds(budget, datetime(2025, 1, 10, 12)) == (
+        datetime(2025, 1, 8), datetime(2025, 1, 15)
+    )
+    # The final period is cut short by end_date
+    assert BudgetPeriodService.get_period_bounds(budget, datetime(2025, 2, 28)) == (
+        datetime(2025, 2, 26), datetime(2025, 3, 1)
+    )
+
+def test_transaction_writes_maintain_period_spend(db_session, test_user):
+    now = datetime.now(timezone.utc)
+    budget = _make_budget(
+        db_session, test_user,
+        start_date=now - timedelta(days=60),
+        end_date=now + timedelta(days=60),
+        period=BudgetPeriodType.MONTHLY
+    )
+    service = TransactionService(db_session)
+    period_service = BudgetPeriodService(db_session)
+
+    transaction = service.create_transaction(TransactionCreate(
+        description="Groceries",
+        amount=300,
+        type=TransactionType.DEBIT,
+        transaction_date=now,
+        budget_id=budget.id
+    ), test_user)
+    service.create_transaction(TransactionCreate(
+        description="Refund",
+        amount=100,
+        type=TransactionType.CREDIT,
+        transaction_date=now,
+        budget_id=budget.id
+    ), test_user)
+
+    current = period_service.get_current_period(budget)
+    assert current.spent_amount == 200
+    assert current.remaining_amount == 800
+
+    # Moving the transaction into an earlier period moves its spend with it
+    service.update_transaction(
+        transaction.id,
+        test_user.account.id,
+        TransactionUpdate(transaction_date=now - timedelta(days=45), amount=500)
+    )
+    assert period_service.get_current_period(budget).spent_amount == -100
+    past = period_service.get_current_period(budget, at=now - timedelta(days=45))
+    assert past.spent_amount == 500
+
+    service.delete_transaction(transaction.id, test_user.account.id)
+    past = period_service.get_current_period(budget, at=now - timedelta(days=45))
+    assert past.spent_amount == 0
+
+def test_current_period_without_spend(db_session, test_user):
+    now = datetime.now(timezone.utc)
+    budget = _make_budget(
+        db_session, test_user,
+        start_date=now - timedelta(days=1),
+        end_date=now + timedelta(days=30),
+        period=BudgetPeriodType.WEEKLY
+    )
+
+    current = BudgetPeriodService(db_session).get_current_period(budget)
+
+    assert current.spent_amount == 0
+    assert current.remaining_amount == budget.total_amount
+    assert db_session.query(BudgetPeriod).filter_by(budget_id=budget.id).count() == 0
+
+def test_changing_period_rebuilds_periods(db_session, test_user):
+    now = datetime.now(timezone.utc)
+    budget = _make_budget(
+        db_session, test_user,
+        start_date=now - timedelta(days=60),
+        end_date=now + timedelta(days=60)
+    )
+    service = TransactionService(db_session)
+    for days_ago, amount in [(45, 300), (1, 200)]:
+        service.create_transaction(TransactionCreate(
+            description=f"Spend {days_ago}",
+            amount=amount,
+            type=TransactionType.DEBIT,
+            transaction_date=now - timedelta(days=days_ago),
+            budget_id=budget.id
+        ), test_user)
+
+    # A one-off budget has a single period holding all spend
+    period_service = BudgetPeriodService(db_session)
+    assert period_service.get_current_period(budget).spent_amount == 500
+
+    BudgetService(db_session).update_budget(
+        budget.id, test_user.id, BudgetUpdate(period=BudgetPeriodType.MONTHLY)
+    )
+
+    periods = period_service.get_periods(budget)
+    assert len(periods) == 2
+    assert sorted(p.spent_amount for p in periods) == [200, 300]
+
+def test_increment_adds_to_a_period_created_concurrently(db_session, test_user, mocker):
+    from crud.budget_period import BudgetPeriodCRUD
+    from sqlalchemy.orm import Query
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    budget = _make_budget(db_session, test_user, start_date=now, end_date=now + timedelta(days=30))
+    db_session.add(BudgetPeriod(budget_id=budget.id, period_start=now, period_end=now + timedelta(days=30), spent_amount=100))
+    db_session.commit()
+
+    # The first UPDATE misses as if another writer inserted the period just after it
+    real_update = Query.update
+    calls = []
+
+    def update(query, *args, **kwargs):
+        calls.append(query)
+        return 0 if len(calls) == 1 else real_update(query, *args, **kwargs)
+
+    mocker.patch.object(Query, "update", update)
+    BudgetPeriodCRUD(db_session).increment(budget.id, now, now + timedelta(days=30), 50)
+    db_session.commit()
+    mocker.stopall()
+
+    periods = db_session.query(BudgetPeriod).filter_by(budget_id=budget.id).all()
+    assert [p.spent_amount for p in periods] == [150]
+
+def test_update_budget_commits_once(db_session, test_user, query_counter):
+    now = datetime.now(timezone.utc)
+    budget = _make_budget(
+        db_session, test_user,
+        start_date=now - timedelta(days=60),
+        end_date=now + timedelta(days=60)
+    )
+    query_counter.reset()
+
+    BudgetService(db_session).update_budget(
+        budget.id, test_user.id, BudgetUpdate(period=BudgetPeriodType.MONTHLY)
+    )
+
+    assert query_counter.commits == 1
@@ -111,4 +111,42 @@ def test_delete_nonexistent_category(db_session, test_user):
         category_service.delete_category(999, test_user.id)
     
     assert exc_info.value.status_code == 404
-    assert exc_info.value.detail == "Category not found" 
\ No newline at end of file
+    assert exc_info.value.detail == "Category not found" 
+def test_get_category_stats(db_session, test_user):
+    from db.models.transaction import Transaction
+    from schemas.transaction import TransactionType
+
+    groceries = Category(name="Groceries", user_id=test_user.id)
+    salary = Category(name="Salary", user_id=test_user.id)
+    unused = Category(name="Travel", user_id=test_user.id)
+    db_session.add_all([groceries, salary, unused])
+    db_session.flush()
+    account_id = test_user.account.id
+    db_session.add_all([
+        Transaction(account_id=account_id, category_id=category.id, amount=amount, type=transaction_type,
+                    description=f"Transaction {i}", transaction_date=datetime(2026, 3, day))
+        for i, (category, amount, transaction_type, day) in enumerate([
+            (groceries, 1000, TransactionType.DEBIT, 1),
+            (groceries, 3000, TransactionType.DEBIT, 5),
+            (groceries, 500, TransactionType.CREDIT, 9),
+            (salary, 250000, TransactionType.CREDIT, 2),
+        ])
+    ])
+    db_session.commit()
+
+    stats = {s.name: s for s in CategoryService(db_session).get_category_stats(test_user.id, account_id)}
+    assert (stats["Groceries"].transaction_count, stats["Groceries"].total_debit, stats["Groceries"].total_credit) == (3, 4000, 500)
+    assert stats["Groceries"].average_amount == 1500
+    assert stats["Groceries"].last_activity == datetime(2026, 3, 9)
+    assert (stats["Salary"].transaction_count, stats["Salary"].total_credit) == (1, 250000)
+    assert (stats["Travel"].transaction_count, stats["Travel"].last_activity) == (0, None)
+
+    in_range = CategoryService(db_session).get_category_stats(
+        test_user.id, account_id, start_date=datetime(2026, 3, 4), end_date=datetime(2026, 3, 6)
+    )
+    assert {s.name: s.transaction_count for s in in_range} == {"Groceries": 1, "Salary": 0, "Travel": 0}
+
+    with pytest.raises(HTTPException):
+        CategoryService(db_session).get_category_stats(
+            test_user.id, account_id, start_date=datetime(2026, 3, 6), end_date=datetime(2026, 3, 4)
+        )
@@ -0,0 +1,52 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+from fastapi.testclient import TestClient
+from core import compression
+from core.compression import CompressionMiddleware
+
+@pytest.fixture
+def client():
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/large")
+    def large():
+        return {"data": [{"id": i, "description": "Groceries"} for i in range(100)]}
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("ok")
+
+    return TestClient(app)
+
+def test_large_response_is_gzipped(client, monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    response = client.get("/large", headers={"Accept-Encoding": "br, gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert len(response.json()["data"]) == 100
+
+def test_small_response_is_not_compressed(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.text == "ok"
+
+def test_response_is_not_compressed_without_accept_encoding(client):
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert len(response.json()["data"]) == 100
+
+def test_select_encoding(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", object())
+    assert CompressionMiddleware.select_encoding("gzip, deflate, br") == "br"
+    assert CompressionMiddleware.select_encoding("gzip, br;q=0") == "gzip"
+    assert CompressionMiddleware.select_encoding("deflate") is None
+
+    monkeypatch.setattr(compression, "brotli", None)
+    assert CompressionMiddleware.select_encoding("br, gzip;q=0.5") == "gzip"
+    assert CompressionMiddleware.select_encoding("br") is None
@@ -0,0 +1,32 @@
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+from core.health import HOT_QUERIES, check_database, precompile_queries, warm_pool
+
+def test_warm_pool_opens_connections(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'warm.db'}", poolclass=QueuePool, pool_size=3)
+
+    warm_pool(engine, 2)
+
+    assert engine.pool.checkedin() == 2
+    assert engine.pool.checkedout() == 0
+
+def test_warm_pool_is_capped_by_pool_size(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'warm.db'}", poolclass=QueuePool, pool_size=2)
+
+    warm_pool(engine, 10)
+
+    assert engine.pool.checkedin() == 2
+
+def test_check_database_closes_its_session(mocker):
+    session = mocker.Mock()
+
+    check_database(lambda: session)
+
+    session.execute.assert_called_once()
+    session.close.assert_called_once()
+
+def test_precompile_queries_runs_hot_queries(db_session, test_user, query_counter):
+    query_counter.reset()
+    precompile_queries(lambda: db_session)
+
+    assert query_counter.count > len(HOT_QUERIES)
@@ -0,0 +1,124 @@
+import ipaddress
+import pytest
+from datetime import timedelta
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from core import client_identity, rate_limit
+from core.client_identity import client_address
+from core.jwt import create_access_token
+from core.rate_limit import InMemoryRateLimitBackend, RateLimit, RateLimitMiddleware
+
+@pytest.fixture
+def clock(monkeypatch):
+    class Clock:
+        now = 1000.0
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: Clock.now)
+    return Clock
+
+@pytest.fixture
+def client(monkeypatch):
+    # As if both keys had already passed validation
+    monkeypatch.setattr(client_identity, "verified_api_keys", client_identity.VerifiedAPIKeys())
+    client_identity.verified_api_keys.add("key-1")
+    client_identity.verified_api_keys.add("key-2")
+    app = FastAPI()
+    limits = {
+        "read": RateLimit(2),
+        "write": RateLimit(1),
+        "export": RateLimit(1),
+        "auth": RateLimit(1),
+    }
+    app.add_middleware(RateLimitMiddleware, limits=limits, backend=InMemoryRateLimitBackend())
+
+    @app.get("/api/v1/transactions/")
+    def read():
+        return {"ok": True}
+
+    @app.post("/api/v1/transactions/")
+    def write():
+        return {"ok": True}
+
+    @app.post("/api/v1/auth/login")
+    def login():
+        return {"ok": True}
+
+    @app.get("/healthz")
+    def healthz():
+        return {"status": "ok"}
+
+    return TestClient(app)
+
+def test_bucket_refills_over_time(clock):
+    backend = InMemoryRateLimitBackend()
+    limit = RateLimit(2, period=10)
+
+    assert backend.take("k", limit).remaining == 1
+    assert backend.take("k", limit).allowed
+    denied = backend.take("k", limit)
+    assert not denied.allowed
+    assert denied.retry_after == pytest.approx(5)
+
+    clock.now += 5
+    assert backend.take("k", limit).allowed
+    assert not backend.take("k", limit).allowed
+
+def test_limited_request_gets_429_with_headers(client):
+    first = client.get("/api/v1/transactions/", headers={"X-API-Key": "key-1"})
+    assert first.status_code == 200
+    assert first.headers["RateLimit-Limit"] == "2"
+    assert first.headers["RateLimit-Remaining"] == "1"
+    assert first.headers["RateLimit-Policy"] == "2;w=60"
+
+    client.get("/api/v1/transactions/", headers={"X-API-Key": "key-1"})
+    limited = client.get("/api/v1/transactions/", headers={"X-API-Key": "key-1"})
+    assert limited.status_code == 429
+    assert limited.headers["RateLimit-Remaining"] == "0"
+    assert int(limited.headers["Retry-After"]) > 0
+
+def test_api_keys_and_users_have_separate_buckets(client):
+    for _ in range(2):
+        client.get("/api/v1/transactions/", headers={"X-API-Key": "key-1"})
+    assert client.get("/api/v1/transactions/", headers={"X-API-Key": "key-1"}).status_code == 429
+
+    assert client.get("/api/v1/transactions/", headers={"X-API-Key": "key-2"}).status_code == 200
+    token = create_access_token({"sub": "user@example.com"}, timedelta(minutes=5))
+    assert client.get("/api/v1/transactions/", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+
+def test_unverified_api_keys_share_the_client_address_bucket(client):
+    assert client.get("/api/v1/transactions/", headers={"X-API-Key": "random-1"}).status_code == 200
+    assert client.get("/api/v1/transactions/", headers={"X-API-Key": "random-2"}).status_code == 200
+    assert client.get("/api/v1/transactions/", headers={"X-API-Key": "random-3"}).status_code == 429
+
+def test_client_address_behind_trusted_proxy(monkeypatch):
+    scope = {
+        "type": "http",
+        "client": ("10.0.0.5", 1234),
+        "headers": [(b"x-forwarded-for", b"203.0.113.7, 198.51.100.2, 10.0.0.9")],
+    }
+    assert client_address(scope) == "10.0.0.5"
+
+    monkeypatch.setattr(client_identity, "TRUSTED_PROXIES", [ipaddress.ip_network("10.0.0.0/8")])
+    # The last hop not added by a trusted proxy; earlier entries can be forged
+    assert client_address(scope) == "198.51.100.2"
+    assert client_address({**scope, "client": ("192.0.2.1", 1234)}) == "192.0.2.1"
+
+def test_route_classes_have_separate_buckets(client):
+    headers = {"X-API-Key": "key-1"}
+    assert client.post("/api/v1/transactions/", headers=headers).status_code == 200
+    assert client.post("/api/v1/transactions/", headers=headers).status_code == 429
+    assert client.get("/api/v1/transactions/", headers=headers).status_code == 200
+
+    assert client.post("/api/v1/auth/login").status_code == 200
+    assert client.post("/api/v1/auth/login").status_code == 429
+
+def test_health_probes_are_not_limited(client):
+    for _ in range(5):
+        response = client.get("/healthz")
+        assert response.status_code == 200
+        assert "RateLimit-Limit" not in response.headers
+
+def test_classify():
+    assert RateLimitMiddleware.classify("POST", "/api/v1/auth/login") == "auth"
+    assert RateLimitMiddleware.classify("GET", "/api/v1/transactions/export") == "export"
+    assert RateLimitMiddleware.classify("DELETE", "/api/v1/pots/1") == "write"
+    assert RateLimitMiddleware.classify("GET", "/api/v1/pots/") == "read"
@@ -0,0 +1,92 @@
+import os
+from datetime import datetime
+import pytest
+from sqlalchemy import column, create_engine, select, table, text
+from sqlalchemy.orm import Session
+from db.partitioning import (
+    add_months, explain_partitions, monthly_partitions, partition_clause
+)
+from db.sharding import TransactionShardRouter, parse_shard_urls
+
+# Pruning can only be checked against a real MySQL server
+MYSQL_URL = os.environ.get("TEST_MYSQL_URL")
+requires_mysql = pytest.mark.skipif(not MYSQL_URL, reason="TEST_MYSQL_URL is not set")
+# Created and dropped by the MySQL tests, so the database's own tables are left alone
+SCRATCH_TABLE = "partitioning_test_transactions"
+scratch = table(SCRATCH_TABLE, column("id"), column("account_id"), column("transaction_date"))
+
+def test_add_months_rolls_over_years():
+    assert add_months(datetime(2026, 11, 1), 2) == datetime(2027, 1, 1)
+    assert add_months(datetime(2026, 1, 1), -1) == datetime(2025, 12, 1)
+
+def test_monthly_partitions_cover_each_month():
+    definitions = monthly_partitions(datetime(2026, 11, 17, 9, 30), datetime(2027, 1, 1))
+    assert definitions == [
+        "PARTITION p202611 VALUES LESS THAN ('2026-12-01')",
+        "PARTITION p202612 VALUES LESS THAN ('2027-01-01')",
+        "PARTITION p202701 VALUES LESS THAN ('2027-02-01')",
+    ]
+
+def test_partition_clauses():
+    assert partition_clause("hash", hash_partitions=8) == "PARTITION BY HASH (account_id) PARTITIONS 8"
+    clause = partition_clause("range", datetime(2026, 1, 1), datetime(2026, 1, 1))
+    assert clause.startswith("PARTITION BY RANGE COLUMNS (transaction_date)")
+    assert "PARTITION pmax VALUES LESS THAN (MAXVALUE)" in clause
+    with pytest.raises(ValueError):
+        partition_clause("list")
+
+def test_shard_router_maps_accounts_like_hash_partitioning():
+    router = TransactionShardRouter(parse_shard_urls(" sqlite://, ,sqlite:// "))
+    assert router.enabled
+    assert [router.shard_for(account_id) for account_id in range(4)] == [0, 1, 0, 1]
+    assert not TransactionShardRouter().enabled
+
+def test_shard_router_opens_sessions_on_the_accounts_shard(tmp_path):
+    primary = Session()
+    with TransactionShardRouter().session_for(7, default=primary) as db:
+        assert db is primary
+
+    router = TransactionShardRouter([f"sqlite:///{tmp_path / 'shard0.db'}", f"sqlite:///{tmp_path / 'shard1.db'}"])
+    with router.session_for(7, default=primary) as db:
+        assert db is not primary
+        assert db.get_bind() is router.get_engine(1)
+    router.dispose()
+
+@pytest.fixture
+def mysql_connection():
+    engine = create_engine(MYSQL_URL)
+    with engine.connect() as connection:
+        yield connection
+    engine.dispose()
+
+def _create_partitioned_table(connection, primary_key: str, clause: str) -> None:
+    connection.execute(text(f"DROP TABLE IF EXISTS {SCRATCH_TABLE}"))
+    connection.execute(text(
+        f"CREATE TABLE {SCRATCH_TABLE} ("
+        "id INT NOT NULL AUTO_INCREMENT, account_id INT NOT NULL, amount BIGINT, "
+        "transaction_date DATETIME NOT NULL, "
+        f"PRIMARY KEY ({primary_key})) {clause}"
+    ))
+
+@requires_mysql
+def test_hash_partitioning_prunes_account_queries(mysql_connection):
+    _create_partitioned_table(mysql_connection, "id, account_id", partition_clause("hash", hash_partitions=8))
+    try:
+        query = select(scratch.c.id).where(scratch.c.account_id == 42).order_by(scratch.c.transaction_date.desc())
+        assert explain_partitions(mysql_connection, query) == ["p2"]
+    finally:
+        mysql_connection.execute(text(f"DROP TABLE {SCRATCH_TABLE}"))
+
+@requires_mysql
+def test_range_partitioning_prunes_date_filtered_queries(mysql_connection):
+    clause = partition_clause("range", datetime(2026, 1, 1), datetime(2026, 6, 1))
+    _create_partitioned_table(mysql_connection, "id, transaction_date", clause)
+    try:
+        query = select(scratch.c.id).where(
+            scratch.c.account_id == 42,
+            scratch.c.transaction_date >= datetime(2026, 3, 1),
+            scratch.c.transaction_date < datetime(2026, 5, 1)
+        )
+        assert explain_partitions(mysql_connection, query) == ["p202603", "p202604"]
+    finally:
+        mysql_connection.execute(text(f"DROP TABLE {SCRATCH_TABLE}"))
@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy import create_engine
+from starlette.requests import Request
+import db.models  # noqa: F401
+import db.models.api_key  # noqa: F401
+from db import session as session_module
+from db.base import Base
+from db.models.category import Category
+from db.session import RoutingSession, SessionLocal, get_db, read_your_writes
+
+@pytest.fixture
+def engines(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(bind=primary)
+    Base.metadata.create_all(bind=replica)
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+@pytest.fixture
+def routed_session_local(engines, monkeypatch):
+    """Point the app's session factory at the two test databases"""
+    primary, replica = engines
+    original = dict(SessionLocal.kw)
+    monkeypatch.setattr(session_module, "_engine", primary)
+    SessionLocal.configure(bind=primary, replica_bind=replica)
+    read_your_writes.clear()
+    yield
+    SessionLocal.kw.clear()
+    SessionLocal.kw.update(original)
+    read_your_writes.clear()
+
+def _request(method: str, client: str = "10.0.0.1") -> Request:
+    return Request({"type": "http", "method": method, "path": "/", "headers": [], "client": (client, 5000)})
+
+def _count_categories(db) -> int:
+    return db.query(Category).count()
+
+def test_reads_go_to_replica_and_writes_to_primary(engines):
+    primary, replica = engines
+    db = RoutingSession(bind=primary, replica_bind=replica)
+    db.use_replica = True
+
+    assert _count_categories(db) == 0
+    db.add(Category(name="Groceries", user_id=1))
+    db.commit()
+
+    # The session has written, so it now reads from the primary
+    assert not db.use_replica
+    assert _count_categories(db) == 1
+    db.close()
+
+    reader = RoutingSession(bind=primary, replica_bind=replica)
+    reader.use_replica = True
+    assert _count_categories(reader) == 0
+    reader.close()
+
+def test_bulk_updates_go_to_primary(engines):
+    primary, replica = engines
+    with RoutingSession(bind=primary) as db:
+        db.add(Category(name="Groceries", user_id=1))
+        db.commit()
+
+    db = RoutingSession(bind=primary, replica_bind=replica)
+    db.use_replica = True
+    db.query(Category).filter(Category.name == "Groceries").update({Category.color: "#ffffff"})
+    db.commit()
+
+    assert db.query(Category.color).scalar() == "#ffffff"
+    db.close()
+
+def test_get_db_routes_by_method_and_recent_writes(routed_session_local):
+    writes = get_db(_request("POST"))
+    db = next(writes)
+    assert not db.use_replica
+    db.add(Category(name="Groceries", user_id=1))
+    db.commit()
+    writes.close()
+
+    # The writer's next read stays on the primary during the window
+    reads = get_db(_request("GET"))
+    db = next(reads)
+    assert not db.use_replica
+    assert _count_categories(db) == 1
+    reads.close()
+
+    other_reads = get_db(_request("GET", client="10.0.0.2"))
+    db = next(other_reads)
+    assert db.use_replica
+    assert _count_categories(db) == 0
+    other_reads.close()
+
+def test_read_your_writes_window_expires(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(session_module.time, "monotonic", lambda: now[0])
+    sticky = session_module.ReadYourWrites(window=5)
+
+    sticky.mark("user:a@example.com")
+    assert sticky.is_recent("user:a@example.com")
+    assert not sticky.is_recent("user:b@example.com")
+
+    now[0] += 5
+    assert not sticky.is_recent("user:a@example.com")
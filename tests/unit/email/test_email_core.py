@@ -0,0 +1,21 @@
+from core.deps import get_email_core
+from core.email import EmailCore
+
+def test_get_email_core_is_singleton():
+    assert get_email_core() is get_email_core()
+
+def test_templates_are_precompiled():
+    email_core = EmailCore()
+
+    assert "activation_email.html" in email_core.templates
+    assert "password_reset_email.html" in email_core.templates
+    assert email_core.get_template("activation_email.html") is email_core.templates["activation_email.html"]
+
+def test_render_template_uses_cached_template(mocker):
+    email_core = EmailCore()
+    get_template = mocker.spy(email_core.template_env, "get_template")
+
+    html = email_core.render_template("activation_email.html", username="Test User", activation_token="abc")
+
+    assert "Test User" in html
+    get_template.assert_not_called()
@@ -0,0 +1,161 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from tasks.background_jobs import JobQueue, job_queue, SEND_ACTIVATION_EMAIL
+from db.models.activation_token import ActivationToken
+from db.models.outbox_job import OutboxJob, OutboxJobStatus
+from db.models.periodic_task_run import PeriodicTaskRun
+
+def test_enqueue_requires_registered_handler(db_session):
+    queue = JobQueue()
+    with pytest.raises(ValueError):
+        queue.enqueue(db_session, "unknown", {})
+
+def test_run_pending_runs_job(db_session, session_factory):
+    queue = JobQueue()
+    received = []
+
+    @queue.register("record")
+    async def record(payload, session_factory):
+        received.append(payload)
+
+    job = queue.enqueue(db_session, "record", {"value": 1})
+    db_session.commit()
+
+    assert asyncio.run(queue.run_pending(session_factory)) == 1
+    db_session.refresh(job)
+
+    assert received == [{"value": 1}]
+    assert job.status == OutboxJobStatus.SUCCEEDED
+    assert job.attempts == 1
+    # Nothing left to run
+    assert asyncio.run(queue.run_pending(session_factory)) == 0
+
+def test_failed_job_is_retried_with_backoff(db_session, session_factory):
+    queue = JobQueue(base_delay=60)
+    attempts = []
+
+    @queue.register("flaky")
+    async def flaky(payload, session_factory):
+        attempts.append(payload)
+        raise RuntimeError("SMTP unavailable")
+
+    job = queue.enqueue(db_session, "flaky", {}, max_attempts=2)
+    db_session.commit()
+
+    asyncio.run(queue.run_pending(session_factory))
+    db_session.refresh(job)
+    assert job.status == OutboxJobStatus.PENDING
+    assert job.attempts == 1
+    assert job.last_error == "SMTP unavailable"
+    assert job.next_attempt_at > datetime.utcnow() + timedelta(seconds=25)
+
+    # Not due yet, so the job is left alone
+    assert asyncio.run(queue.run_pending(session_factory)) == 0
+
+    job.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+    db_session.commit()
+    asyncio.run(queue.run_pending(session_factory))
+    db_session.refresh(job)
+    assert job.status == OutboxJobStatus.FAILED
+    assert job.attempts == 2
+    assert len(attempts) == 2
+
+def test_concurrency_is_limited(db_session, session_factory):
+    queue = JobQueue(concurrency=2)
+    running = 0
+    peak = 0
+
+    @queue.register("slow")
+    async def slow(payload, session_factory):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    for i in range(5):
+        queue.enqueue(db_session, "slow", {"i": i})
+    db_session.commit()
+
+    assert asyncio.run(queue.run_pending(session_factory)) == 5
+    assert peak == 2
+
+def test_activation_email_job_mints_the_token(db_session, session_factory, test_user, mocker):
+    send = mocker.patch("services.email_service.EmailService.send_activation_email")
+    test_user.is_activated = False
+    job = job_queue.enqueue(db_session, SEND_ACTIVATION_EMAIL, {"user_id": test_user.id})
+    db_session.commit()
+
+    asyncio.run(job_queue.run_pending(session_factory))
+    db_session.refresh(job)
+
+    assert job.status == OutboxJobStatus.SUCCEEDED
+    token = db_session.query(ActivationToken).filter(ActivationToken.user_id == test_user.id).one()
+    send.assert_called_once_with(email=test_user.email, username=test_user.username, activation_token=token.token)
+    # The outbox row never held the token
+    assert job.payload == {"user_id": test_user.id}
+
+def test_activation_email_job_skips_activated_users(db_session, session_factory, test_user, mocker):
+    send = mocker.patch("services.email_service.EmailService.send_activation_email")
+    job_queue.enqueue(db_session, SEND_ACTIVATION_EMAIL, {"user_id": test_user.id})
+    db_session.commit()
+
+    asyncio.run(job_queue.run_pending(session_factory))
+    send.assert_not_called()
+
+def test_periodic_task_runs_on_one_worker(db_session, session_factory):
+    runs = []
+    workers = [JobQueue(session_factory=session_factory) for _ in range(2)]
+    for worker in workers:
+        worker.periodic("tick", interval=3600)(lambda db: runs.append(1))
+
+    for worker in workers:
+        asyncio.run(worker.run_periodic())
+    assert len(runs) == 1
+
+    run = db_session.get(PeriodicTaskRun, "tick")
+    assert run.last_run_at is not None
+    assert run.locked_until is None
+    # A restarted worker waits out the interval recorded by the last run
+    restarted = JobQueue(session_factory=session_factory)
+    restarted.periodic("tick", interval=3600)(lambda db: runs.append(1))
+    asyncio.run(restarted.run_periodic())
+    assert len(runs) == 1
+
+def test_periodic_task_waits_for_a_held_lease(db_session, session_factory):
+    db_session.add(PeriodicTaskRun(name="tick", locked_until=datetime.utcnow() + timedelta(minutes=5), locked_by="other"))
+    db_session.commit()
+    runs = []
+    queue = JobQueue(session_factory=session_factory)
+    queue.periodic("tick", interval=60)(lambda db: runs.append(1))
+
+    asyncio.run(queue.run_periodic(force=True))
+    assert runs == []
+
+    # An expired lease, e.g. of a crashed worker, is taken over
+    db_session.get(PeriodicTaskRun, "tick").locked_until = datetime.utcnow() - timedelta(seconds=1)
+    db_session.commit()
+    asyncio.run(queue.run_periodic(force=True))
+    assert runs == [1]
+
+def test_purge_finished_jobs(db_session):
+    queue = JobQueue()
+
+    @queue.register("record")
+    async def record(payload, session_factory):
+        pass
+
+    old = datetime.utcnow() - timedelta(days=30)
+    jobs = {}
+    for status in OutboxJobStatus:
+        jobs[status] = queue.enqueue(db_session, "record", {})
+        jobs[status].status = status
+        jobs[status].next_attempt_at = old
+    recent = queue.enqueue(db_session, "record", {})
+    recent.status = OutboxJobStatus.SUCCEEDED
+    db_session.commit()
+
+    assert queue.purge_finished(db_session, timedelta(days=7)) == 2
+    remaining = {job.id for job in db_session.query(OutboxJob).all()}
+    assert remaining == {jobs[OutboxJobStatus.PENDING].id, jobs[OutboxJobStatus.RUNNING].id, recent.id}
@@ -0,0 +1,91 @@
+from datetime import datetime
+from sqlalchemy.exc import DataError
+from db.models.transaction import Transaction
+from schemas.recurring_transaction import RecurrenceInterval, RecurringTransactionCreate
+from schemas.transaction import TransactionType
+from services.ledger_service import LedgerService
+from services.recurring_transaction_service import RecurringTransactionService, occurrence_date
+
+def _rent(test_category, **kwargs) -> RecurringTransactionCreate:
+    return RecurringTransactionCreate(**{
+        "description": "Rent",
+        "recipient": "Landlord",
+        "amount": 1000,
+        "type": TransactionType.DEBIT,
+        "category_id": test_category.id,
+        "interval": RecurrenceInterval.MONTHLY,
+        "start_date": datetime(2026, 1, 31, 9),
+        **kwargs
+    })
+
+def test_monthly_occurrences_keep_the_start_day(db_session, test_user, test_category):
+    rule = RecurringTransactionService(db_session).create_rule(_rent(test_category), test_user)
+    assert [occurrence_date(rule, n) for n in range(3)] == [
+        datetime(2026, 1, 31, 9), datetime(2026, 2, 28, 9), datetime(2026, 3, 31, 9)
+    ]
+
+def test_post_due_catches_up_in_batches(db_session, test_user, test_category):
+    service = RecurringTransactionService(db_session)
+    rule = service.create_rule(_rent(test_category), test_user)
+    account = test_user.account
+    opening = account.balance
+
+    # Three occurrences were missed; batches of two post them all once
+    assert service.post_due(now=datetime(2026, 4, 15), batch_size=2) == 3
+    assert service.post_due(now=datetime(2026, 4, 15), batch_size=2) == 0
+
+    dates = [t.transaction_date for t in db_session.query(Transaction).order_by(Transaction.transaction_date)]
+    assert dates == [datetime(2026, 1, 31, 9), datetime(2026, 2, 28, 9), datetime(2026, 3, 31, 9)]
+    db_session.refresh(rule)
+    db_session.refresh(account)
+    assert (rule.occurrences, rule.next_run) == (3, datetime(2026, 4, 30, 9))
+    assert account.balance == opening - 3000
+    # One bump per batch
+    assert account.transactions_version == 2
+    # The bulk path keeps the snapshots in step with the balance
+    assert LedgerService(db_session).reconcile() == []
+
+def test_rule_stops_after_end_date(db_session, test_user, test_category):
+    service = RecurringTransactionService(db_session)
+    rule = service.create_rule(_rent(test_category, end_date=datetime(2026, 3, 1)), test_user)
+
+    assert service.post_due(now=datetime(2026, 6, 1)) == 2
+    db_session.refresh(rule)
+    assert rule.next_run is None
+    assert service.post_due(now=datetime(2027, 1, 1)) == 0
+
+def test_duplicate_occurrences_are_skipped(db_session, test_user, test_category):
+    service = RecurringTransactionService(db_session)
+    first = service.create_rule(_rent(test_category), test_user)
+    second = service.create_rule(_rent(test_category), test_user)
+    opening = test_user.account.balance
+
+    # Both rules produce the same fingerprints; each occurrence is posted once
+    assert service.post_due(now=datetime(2026, 3, 15)) == 2
+    assert db_session.query(Transaction).count() == 2
+    db_session.refresh(first)
+    db_session.refresh(second)
+    assert first.next_run == second.next_run == datetime(2026, 3, 31, 9)
+    assert test_user.account.balance == opening - 2000
+    assert LedgerService(db_session).reconcile() == []
+
+def test_failing_rule_is_deactivated_without_holding_back_others(db_session, test_user, test_category, mocker):
+    service = RecurringTransactionService(db_session)
+    broken = service.create_rule(_rent(test_category, description="Broken", start_date=datetime(2026, 1, 1, 9)), test_user)
+    rent = service.create_rule(_rent(test_category), test_user)
+    create_bulk = service.transaction_service.create_transactions_bulk
+
+    def reject_broken(rows):
+        if any(row["description"] == "Broken" for row in rows):
+            raise DataError("INSERT INTO transactions", {}, Exception("Out of range value for column 'amount'"))
+        return create_bulk(rows)
+    mocker.patch.object(service.transaction_service, "create_transactions_bulk", side_effect=reject_broken)
+
+    assert service.post_due(now=datetime(2026, 2, 15)) == 1
+    db_session.refresh(broken)
+    db_session.refresh(rent)
+    assert (broken.is_active, broken.next_run) == (False, None)
+    assert "Out of range" in broken.last_error
+    assert rent.next_run == datetime(2026, 2, 28, 9)
+    # The stopped rule is not picked up again
+    assert service.post_due(now=datetime(2026, 3, 15)) == 1
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from core.config import settings
+from db.models.archived_transaction import ArchivedTransaction
+from db.models.transaction import Transaction
+from schemas.transaction import TransactionCreate, TransactionFilter, TransactionType
+from services.category_service import CategoryService
+from services.ledger_service import LedgerService
+from services.transaction_archive_service import TransactionArchiveService, reaches_archive, transaction_history
+from services.transaction_service import TransactionService
+
+@pytest.fixture
+def archive_after_a_year(monkeypatch):
+    monkeypatch.setattr(settings, "TRANSACTION_ARCHIVE_AFTER_MONTHS", 12)
+
+@pytest.fixture
+def history(db_session, test_user, test_category):
+    """Two transactions older than a year and one from this week"""
+    service = TransactionService(db_session)
+    now = datetime.now(timezone.utc)
+    for description, amount, days_ago in [("Old rent", 1000, 800), ("Old salary", 5000, 500), ("Coffee", 300, 2)]:
+        service.create_transaction(TransactionCreate(
+            category_id=test_category.id,
+            description=description,
+            amount=amount,
+            type=TransactionType.CREDIT if "salary" in description else TransactionType.DEBIT,
+            transaction_date=now - timedelta(days=days_ago)
+        ), test_user)
+    return now
+
+def test_reaches_archive(archive_after_a_year):
+    now = datetime.now(timezone.utc)
+    assert reaches_archive(now - timedelta(days=400))
+    assert reaches_archive(None, now - timedelta(days=400))
+    assert not reaches_archive(now - timedelta(days=30))
+    # Reads without dates leave the archive out unless they ask for it
+    assert not reaches_archive()
+    assert not reaches_archive(None, now)
+
+def test_transaction_history_filters_each_table(archive_after_a_year):
+    source = transaction_history(("id", "amount"), lambda model: [model.account_id == 1])
+    sql = str(source.element)
+    assert "transactions.account_id =" in sql
+    assert "transactions_archive.account_id =" in sql
+
+def test_archiving_is_off_by_default(db_session, history):
+    assert TransactionArchiveService(db_session).archive() == 0
+    assert db_session.query(Transaction).count() == 3
+
+def test_archive_moves_old_transactions_in_batches(db_session, test_user, history, archive_after_a_year):
+    account = test_user.account
+    ledger = LedgerService(db_session)
+    old_balance = ledger.get_balance_at(account, history - timedelta(days=450))
+
+    assert TransactionArchiveService(db_session).archive(batch_size=1) == 2
+    assert [t.description for t in db_session.query(Transaction).all()] == ["Coffee"]
+    assert {t.description for t in db_session.query(ArchivedTransaction).all()} == {"Old rent", "Old salary"}
+
+    # Snapshots still hold the archived transactions, so balances are unchanged
+    assert ledger.get_balance_at(account, history - timedelta(days=450)) == old_balance
+    assert ledger.get_balance_at(account, history) == account.balance
+    assert ledger.reconcile() == []
+
+def test_reads_include_archive_only_for_ranges_reaching_it(db_session, test_user, history, archive_after_a_year):
+    TransactionArchiveService(db_session).archive()
+    service = TransactionService(db_session)
+    account_id = test_user.account.id
+
+    recent = service.get_transaction_rows(account_id, filters=TransactionFilter(start_date=history - timedelta(days=30)))
+    assert [row["description"] for row in recent] == ["Coffee"]
+
+    # An unfiltered list leaves the archive out unless it asks for it
+    assert [row["description"] for row in service.get_transaction_rows(account_id)] == ["Coffee"]
+    assert service.get_transaction_summary(account_id)["total_transactions"] == 1
+    stats = CategoryService(db_session).get_category_stats(test_user.id, account_id)
+    assert sum(category.transaction_count for category in stats) == 1
+
+    everything = service.get_transaction_rows(account_id, filters=TransactionFilter(include_archived=True))
+    assert [row["description"] for row in everything] == ["Coffee", "Old salary", "Old rent"]
+    assert service.get_transaction_summary(account_id, include_archived=True)["total_transactions"] == 3
+    stats = CategoryService(db_session).get_category_stats(test_user.id, account_id, include_archived=True)
+    assert sum(category.transaction_count for category in stats) == 3
+
+    filters = TransactionFilter(start_date=history - timedelta(days=1000))
+    rows = service.get_transaction_rows(account_id, filters=filters, with_running_balance=True)
+    assert [row["description"] for row in rows] == ["Coffee", "Old salary", "Old rent"]
+    assert [row["running_balance"] for row in rows] == [3700, 4000, -1000]
+
+    summary = service.get_transaction_summary(account_id, start_date=history - timedelta(days=1000))
+    assert summary["total_transactions"] == 3
+    assert summary["net_amount"] == 3700
@@ -0,0 +1,70 @@
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from db.models.transaction import Transaction
+from schemas.transaction import TransactionFilter, TransactionType
+from services.transaction_query import TransactionQuery
+
+@pytest.fixture
+def transactions(db_session, test_user, test_category):
+    account_id = test_user.account.id
+    db_session.add_all([
+        Transaction(
+            account_id=account_id,
+            category_id=test_category.id,
+            description=description,
+            recipient=recipient,
+            amount=amount,
+            type=transaction_type,
+            transaction_date=datetime(2026, 3, day)
+        )
+        for description, recipient, amount, transaction_type, day in [
+            ("Rent", "Landlord", 90000, TransactionType.DEBIT, 1),
+            ("Salary", "Employer", 250000, TransactionType.CREDIT, 2),
+            ("Coffee", "Cafe", 450, TransactionType.DEBIT, 3),
+            ("Lunch", "Cafe", 1200, TransactionType.DEBIT, 4),
+        ]
+    ])
+    db_session.commit()
+    return account_id
+
+def _descriptions(db_session, query: TransactionQuery, **kwargs):
+    return [row.description for row in db_session.execute(*query.rows(["id", "description"], **kwargs))]
+
+def test_filter_combinations_share_a_cached_statement(db_session, transactions):
+    cafe = TransactionQuery(transactions, TransactionFilter(recipient="cafe", min_amount=500))
+    landlord = TransactionQuery(transactions, TransactionFilter(recipient="land", min_amount=100))
+    assert _descriptions(db_session, cafe) == ["Lunch"]
+    assert _descriptions(db_session, landlord) == ["Rent"]
+
+    # Same filters with other values: the same statement, only the parameters differ
+    cafe_stmt = cafe.rows(["id"], limit=10)
+    landlord_stmt = landlord.rows(["id"], limit=5)
+    assert cafe_stmt.statement is landlord_stmt.statement
+    assert landlord_stmt.params["recipient"] == "%land%"
+    # Another combination of filters is a statement of its own
+    other = TransactionQuery(transactions, TransactionFilter(recipient="cafe")).rows(["id"], limit=10)
+    assert other.statement is not cafe_stmt.statement
+
+def test_sort_and_slice(db_session, transactions):
+    query = TransactionQuery(transactions, sort_by="amount", sort_order="asc")
+    assert _descriptions(db_session, query, limit=2) == ["Coffee", "Lunch"]
+    assert _descriptions(db_session, query, offset=2, limit=1) == ["Rent"]
+
+    with pytest.raises(HTTPException) as exc_info:
+        TransactionQuery(transactions, sort_by="description")
+    assert exc_info.value.status_code == 400
+
+def test_totals(db_session, transactions):
+    count, amount = db_session.execute(*TransactionQuery(transactions).totals()).one()
+    assert (count, amount) == (4, 341650)
+
+    filters = TransactionFilter(type=TransactionType.DEBIT)
+    by_category = dict(
+        (category_id, count)
+        for category_id, count, _ in db_session.execute(*TransactionQuery(transactions, filters).totals("category_id"))
+    )
+    assert list(by_category.values()) == [3]
+
+    with pytest.raises(HTTPException):
+        TransactionQuery(transactions).totals("recipient")
@@ -27,6 +27,41 @@ def test_create_transaction(db_session, test_transaction_data, test_user, test_c
     assert transaction.type == transaction_data.type
     assert transaction.category_id == test_category.id
 
+def test_create_duplicate_transaction(db_session, test_user, test_category):
+    service = TransactionService(db_session)
+    transaction_date = datetime.now(timezone.utc)
+    transaction_data = TransactionCreate(
+        category_id=test_category.id,
+        description="Coffee",
+        recipient="Cafe",
+        amount=450,
+        type=TransactionType.DEBIT,
+        transaction_date=transaction_date
+    )
+    service.create_transaction(transaction_data, test_user)
+    balance = test_user.account.balance
+
+    # Same transaction up to case and surrounding whitespace
+    duplicate = transaction_data.model_copy(update={"description": " coffee ", "recipient": "CAFE"})
+    with pytest.raises(HTTPException) as exc_info:
+        service.create_transaction(duplicate, test_user)
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Transaction already exists"
+    assert test_user.account.balance == balance
+    assert db_session.query(Transaction).count() == 1
+
+    # A different amount is a different transaction
+    service.create_transaction(transaction_data.model_copy(update={"amount": 500}), test_user)
+    assert db_session.query(Transaction).count() == 2
+
+def test_transaction_fingerprint_normalizes_timezone():
+    utc_date = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+    local_date = utc_date.astimezone(timezone(timedelta(hours=2)))
+    assert Transaction.compute_fingerprint("Rent", "Landlord", 1000, utc_date) == \
+        Transaction.compute_fingerprint("Rent", "Landlord", 1000, local_date)
+    assert Transaction.compute_fingerprint("Rent", "Landlord", 1000, utc_date) != \
+        Transaction.compute_fingerprint("Rent", "Landlord", 1001, utc_date)
+
 def test_get_transactions(db_session, test_transaction_data, test_user, test_category):
     service = TransactionService(db_session)
     
@@ -314,14 +349,14 @@ def test_get_transactions_by_budget(db_session, test_user, test_category):
     db_session.commit()
 
     # Test retrieving transactions for budget_1
-    budget_1_transactions = service.get_transactions_by_budget(budget_id=budget_1.id, account_id=test_user.account.id)
+    budget_1_transactions = service.get_transactions_by_budget(budget_id=budget_1.id, account_id=test_user.account.id).items
     assert len(budget_1_transactions) == 2
-    assert all(t.budget_id == budget_1.id for t in budget_1_transactions)
+    assert all(t["budget_id"] == budget_1.id for t in budget_1_transactions)
     
     # Test retrieving transactions for budget_2
-    budget_2_transactions = service.get_transactions_by_budget(budget_id=budget_2.id, account_id=test_user.account.id)
+    budget_2_transactions = service.get_transactions_by_budget(budget_id=budget_2.id, account_id=test_user.account.id).items
     assert len(budget_2_transactions) == 1
-    assert budget_2_transactions[0].budget_id == budget_2.id
+    assert budget_2_transactions[0]["budget_id"] == budget_2.id
 
 def test_get_transactions_by_pot(db_session, test_user, test_category):
     service = TransactionService(db_session)
@@ -383,14 +418,14 @@ def test_get_transactions_by_pot(db_session, test_user, test_category):
     db_session.commit()
 
     # Test retrieving transactions for pot_1
-    pot_1_transactions = service.get_transactions_by_pot(pot_id=pot_1.id, account_id=test_user.account.id)
+    pot_1_transactions = service.get_transactions_by_pot(pot_id=pot_1.id, account_id=test_user.account.id).items
     assert len(pot_1_transactions) == 2
-    assert all(t.pot_id == pot_1.id for t in pot_1_transactions)
+    assert all(t["pot_id"] == pot_1.id for t in pot_1_transactions)
     
     # Test retrieving transactions for pot_2
-    pot_2_transactions = service.get_transactions_by_pot(pot_id=pot_2.id, account_id=test_user.account.id)
+    pot_2_transactions = service.get_transactions_by_pot(pot_id=pot_2.id, account_id=test_user.account.id).items
     assert len(pot_2_transactions) == 1
-    assert pot_2_transactions[0].pot_id == pot_2.id
+    assert pot_2_transactions[0]["pot_id"] == pot_2.id
 
 def test_get_transactions_by_category(db_session, test_user, test_category):
     service = TransactionService(db_session)
@@ -438,14 +473,14 @@ def test_get_transactions_by_category(db_session, test_user, test_category):
     db_session.commit()
 
     # Test retrieving transactions for test_category
-    category_1_transactions = service.get_transactions_by_category(category_id=test_category.id, account_id=test_user.account.id)
+    category_1_transactions = service.get_transactions_by_category(category_id=test_category.id, account_id=test_user.account.id).items
     assert len(category_1_transactions) == 2
-    assert all(t.category_id == test_category.id for t in category_1_transactions)
+    assert all(t["category_id"] == test_category.id for t in category_1_transactions)
     
     # Test retrieving transactions for test_category_2
-    category_2_transactions = service.get_transactions_by_category(category_id=test_category_2.id, account_id=test_user.account.id)
+    category_2_transactions = service.get_transactions_by_category(category_id=test_category_2.id, account_id=test_user.account.id).items
     assert len(category_2_transactions) == 1
-    assert category_2_transactions[0].category_id == test_category_2.id
+    assert category_2_transactions[0]["category_id"] == test_category_2.id
 
 def test_budget_amount_updates(db_session, test_user, test_category):
     """Test that budget amounts are correctly updated when transactions change"""
@@ -577,4 +612,75 @@ def test_budget_change_in_transaction(db_session, test_user, test_category):
     assert budget1.spent_amount == 0
     assert budget1.remaining_amount == 10000
     assert budget2.spent_amount == 5000
-    assert budget2.remaining_amount == 15000 
\ No newline at end of file
+    assert budget2.remaining_amount == 15000 
+def test_get_transaction_page_walks_ties_in_order(db_session, test_user, test_category):
+    service = TransactionService(db_session)
+    transaction_date = datetime(2026, 5, 1, 12, 0)
+    # Five transactions sharing one date, so only the id orders them
+    db_session.add_all([
+        Transaction(
+            account_id=test_user.account.id,
+            category_id=test_category.id,
+            description=f"Transaction {i}",
+            amount=100,
+            type=TransactionType.DEBIT,
+            transaction_date=transaction_date
+        )
+        for i in range(5)
+    ])
+    db_session.commit()
+
+    ids, cursor = [], None
+    while True:
+        page = service.get_transactions_by_category(test_category.id, test_user.account.id, limit=2, cursor=cursor)
+        assert len(page.items) <= 2
+        ids.extend(item["id"] for item in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+    assert len(ids) == 5
+    assert ids == sorted(ids, reverse=True)
+
+    streamed = service.iter_transaction_rows(test_user.account.id, batch_size=2)
+    assert [item["id"] for item in streamed] == ids
+
+    # A cursor only continues the sort order it was made for
+    with pytest.raises(HTTPException) as exc_info:
+        service.get_transactions_by_category(test_category.id, test_user.account.id, sort_by="amount", cursor=cursor)
+    assert exc_info.value.status_code == 400
+
+@pytest.mark.parametrize("sort_order", ["desc", "asc"])
+def test_get_transaction_page_walks_past_null_sort_values(db_session, test_user, test_category, sort_order):
+    service = TransactionService(db_session)
+    dates = [datetime(2026, 5, 1), None, datetime(2026, 5, 2), None, datetime(2026, 5, 1)]
+    transactions = [
+        Transaction(
+            account_id=test_user.account.id,
+            category_id=test_category.id,
+            description=f"Transaction {i}",
+            amount=100,
+            type=TransactionType.DEBIT,
+            transaction_date=transaction_date or datetime(2026, 1, 1)
+        )
+        for i, transaction_date in enumerate(dates)
+    ]
+    db_session.add_all(transactions)
+    db_session.flush()
+    # The column defaults to now(), so undated rows are cleared after the insert
+    db_session.query(Transaction).filter(
+        Transaction.id.in_([t.id for t, d in zip(transactions, dates) if d is None])
+    ).update({Transaction.transaction_date: None}, synchronize_session=False)
+    db_session.commit()
+
+    ids, cursor = [], None
+    while True:
+        page = service.get_transaction_page(test_user.account.id, limit=1, sort_order=sort_order, cursor=cursor)
+        assert len(ids) < 5
+        ids.extend(item["id"] for item in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    listed = [item["id"] for item in service.get_transaction_rows(test_user.account.id, sort_order=sort_order)]
+    assert len(ids) == 5
+    assert ids == listed